@@ -34,6 +34,8 @@ ChatGPT Parallel Research Tool
 """
 
 import asyncio
+import hashlib
+import itertools
 import json
 import time
 import base64
@@ -42,7 +44,8 @@ import os
 import sys
 import socket
 import subprocess
-from typing import List, Dict, Optional, Any
+from collections import OrderedDict
+from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
 
 # WebSocketライブラリ（自動インストール）
@@ -69,6 +72,8 @@ def _ensure_websockets():
 
 websockets = _ensure_websockets()
 from websockets.server import serve
+from answer_cache import AnswerCache, CACHE_MODES, file_digest, format_age
+from poll_policy import AdaptivePollPolicy, FixedPollPolicy, POLL_POLICIES
 
 
 # ========================================
@@ -79,11 +84,32 @@ class BridgeServer:
     """拡張機能とPythonクライアント間のWebSocketブリッジサーバー"""
     
     PORT = 9224
+    DEFAULT_TIMEOUT = 30.0  # コマンドに bridgeTimeout がないときの応答待ち秒数
+    BLOB_DIR = Path.home() / '.cache' / 'agent_research' / 'blobs'  # 登録済み添付ファイル（内容の SHA-256 名）
+    BLOB_CHUNK = 512 * 1024  # バイナリフレーム1つに載せる本体の上限（websockets の既定上限 1MiB 未満）
+    BLOB_TTL = 7 * 24 * 3600  # 最後に使われてからこの秒数を過ぎた blob は起動時に削除
+    BLOB_MEMORY = 256 * 1024 * 1024  # base64 エンコード済み blob をメモリに保持する上限（文字数）
+    # 一時的な失敗（接続断・タイムアウト・ブリッジ内部エラー）のエラー文字列の先頭。
+    # これ以外のエラーは拡張機能・ブリッジが明示的に拒否したものとして扱う
+    TRANSIENT_ERRORS = ('Connection closed', 'Timeout', 'Extension disconnected', 'Extension not connected',
+                        'Bridge error')
+    
+    @classmethod
+    def is_transient_error(cls, error) -> bool:
+        """コマンドの失敗が一時的なもの（再試行すれば成功しうる）か"""
+        return isinstance(error, str) and error.startswith(cls.TRANSIENT_ERRORS)
     
     def __init__(self):
         self.extension_ws = None
-        self.pending = {}
+        self.pending = {}  # ブリッジ採番の requestId → 応答待ちの Future
+        self.origins = {}  # ブリッジ採番の requestId → 送信元のクライアント接続
+        self.subscriptions = {}  # subscriptionId → push イベントの配送先クライアント接続
+        self.send_locks = {}  # 接続 → 送信ロック（コマンドごとのタスクから同じ接続へ並行して送らない）
+        self.uploads = {}  # (クライアント接続, blobId) → 受信中の blob（一時ファイル・SHA-256・受信済みバイト数）
+        self.encoded_blobs = OrderedDict()  # blobId → base64 文字列（LRU、BLOB_MEMORY まで）
+        self.encoding = {}  # blobId → エンコード中のタスク（同じ blob を並行してエンコードしない）
         self.running = False
+        self._ids = itertools.count(1)
     
     @staticmethod
     def is_running() -> bool:
@@ -117,51 +143,289 @@ class BridgeServer:
                             continue
                         
                         req_id = resp.get('requestId')
-                        if req_id and req_id in self.pending:
-                            self.pending[req_id].set_result(resp)
+                        future = self.pending.get(req_id) if req_id else None
+                        if future is not None and not future.done():
+                            # 購読開始の応答: 以降の push イベントを送信元クライアントへ配送する
+                            sub_id = resp.get('subscriptionId')
+                            if sub_id and req_id in self.origins:
+                                self.subscriptions[sub_id] = self.origins[req_id]
+                            future.set_result(resp)
+                        elif resp.get('type') == 'response_event':
+                            await self.relay_event(resp)
                             
                     except json.JSONDecodeError:
                         pass
                 
                 print("[Bridge] Chrome extension disconnected")
-                self.extension_ws = None
+                self.send_locks.pop(ws, None)
+                if self.extension_ws is ws:
+                    self.extension_ws = None
+                    # 転送済みで応答待ちのコマンドはタイムアウトを待たずにエラーで返す
+                    for future in list(self.pending.values()):
+                        if not future.done():
+                            future.set_result({'error': 'Extension disconnected'})
+                    for sub_id in list(self.subscriptions):
+                        await self.relay_event({'type': 'response_event', 'subscriptionId': sub_id,
+                                                'event': 'error', 'error': 'Extension disconnected'})
                 return
             
-            # Pythonクライアントからのコマンド - 最初のメッセージを処理
-            async def process_command(cmd_data):
-                if self.extension_ws is None:
-                    await ws.send(json.dumps({'error': 'Extension not connected'}))
-                    return
-                
-                req_id = cmd_data.get('requestId') or f"r{id(cmd_data)}"
-                cmd_data['requestId'] = req_id
-                
-                future = asyncio.get_event_loop().create_future()
-                self.pending[req_id] = future
-                
-                try:
-                    await self.extension_ws.send(json.dumps(cmd_data))
-                    response = await asyncio.wait_for(future, timeout=30.0)
-                    await ws.send(json.dumps(response))
-                except asyncio.TimeoutError:
-                    await ws.send(json.dumps({'error': 'Timeout', 'requestId': req_id}))
-                finally:
-                    self.pending.pop(req_id, None)
+            # Pythonクライアントからのコマンド: 1コマンド1タスクで並行処理し、応答を待たずに次を受信する
+            tasks = set()
             
-            # 最初のコマンドを処理
-            await process_command(data)
+            def spawn(cmd_data):
+                task = asyncio.create_task(self.process_command(ws, cmd_data))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
             
-            # 以降のコマンドをループで待機
-            async for message in ws:
-                try:
-                    cmd_data = json.loads(message)
-                    await process_command(cmd_data)
-                except json.JSONDecodeError:
-                    pass
+            spawn(data)
+            try:
+                async for message in ws:
+                    if isinstance(message, bytes):
+                        # blob のチャンク: 順序を保つため受信ループ内でそのまま書き込む
+                        self.receive_blob_chunk(ws, message)
+                        continue
+                    try:
+                        spawn(json.loads(message))
+                    except json.JSONDecodeError:
+                        pass
+            finally:
+                # クライアント切断: 返送先のなくなった処理中コマンドと購読、受信途中の blob は打ち切る
+                for task in list(tasks):
+                    task.cancel()
+                await self.drop_subscriptions(ws)
+                self.discard_uploads(ws)
+                self.send_locks.pop(ws, None)
                 
         except Exception as e:
             print(f"[Bridge] Error: {e}")
     
+    async def process_command(self, ws, cmd_data: Dict):
+        """
+        1コマンドを拡張機能へ転送し、応答を送信元のクライアント接続へ返す
+
+        requestId はブリッジが接続をまたいで一意に採番し直す（クライアントごとの連番が
+        衝突しないように）。応答には元の requestId を付け直して返す。
+        応答待ちの秒数はコマンドの bridgeTimeout で指定できる（省略時は DEFAULT_TIMEOUT）。
+        blob_begin / blob_commit はブリッジ自身が処理し、blobId 付きの添付コマンドは
+        登録済み blob を fileData に展開してから転送する。
+        """
+        client_id = cmd_data.get('requestId')
+        timeout = cmd_data.pop('bridgeTimeout', None)
+        try:
+            timeout = float(timeout) if timeout is not None else self.DEFAULT_TIMEOUT
+        except (TypeError, ValueError):
+            timeout = self.DEFAULT_TIMEOUT
+        
+        def reply(payload: Dict) -> str:
+            if client_id is not None:
+                payload['requestId'] = client_id
+            else:
+                payload.pop('requestId', None)
+            return json.dumps(payload)
+        
+        try:
+            if cmd_data.get('type') in ('blob_begin', 'blob_commit'):
+                await self.send(ws, reply(self.handle_blob(ws, cmd_data)))
+                return
+            
+            extension_ws = self.extension_ws
+            if extension_ws is None:
+                await self.send(ws, reply({'error': 'Extension not connected'}))
+                return
+            
+            if cmd_data.get('blobId') and 'fileData' not in cmd_data:
+                # 参照渡しの添付: 拡張機能は fileData を受け取るので、ここでエンコード済みの内容に差し替える
+                file_data = await self.encoded_blob(cmd_data.pop('blobId'))
+                if file_data is None:
+                    await self.send(ws, reply({'error': 'Unknown blob', 'blobMissing': True}))
+                    return
+                cmd_data['fileData'] = file_data
+            
+            req_id = f"b{next(self._ids)}"
+            cmd_data['requestId'] = req_id
+            future = asyncio.get_running_loop().create_future()
+            self.pending[req_id] = future
+            self.origins[req_id] = ws
+            try:
+                try:
+                    await self.send(extension_ws, json.dumps(cmd_data))
+                except websockets.exceptions.ConnectionClosed:
+                    response = {'error': 'Extension disconnected'}
+                else:
+                    response = await asyncio.wait_for(future, timeout=timeout)
+            except asyncio.TimeoutError:
+                response = {'error': 'Timeout'}
+            finally:
+                self.pending.pop(req_id, None)
+                self.origins.pop(req_id, None)
+            await self.send(ws, reply(response))
+        except websockets.exceptions.ConnectionClosed:
+            pass  # 送信元の接続が切れている（返送先がない）
+        except Exception as e:
+            # 想定外のエラーでも応答は必ず返す（返さないとクライアントはタイムアウトまで待つ）
+            print(f"[Bridge] Command {cmd_data.get('type')} failed: {e!r}")
+            try:
+                await self.send(ws, reply({'error': f'Bridge error: {e!r}'}))
+            except websockets.exceptions.ConnectionClosed:
+                pass
+    
+    async def send(self, ws, payload):
+        """
+        接続ごとに送信を直列化して送る
+
+        legacy 実装（websockets.server.serve）は同じ接続への並行 send で送信バッファの
+        drain が競合し AssertionError になる（大きな添付を複数タブへ同時に送るときなど）。
+        """
+        lock = self.send_locks.get(ws)
+        if lock is None:
+            lock = self.send_locks[ws] = asyncio.Lock()
+        async with lock:
+            await ws.send(payload)
+    
+    # ---- blob（添付ファイルの登録と参照渡し） ----
+    
+    @classmethod
+    def _blob_path(cls, blob_id) -> Optional[Path]:
+        """blobId（SHA-256 の16進64文字）の保存先。不正な blobId なら None"""
+        if not isinstance(blob_id, str) or len(blob_id) != 64 or any(c not in '0123456789abcdef' for c in blob_id):
+            return None
+        return cls.BLOB_DIR / blob_id
+    
+    def handle_blob(self, ws, cmd_data: Dict) -> Dict:
+        """
+        blob の登録コマンドを処理する
+
+        blob_begin {blobId, size}: 登録済みなら have=True。未登録なら受信を開始し、クライアントは
+            バイナリフレーム（blobId 64バイト + オフセット 8バイト big-endian + 本体）でチャンクを送る。
+        blob_commit {blobId}: 受信した内容のサイズと SHA-256 を検証して登録する。
+        """
+        blob_id = cmd_data.get('blobId')
+        path = self._blob_path(blob_id)
+        if path is None:
+            return {'error': f'Invalid blobId: {blob_id}'}
+        key = (ws, blob_id)
+        
+        if cmd_data['type'] == 'blob_begin':
+            size = cmd_data.get('size')
+            if path.exists() and path.stat().st_size == size:
+                os.utime(path)  # 最終利用時刻（BLOB_TTL の起点）を更新
+                return {'success': True, 'blobId': blob_id, 'have': True}
+            self.discard_uploads(ws, blob_id)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{blob_id}.{os.getpid()}.{next(self._ids)}.part")
+            self.uploads[key] = {'tmp': tmp, 'file': open(tmp, 'wb'), 'sha': hashlib.sha256(),
+                                 'size': size, 'received': 0, 'error': None}
+            return {'success': True, 'blobId': blob_id, 'have': False, 'chunkSize': self.BLOB_CHUNK}
+        
+        upload = self.uploads.pop(key, None)
+        if upload is None:
+            return {'error': f'No upload in progress: {blob_id}', 'blobId': blob_id}
+        upload['file'].close()
+        error = upload['error']
+        if error is None and (upload['received'] != upload['size'] or upload['sha'].hexdigest() != blob_id):
+            error = 'Blob verification failed'
+        if error:
+            upload['tmp'].unlink(missing_ok=True)
+            return {'error': error, 'blobId': blob_id}
+        os.replace(upload['tmp'], path)
+        return {'success': True, 'blobId': blob_id, 'size': upload['received']}
+    
+    def receive_blob_chunk(self, ws, frame: bytes):
+        """blob のチャンク（バイナリフレーム）を受信中の一時ファイルへ追記する"""
+        blob_id = frame[:64].decode('ascii', 'replace')
+        upload = self.uploads.get((ws, blob_id))
+        if upload is None or upload['error']:
+            return
+        offset = int.from_bytes(frame[64:72], 'big')
+        if offset != upload['received']:
+            upload['error'] = f"Unexpected chunk offset {offset} (expected {upload['received']})"
+            return
+        chunk = frame[72:]
+        upload['file'].write(chunk)
+        upload['sha'].update(chunk)
+        upload['received'] += len(chunk)
+    
+    def discard_uploads(self, ws, blob_id: str = None):
+        """受信途中の blob を破棄する（blob_id 省略時はその接続の全件）"""
+        for key in [k for k in self.uploads if k[0] is ws and (blob_id is None or k[1] == blob_id)]:
+            upload = self.uploads.pop(key)
+            upload['file'].close()
+            upload['tmp'].unlink(missing_ok=True)
+    
+    async def encoded_blob(self, blob_id: str) -> Optional[str]:
+        """登録済み blob の base64 文字列（エンコードは1回だけ行い、LRU でメモリに保持）"""
+        data = self.encoded_blobs.get(blob_id)
+        if data is not None:
+            self.encoded_blobs.move_to_end(blob_id)
+            return data
+        path = self._blob_path(blob_id)
+        if path is None or not path.exists():
+            return None
+        
+        task = self.encoding.get(blob_id)
+        if task is None:
+            task = self.encoding[blob_id] = asyncio.ensure_future(asyncio.get_running_loop().run_in_executor(
+                None, lambda: base64.b64encode(path.read_bytes()).decode('ascii')))
+            task.add_done_callback(lambda _: self.encoding.pop(blob_id, None))
+        try:
+            data = await asyncio.shield(task)  # 待っている1クライアントが切断しても他の待機は続ける
+        except OSError:
+            return None
+        os.utime(path)
+        
+        self.encoded_blobs[blob_id] = data
+        total = sum(len(v) for v in self.encoded_blobs.values())
+        while total > self.BLOB_MEMORY and len(self.encoded_blobs) > 1:
+            _, old = self.encoded_blobs.popitem(last=False)
+            total -= len(old)
+        return data
+    
+    def prune_blobs(self) -> int:
+        """BLOB_TTL を過ぎた blob と、中断された受信の一時ファイルを削除する（起動時に呼ぶ）"""
+        if not self.BLOB_DIR.is_dir():
+            return 0
+        removed = 0
+        limit = time.time() - self.BLOB_TTL
+        for path in self.BLOB_DIR.iterdir():
+            try:
+                if path.suffix == '.part' or path.stat().st_mtime < limit:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+    
+    async def relay_event(self, event: Dict):
+        """
+        拡張機能からの push イベント（response_event）を購読元のクライアントへ転送する
+
+        event: delta（本文の差分）/ finished（生成完了）/ error。finished と error で購読を終了する。
+        """
+        sub_id = event.get('subscriptionId')
+        if event.get('event') in ('finished', 'error'):
+            ws = self.subscriptions.pop(sub_id, None)
+        else:
+            ws = self.subscriptions.get(sub_id)
+        if ws is None:
+            return
+        try:
+            await self.send(ws, json.dumps(event))
+        except websockets.exceptions.ConnectionClosed:
+            self.subscriptions.pop(sub_id, None)
+    
+    async def drop_subscriptions(self, ws):
+        """切断したクライアントの購読を解除し、拡張機能側の監視も止める"""
+        for sub_id in [sid for sid, owner in self.subscriptions.items() if owner is ws]:
+            self.subscriptions.pop(sub_id, None)
+            if self.extension_ws is not None:
+                try:
+                    await self.send(self.extension_ws, json.dumps({
+                        'type': 'chatgpt_unsubscribe_response', 'subscriptionId': sub_id,
+                        'requestId': f"b{next(self._ids)}"
+                    }))
+                except websockets.exceptions.ConnectionClosed:
+                    pass
+    
     async def run(self):
         """ブリッジサーバーを起動"""
         self.running = True
@@ -169,7 +433,12 @@ class BridgeServer:
         print("[Bridge] Waiting for Chrome extension connection...")
         print("[Bridge] Press Ctrl+C to stop\n")
         
-        async with serve(self.handler, 'localhost', self.PORT):
+        removed = self.prune_blobs()
+        if removed:
+            print(f"[Bridge] Removed {removed} expired blob(s) from {self.BLOB_DIR}")
+        
+        # localhost 内の中継なので圧縮（permessage-deflate）は使わない（大きな添付で CPU 時間の大半を占めるため）
+        async with serve(self.handler, 'localhost', self.PORT, compression=None):
             await asyncio.Future()  # 永久に待機
     
     @staticmethod
@@ -197,6 +466,240 @@ class BridgeServer:
         return False
 
 
+# ========================================
+# Tab Pool（ウォームタブ）
+# ========================================
+
+class TabPool:
+    """モデル/Thinking設定済みの ChatGPT タブを K 個開いたまま保持し、検索に払い出す
+    
+    プールの状態は ~/.chatgpt_multi_pool.json に保存する（セッションファイルと同じくプロセスをまたいで共有）。
+    払い出したタブは一覧から外し、不足分は補充タスクで開き直す（補充は検索の回答待ちと並行して進む）。
+    """
+    
+    NEW_CHAT_URL = 'https://chatgpt.com/'
+    
+    def __init__(self, ctrl: 'ChatGPTController', path: Path = None):
+        self.ctrl = ctrl
+        self.path = path or Path.home() / ".chatgpt_multi_pool.json"
+        self.size = 0
+        self.model = None
+        self.thinking = None
+        self.tabs: List[Dict] = []  # [{id, model, thinking, warmed_at}]
+        self._refill_task = None
+        self.load()
+    
+    @property
+    def active(self) -> bool:
+        return self.size > 0
+    
+    def load(self):
+        """プール状態を読み込む（ファイルがなければ空のプール）"""
+        self.size, self.model, self.thinking, self.tabs = 0, None, None, []
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.size = int(data.get('size', 0))
+            self.model = data.get('model')
+            self.thinking = data.get('thinking')
+            self.tabs = [t for t in data.get('tabs', []) if isinstance(t, dict) and t.get('id')]
+        except Exception:
+            self.size, self.tabs = 0, []
+    
+    def save(self):
+        """プール状態を保存（一時ファイル経由で置き換え）"""
+        data = {'size': self.size, 'model': self.model, 'thinking': self.thinking, 'tabs': self.tabs}
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"[Warning] Failed to save tab pool: {e}")
+    
+    @staticmethod
+    def _matches(entry: Dict, model: str = None, thinking: str = None) -> bool:
+        """要求プロファイルに合うか（model/thinking の指定なしはどの設定でも可）"""
+        return ((model is None or entry.get('model') == model)
+                and (thinking is None or entry.get('thinking') == thinking))
+    
+    async def prune(self):
+        """閉じられた・会話が始まったタブを一覧から外す"""
+        open_tabs = {t.get('id'): t.get('url') or '' for t in await self.ctrl.get_tabs()}
+        alive = [t for t in self.tabs
+                 if t['id'] in open_tabs and '/c/' not in open_tabs[t['id']]]
+        if len(alive) != len(self.tabs):
+            self.tabs = alive
+            self.save()
+    
+    async def acquire(self, n: int, model: str = None, thinking: str = None) -> List[Dict]:
+        """プロファイルの合うウォームタブを最大 n 個払い出す（足りない分は呼び出し側で新規に開く）"""
+        self.load()
+        if not self.active or n <= 0:
+            return []
+        await self.prune()
+        taken = [t for t in self.tabs if self._matches(t, model, thinking)][:n]
+        if taken:
+            taken_ids = {t['id'] for t in taken}
+            self.tabs = [t for t in self.tabs if t['id'] not in taken_ids]
+            self.save()
+            print(f"[Pool] Using {len(taken)} warm tab(s); {len(self.tabs)} left")
+        return taken
+    
+    async def warm_tab(self, model: str = None, thinking: str = None) -> Optional[Dict]:
+        """タブを開いてモデル/Thinkingを設定する（失敗したタブは閉じる）"""
+        result = await self.ctrl.new_tab(self.NEW_CHAT_URL)
+        tid = result.get('tab', {}).get('id')
+        if not tid:
+            return None
+        ok = await self.ctrl._wait_for_input_ready(tid)
+        if ok and model:
+            ok = bool((await self.ctrl.select_model(model, tid)).get('success'))
+        if ok and thinking:
+            ok = bool((await self.ctrl.set_thinking(thinking, tid)).get('success'))
+        if not ok:
+            await self.ctrl.close_tab(tid)
+            return None
+        return {'id': tid, 'model': model, 'thinking': thinking, 'warmed_at': time.time()}
+    
+    async def fill(self, concurrency: int = 5) -> int:
+        """size 個になるまでウォームタブを補充する（開いた数を返す）"""
+        self.load()
+        if not self.active:
+            return 0
+        await self.prune()
+        missing = self.size - len(self.tabs)
+        if missing <= 0:
+            return 0
+        slots = asyncio.Semaphore(max(1, concurrency))
+        
+        async def warm():
+            async with slots:
+                return await self.warm_tab(self.model, self.thinking)
+        
+        warmed = [t for t in await asyncio.gather(*[warm() for _ in range(missing)]) if t]
+        # 補充中に別プロセスが払い出した分を上書きしないよう、保存直前に読み直して追記する
+        self.load()
+        self.tabs.extend(warmed)
+        self.save()
+        return len(warmed)
+    
+    def start_refill(self):
+        """補充をバックグラウンドで開始（wait_refill で完了を待つ）"""
+        if self.active and (self._refill_task is None or self._refill_task.done()):
+            self._refill_task = asyncio.create_task(self.fill())
+    
+    async def wait_refill(self):
+        if self._refill_task is not None:
+            try:
+                count = await self._refill_task
+                if count:
+                    print(f"[Pool] Refilled {count} warm tab(s)")
+            except Exception as e:
+                print(f"[Pool] Refill failed: {e}")
+            self._refill_task = None
+    
+    async def start(self, size: int, model: str = None, thinking: str = None) -> int:
+        """プールを作成/再設定して size 個まで温める（プロファイルの違うタブは閉じる）"""
+        self.load()
+        stale = [t for t in self.tabs if t.get('model') != model or t.get('thinking') != thinking]
+        for t in stale:
+            await self.ctrl.close_tab(t['id'])
+        self.tabs = [t for t in self.tabs if t not in stale]
+        self.size, self.model, self.thinking = max(0, size), model, thinking
+        # 縮小時は余剰タブを閉じる
+        for t in self.tabs[self.size:]:
+            await self.ctrl.close_tab(t['id'])
+        self.tabs = self.tabs[:self.size]
+        self.save()
+        return await self.fill()
+    
+    async def stop(self) -> int:
+        """プールのタブを閉じて状態ファイルを削除する（閉じた数を返す）"""
+        self.load()
+        await self.prune()
+        for t in self.tabs:
+            await self.ctrl.close_tab(t['id'])
+        closed = len(self.tabs)
+        self.size, self.tabs = 0, []
+        if self.path.exists():
+            self.path.unlink()
+        return closed
+
+
+# ========================================
+# Batch Job（チェックポイント）
+# ========================================
+
+class JobState:
+    """バッチジョブの進捗チェックポイント（<ジョブファイル>.state.json）
+    
+    質問ごとに status（queued/sent/done/failed）・tab_id・url・md_path を保持し、
+    更新のたびに一時ファイル経由で置き換えて保存する（途中で落ちても壊れた状態を残さない）。
+    resume-job は done を飛ばし、会話URLのある sent/failed はそのURLに再接続して回答だけ取り直す。
+    """
+    
+    def __init__(self, path: Path, data: Dict):
+        self.path = path
+        self.data = data
+    
+    @staticmethod
+    def path_for(job_path) -> Path:
+        job_path = Path(job_path)
+        return job_path.with_name(job_path.name + '.state.json')
+    
+    @classmethod
+    def create(cls, job_path, options: Dict, jobs: List[Dict]) -> 'JobState':
+        entries = [dict(job, index=i, status='queued', tab_id=None, url=None, md_path=None)
+                   for i, job in enumerate(jobs)]
+        state = cls(cls.path_for(job_path), {
+            'job': str(job_path), 'options': options, 'created_at': time.time(), 'questions': entries
+        })
+        state.save()
+        return state
+    
+    @classmethod
+    def load(cls, job_path) -> Optional['JobState']:
+        path = cls.path_for(job_path)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(path, json.load(f))
+    
+    @property
+    def entries(self) -> List[Dict]:
+        return self.data['questions']
+    
+    @property
+    def options(self) -> Dict:
+        return self.data.get('options', {})
+    
+    def counts(self) -> Dict[str, int]:
+        counts = {'queued': 0, 'sent': 0, 'done': 0, 'failed': 0}
+        for entry in self.entries:
+            counts[entry.get('status', 'queued')] = counts.get(entry.get('status', 'queued'), 0) + 1
+        return counts
+    
+    def resumable(self, idx: int) -> bool:
+        """送信済みで会話URLが分かっている（再質問せず再接続できる）か"""
+        entry = self.entries[idx]
+        return entry.get('status') in ('sent', 'failed') and '/c/' in (entry.get('url') or '')
+    
+    def mark(self, idx: int, **fields):
+        self.entries[idx].update(fields, updated_at=time.time())
+        self.save()
+    
+    def save(self):
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
 # ========================================
 # ChatGPT Controller
 # ========================================
@@ -206,16 +709,29 @@ class ChatGPTController:
     
     BRIDGE_URL = "ws://localhost:9224"
     
-    def __init__(self, timeout: int = 1200, poll_interval: int = 5, auto_bridge: bool = True):
+    def __init__(self, timeout: int = 1200, poll_interval: int = 5, auto_bridge: bool = True,
+                 cache: AnswerCache = None, poll_policy=None):
         self.timeout = timeout
         self.poll_interval = poll_interval
         self.auto_bridge = auto_bridge
+        self.cache = cache or AnswerCache(mode='off')  # 回答キャッシュ（CLI では --cache で指定）
+        # 回答待ちの確認間隔（既定は応答時間の履歴から決める。--poll fixed で従来の固定間隔）
+        self.poll_policy = poll_policy or AdaptivePollPolicy(base_interval=poll_interval)
         self._ws = None
         self._request_id = 0
-        self._pending = {}
-        self._lock = asyncio.Lock()  # WebSocket排他制御用
+        self._pending: Dict[str, asyncio.Future] = {}  # requestId → 応答待ちの Future
+        self._reader_task = None
+        self._blob_uploads: Dict[str, asyncio.Task] = {}  # blobId → ブリッジへの登録処理（同じ内容は1回だけ送る）
+        self._blob_supported = None  # ブリッジが blob 登録に対応しているか（未確認: None）
+        self._subscriptions: Dict[str, asyncio.Queue] = {}  # subscriptionId → push イベントのキュー
+        self._push_supported = None  # 拡張機能が回答の push 配信に対応しているか（未確認: None）
+        # push 配信でこの秒数イベントが届かなければ生成中かを確認し、止まっていればポーリングへ切り替える
+        self.stream_idle_timeout = 60
+        self._lock = asyncio.Lock()  # 接続処理の排他制御用
+        self._send_lock = asyncio.Lock()  # 送信の排他制御用（並行するコマンドの send を直列化）
         self._session_tabs = []  # セッションタブ情報のリスト（id/url）
         self._load_session_tabs()  # 前回のセッションタブを復元
+        self.pool = TabPool(self)  # ウォームタブ（pool start で作成したときだけ使われる）
     
     # ========================================
     # WebSocket通信
@@ -236,23 +752,87 @@ class ChatGPTController:
                 self._ws = await websockets.connect(self.BRIDGE_URL)
             except Exception as e:
                 raise ConnectionError(f"Failed to connect to bridge server: {e}")
+            # 接続ごとに応答待ちテーブルと受信タスクを持つ（旧接続の切断処理が混ざらないように）
+            self._pending = {}
+            self._reader_task = asyncio.create_task(self._reader(self._ws, self._pending))
     
-    async def _cmd(self, **kwargs) -> Dict:
-        """コマンドを送信して応答を待つ（同期方式・排他制御付き）"""
-        async with self._lock:  # WebSocket操作を排他制御
+    async def _reader(self, ws, pending: Dict[str, asyncio.Future]):
+        """受信専用タスク: 応答を requestId で待機中の Future に振り分ける"""
+        error = 'Connection closed'
+        try:
+            async for message in ws:
+                try:
+                    resp = json.loads(message)
+                except json.JSONDecodeError:
+                    print(f"[Warning] Ignoring malformed message from bridge: {str(message)[:100]!r}")
+                    continue
+                try:
+                    self._dispatch(resp, pending)
+                except Exception as e:
+                    # 1件の振り分け失敗で受信タスクを止めない
+                    print(f"[Warning] Failed to dispatch bridge message: {e!r}")
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except Exception as e:
+            error = f'Connection closed: {e!r}'
+            print(f"[Warning] Bridge reader stopped: {e!r}")
+        finally:
+            # 接続断: 応答待ちのコマンドはエラーで返す
+            for future in pending.values():
+                if not future.done():
+                    future.set_result({'error': error})
+            pending.clear()
+            for queue in self._subscriptions.values():
+                queue.put_nowait({'type': 'response_event', 'event': 'error', 'error': error})
+    
+    def _dispatch(self, resp: Dict, pending: Dict[str, asyncio.Future]):
+        """受信した1件を push イベントの購読キュー、または応答待ちの Future へ振り分ける"""
+        if resp.get('type') == 'response_event':
+            # 購読中の回答の push イベント（購読開始の応答より先に届くこともある）
+            self._subscription_queue(resp.get('subscriptionId')).put_nowait(resp)
+            return
+        future = pending.pop(resp.get('requestId'), None)
+        if future is None and 'requestId' not in resp and pending:
+            # requestId を返さないエラー応答（旧ブリッジ）は送信順で対応付ける
+            future = pending.pop(next(iter(pending)))
+        if future is not None and not future.done():
+            future.set_result(resp)
+    
+    def _subscription_queue(self, sub_id: str) -> asyncio.Queue:
+        queue = self._subscriptions.get(sub_id)
+        if queue is None:
+            queue = self._subscriptions[sub_id] = asyncio.Queue()
+        return queue
+    
+    async def _send(self, ws, payload):
+        """送信を直列化して送る（複数タスクから同じ接続へ同時に send しない）"""
+        async with self._send_lock:
+            await ws.send(payload)
+    
+    async def _cmd(self, timeout: float = BridgeServer.DEFAULT_TIMEOUT, **kwargs) -> Dict:
+        """
+        コマンドを送信して応答を待つ（多重化: 1本の WebSocket で複数コマンドを同時に送受信）
+
+        応答の受信は _reader が一括で行い、requestId で各コマンドの Future に振り分ける。
+        timeout はブリッジにも bridgeTimeout として渡し、ブリッジ側の応答待ちと揃える。
+        """
+        async with self._lock:
             await self.connect()
-            self._request_id += 1
-            req_id = f"r{self._request_id}"
-            kwargs['requestId'] = req_id
-            
-            await self._ws.send(json.dumps(kwargs))
-            
-            # 応答を待つ（同期的に受信）
-            try:
-                response = await asyncio.wait_for(self._ws.recv(), timeout=30)
-                return json.loads(response)
-            except asyncio.TimeoutError:
-                return {'error': 'Timeout waiting for response'}
+        self._request_id += 1
+        req_id = f"r{self._request_id}"
+        kwargs['requestId'] = req_id
+        kwargs['bridgeTimeout'] = timeout
+        pending = self._pending
+        future = asyncio.get_running_loop().create_future()
+        pending[req_id] = future
+        try:
+            await self._send(self._ws, json.dumps(kwargs))
+            # ブリッジの Timeout 応答が先に届くよう少し長めに待つ
+            return await asyncio.wait_for(future, timeout=timeout + 5)
+        except asyncio.TimeoutError:
+            return {'error': 'Timeout waiting for response'}
+        finally:
+            pending.pop(req_id, None)
     
     # ========================================
     # タブ操作
@@ -606,6 +1186,98 @@ class ChatGPTController:
             return self._clean_file_citations(response, attached_files)
         return ''
     
+    async def subscribe_response(self, tab_id: int = None, after_count: int = 0) -> Optional[str]:
+        """回答の push 配信を購読（拡張機能が未対応なら None）
+        
+        Args:
+            tab_id: タブID
+            after_count: 購読開始時点の回答数（これより後の回答を配信対象にする）
+        """
+        if self._push_supported is False:
+            return None
+        result = await self._cmd(type='chatgpt_subscribe_response', tabId=tab_id, afterCount=after_count,
+                                 timeout=10)
+        if result.get('success') and result.get('subscriptionId'):
+            self._push_supported = True
+            return result['subscriptionId']
+        if self._push_supported is None and not BridgeServer.is_transient_error(result.get('error')):
+            self._push_supported = False  # 明示的に拒否した（未対応の拡張機能）: 以降はポーリングのみ
+        return None
+    
+    async def stream_response(self, tab_id: int, after_count: int = 0, attached_files: List[str] = None,
+                              timeout: float = None, label: str = None) -> Optional[str]:
+        """回答を push 配信で受け取り、本文を組み立てて返す（ポーリング不要）
+        
+        拡張機能が MutationObserver で検出した差分（delta）と生成完了（finished）を受け取る。
+        delta は {offset, text}: 組み立て中の本文を offset で切り詰めて text を連結する
+        （再描画で前方が書き換わっても追従できる）。finished の length と一致しない場合だけ
+        get_response で1回取り直す。
+        
+        stream_idle_timeout 秒イベントが届かないときは is_generating で確認し、生成中でなければ
+        （finished の取りこぼし・タブの再読み込み等）購読をやめて None を返す。
+        
+        Returns:
+            回答本文。購読に未対応・接続断・タイムアウト・停止検出の場合は None（呼び出し側はポーリングで継続）
+        """
+        sub_id = await self.subscribe_response(tab_id, after_count)
+        if sub_id is None:
+            return None
+        queue = self._subscription_queue(sub_id)
+        deadline = time.time() + (self.timeout if timeout is None else timeout)
+        text = ''
+        in_sync = True
+        finished = False
+        last_report = time.time()
+        try:
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=min(remaining, self.stream_idle_timeout))
+                except asyncio.TimeoutError:
+                    if time.time() >= deadline or not await self.is_generating(tab_id):
+                        if label:
+                            print(f"  {label}: No stream events for {self.stream_idle_timeout}s, switching to polling")
+                        return None
+                    continue
+                kind = event.get('event')
+                if kind == 'delta':
+                    offset = event.get('offset', len(text))
+                    if offset > len(text):
+                        in_sync = False  # 差分の取りこぼし: 完了時に全文を取り直す
+                    text = text[:offset] + event.get('text', '')
+                    if label and time.time() - last_report >= self.poll_interval:
+                        print(f"  {label}: Streaming... ({len(text)} chars)")
+                        last_report = time.time()
+                elif kind == 'finished':
+                    finished = True
+                    if not in_sync or event.get('length', len(text)) != len(text):
+                        return await self.get_response(tab_id, attached_files=attached_files)
+                    return self._clean_file_citations(text, attached_files)
+                else:
+                    return None
+        finally:
+            self._subscriptions.pop(sub_id, None)
+            if not finished and self._ws is not None:
+                try:
+                    await self._cmd(type='chatgpt_unsubscribe_response', subscriptionId=sub_id, timeout=5)
+                except Exception:
+                    pass
+    
+    async def _response_at_timeout(self, tab_id: int, attached_files: List[str], last_response: str,
+                                   pre_count: int = None) -> str:
+        """タイムアウト時に回答を1回取り直す（push 配信待ちで時間を使い切ってもDOMの本文を残す）
+        
+        pre_count を指定した場合は、回答数がそれより増えているときだけ取り直した本文を使う。
+        """
+        response = await self.get_response(tab_id, attached_files=attached_files)
+        if pre_count is not None:
+            current_count = (await self._cmd(type='chatgpt_get_response', tabId=tab_id)).get('responseCount', 0)
+            if current_count <= pre_count:
+                return last_response
+        return response if response and len(response) > len(last_response) else last_response
+    
     def _clean_file_citations(self, text: str, attached_files: List[str] = None) -> str:
         """添付ファイル名の引用マーカーを除去
         
@@ -722,25 +1394,92 @@ class ChatGPTController:
         
         return False
     
+    async def upload_blob(self, path: Path) -> Optional[str]:
+        """
+        ファイルをブリッジに blob として登録し、blobId（内容の SHA-256）を返す
+
+        同じ内容の登録は1回だけ行う（並行して呼ばれても登録処理を共有し、ブリッジに
+        登録済みなら送信しない）。ブリッジが未対応なら None を返す。
+        """
+        if self._blob_supported is False:
+            return None
+        blob_id = file_digest(path)
+        task = self._blob_uploads.get(blob_id)
+        if task is None or (task.done() and (task.cancelled() or task.result() is None)):
+            task = self._blob_uploads[blob_id] = asyncio.create_task(self._send_blob(path, blob_id))
+        return await asyncio.shield(task)
+    
+    async def _send_blob(self, path: Path, blob_id: str) -> Optional[str]:
+        """blob_begin → バイナリフレームでチャンク送信 → blob_commit（ブリッジがサイズと SHA-256 を検証）"""
+        size = path.stat().st_size
+        resp = await self._cmd(type='blob_begin', blobId=blob_id, size=size)
+        if resp.get('blobId') != blob_id:
+            # 旧ブリッジはコマンドを拡張機能へ素通しするので blobId が返らない
+            if not BridgeServer.is_transient_error(resp.get('error')):
+                self._blob_supported = False
+            return None
+        self._blob_supported = True
+        if resp.get('have'):
+            return blob_id
+        
+        chunk_size = min(int(resp.get('chunkSize') or BridgeServer.BLOB_CHUNK), BridgeServer.BLOB_CHUNK)
+        header = blob_id.encode('ascii')
+        ws = self._ws
+        try:
+            with open(path, 'rb') as f:
+                offset = 0
+                for chunk in iter(lambda: f.read(chunk_size), b''):
+                    await self._send(ws, header + offset.to_bytes(8, 'big') + chunk)
+                    offset += len(chunk)
+        except (OSError, websockets.exceptions.ConnectionClosed) as e:
+            print(f"⚠️ blob送信失敗: {path.name} ({e})")
+            return None
+        
+        resp = await self._cmd(type='blob_commit', blobId=blob_id)
+        if not resp.get('success'):
+            print(f"⚠️ blob登録失敗: {path.name} ({resp.get('error')})")
+            return None
+        print(f"📤 blob登録: {path.name} ({size / (1 << 20):.1f}MB)")
+        return blob_id
+    
     async def attach_file(self, file_path: str, tab_id: int = None) -> Dict:
-        """ファイルを添付"""
+        """
+        ファイルを添付
+
+        内容はブリッジに blob として1回だけ登録し、各タブへは blobId で参照渡しする。
+        blob 未対応のブリッジでは従来どおり fileData（base64）を直接送る。
+        """
         path = Path(file_path)
         if not path.exists():
             return {'success': False, 'error': f'File not found: {file_path}'}
         
-        with open(path, 'rb') as f:
-            file_data = base64.b64encode(f.read()).decode('utf-8')
-        
         mime_type, _ = mimetypes.guess_type(str(path))
         if not mime_type:
             mime_type = 'application/octet-stream'
+        # 大きなファイルほど拡張機能への受け渡しに時間がかかる（1MB あたり1秒を上乗せ）
+        timeout = BridgeServer.DEFAULT_TIMEOUT + path.stat().st_size / (1 << 20)
+        
+        for _ in range(2):
+            blob_id = await self.upload_blob(path)
+            if blob_id is None:
+                break
+            result = await self._cmd(type='chatgpt_attach_file', blobId=blob_id, fileName=path.name,
+                                     mimeType=mime_type, tabId=tab_id, timeout=timeout)
+            if not result.get('blobMissing'):
+                return result
+            # ブリッジ側で blob が消えていた（キャッシュ削除など）: 登録し直して再試行
+            self._blob_uploads.pop(blob_id, None)
+        
+        with open(path, 'rb') as f:
+            file_data = base64.b64encode(f.read()).decode('utf-8')
         
         return await self._cmd(
             type='chatgpt_attach_file',
             fileData=file_data,
             fileName=path.name,
             mimeType=mime_type,
-            tabId=tab_id
+            tabId=tab_id,
+            timeout=timeout
         )
     
     async def attach_files(self, file_paths: List[str], tab_id: int = None) -> List[Dict]:
@@ -753,10 +1492,112 @@ class ChatGPTController:
         return results
     
     async def _wait_for_attachment_ready(self, tab_id: int, timeout: int = 30) -> bool:
-        """ファイル添付が完了し送信可能になるまで待機（固定3秒待機）"""
-        # ChatGPTの添付処理は通常1-3秒で完了するため、固定待機で対応
-        await asyncio.sleep(3.0)
-        return True
+        """ファイル添付が完了し送信可能になるまで待機（送信ボタンの有効化をプローブ）
+        
+        アップロード中は送信ボタンが disabled になる。送信ボタンが見つからない UI では
+        従来どおり3秒で準備完了とみなす。
+        """
+        start = time.time()
+        while time.time() - start < timeout:
+            result = await self._cmd(type='inspect_dom', tabId=tab_id, selector='button[data-testid="send-button"]')
+            elements = result.get('elements', [])
+            if result.get('matchCount', 0) > 0 and elements:
+                if any(el.get('visible', True) and not el.get('disabled') for el in elements):
+                    return True
+            elif time.time() - start >= 3.0:
+                return True
+            await asyncio.sleep(0.5)
+        return False
+    
+    def _cached_result(self, idx: int, question: str, model: str = None, thinking: str = None,
+                       files: List[str] = None) -> Optional[Dict]:
+        """回答キャッシュにヒットすれば、タブを使わずにそのまま結果にする"""
+        hit = self.cache.get('chatgpt', question, model, thinking, files or [])
+        if hit is None:
+            return None
+        return {
+            'success': True, 'index': idx, 'question': question, 'response': hit['response'],
+            'tab_id': None, 'url': hit.get('url'), 'elapsed': 0, 'cached': True,
+            'cached_at': hit['created_at']
+        }
+    
+    def _store_answer(self, result: Dict, model: str = None, thinking: str = None, files: List[str] = None):
+        """取得できた回答をキャッシュに保存（キャッシュから返した結果は保存し直さない）"""
+        if result.get('success') and not result.get('cached'):
+            self.cache.put('chatgpt', result.get('question', ''), model, thinking, files or [],
+                           result.get('response', ''), result.get('url'))
+    
+    async def _wait_for_answer(self, tab_id: int, label: str, attached_files: List[str] = None,
+                               model: str = None, thinking: str = None) -> Dict:
+        """新しい会話の回答が確定するまで待って取得（push 配信、非対応ならポーリングで安定判定）
+        
+        Returns:
+            {'success', 'response', 'elapsed'}（失敗時は 'error' も含む）
+        """
+        start = time.time()
+        last_response = ""
+        stable_count = 0
+        MIN_RESPONSE_LEN = 100  # 最低回答長（短すぎる回答は完了とみなさない）
+        poller = self.poll_policy.start('chatgpt', model, thinking)  # 確認間隔と安定判定回数
+        
+        # push 配信に対応していれば生成完了イベントで即確定（未対応・失敗時は下のポーリングへ）
+        streamed = await self.stream_response(tab_id, attached_files=attached_files, label=label)
+        if streamed and len(streamed) >= MIN_RESPONSE_LEN:
+            poller.finish()
+            return {'success': True, 'response': streamed, 'elapsed': time.time() - start}
+        
+        while True:
+            elapsed = time.time() - start
+            if elapsed > self.timeout:
+                print(f"  {label}: Timeout ({elapsed:.1f}s)")
+                response = await self._response_at_timeout(tab_id, attached_files, last_response)
+                return {'success': False, 'error': 'Timeout', 'response': response, 'elapsed': elapsed}
+            
+            generating = await self.is_generating(tab_id)
+            response = await self.get_response(tab_id, attached_files=attached_files)
+            poller.observe(generating, response if response and len(response) > 5 else '')
+            
+            if response and len(response) > 5:
+                if not generating:
+                    if response == last_response:
+                        stable_count += 1
+                        if stable_count >= poller.stable_polls:
+                            # 回答が短すぎる場合は待機継続
+                            if len(response) < MIN_RESPONSE_LEN:
+                                print(f"  {label}: Response too short ({len(response)} chars), waiting...")
+                                stable_count = 0
+                                await asyncio.sleep(poller.interval())
+                                continue
+                            
+                            # 完了確定後、DOM確定のため追加で3秒待機
+                            print(f"  {label}: Finalizing response...")
+                            await asyncio.sleep(3)
+                            
+                            # 最終取得（DOM完全確定後）
+                            final_response = await self.get_response(tab_id, attached_files=attached_files)
+                            
+                            # 最終取得で回答が変わっていたら、安定待機をリセット
+                            if final_response and final_response != response:
+                                print(f"  {label}: Response still changing, resetting...")
+                                poller.false_finish()
+                                last_response = final_response
+                                stable_count = 0
+                                await asyncio.sleep(poller.interval())
+                                continue
+                            
+                            if final_response and len(final_response) >= len(response):
+                                response = final_response
+                            poller.finish()
+                            return {'success': True, 'response': response, 'elapsed': elapsed}
+                    else:
+                        stable_count = 0
+                else:
+                    stable_count = 0
+                last_response = response
+            
+            status = "Generating..." if generating else "Waiting..."
+            print(f"  {label}: {status} ({int(elapsed)}s)")
+            await asyncio.sleep(poller.interval())
     
     # ========================================
     # 並列検索
@@ -768,17 +1609,21 @@ class ChatGPTController:
         model: str = None,
         thinking: str = None,
         files: List[str] = None,
-        close_tabs: bool = False
+        close_tabs: bool = False,
+        setup_concurrency: int = 5,
+        use_pool: bool = True
     ) -> List[Dict]:
         """
         複数の質問を並列で送信し、全ての応答を取得
         
         Args:
-            questions: 質問リスト（3個以上必須、最大10個）
+            questions: 質問リスト（3個以上必須。10個を超える分は queue_search でタブを使い回す）
             model: 使用するモデル（例: 'ChatGPT 5.2 Thinking'）
             thinking: 推論強度（light/standard/heavy/extended）
             files: 添付するファイルパスのリスト（全タブに同じファイルを添付）
             close_tabs: 回答取得後にタブを閉じるか（デフォルト: False - マルチターン対応のため保持）
+            setup_concurrency: 同時にセットアップ（開く→モデル→Thinking→添付→送信）するタブ数の上限
+            use_pool: ウォームタブのプールがあれば設定済みタブを使う（モデル/Thinking選択を省略）
         
         Returns:
             各質問に対する結果のリスト
@@ -801,9 +1646,10 @@ class ChatGPTController:
             }]
         
         if n > MAX_PARALLEL:
-            print(f"Warning: Maximum {MAX_PARALLEL} parallel queries allowed. Truncating from {n}.")
-            questions = questions[:MAX_PARALLEL]
-            n = MAX_PARALLEL
+            # 同時タブ数は MAX_PARALLEL に抑え、残りはキューでタブを使い回して処理する
+            print(f"[Info] {n} questions exceed {MAX_PARALLEL} parallel tabs. Using the queue scheduler.")
+            return await self.queue_search(questions, model=model, thinking=thinking, files=files,
+                                           workers=MAX_PARALLEL, close_tabs=close_tabs, use_pool=use_pool)
         
         print(f"\n{'='*60}")
         print(f"ChatGPT Parallel Search: {n} questions")
@@ -816,67 +1662,6 @@ class ChatGPTController:
             print(f"Files: {', '.join(files)}")
         print()
         
-        # 1. タブを開く
-        print(f"[1/4] Opening {n} ChatGPT tabs...")
-        tab_ids = []
-        for i in range(n):
-            result = await self.new_tab('https://chatgpt.com/')
-            if result.get('tab', {}).get('id'):
-                tab_ids.append(result['tab']['id'])
-                print(f"  Tab {i+1}: ID={result['tab']['id']}")
-            await asyncio.sleep(1)
-        
-        if len(tab_ids) != n:
-            return [{'success': False, 'error': f'Failed to open tabs: {len(tab_ids)}/{n}'}]
-        
-        print("  Waiting for pages to load...")
-        await asyncio.sleep(3)
-        
-        # 2. モデル/Thinking設定
-        if model:
-            print(f"\n[1.5] Selecting model: {model}...")
-            for i, tid in enumerate(tab_ids):
-                r = await self.select_model(model, tid)
-                status = "OK" if r.get('success') else f"FAIL: {r.get('error', '')}"
-                print(f"  Tab {i+1}: {status}")
-                await asyncio.sleep(0.5)
-        
-        if thinking:
-            print(f"\n[1.6] Setting thinking: {thinking}...")
-            for i, tid in enumerate(tab_ids):
-                r = await self.set_thinking(thinking, tid)
-                status = "OK" if r.get('success') else f"FAIL: {r.get('error', '')}"
-                print(f"  Tab {i+1}: {status}")
-                await asyncio.sleep(0.5)
-        
-        # 2.5 ファイル添付（オプション）
-        if files:
-            print(f"\n[1.7] Attaching files...")
-            for i, tid in enumerate(tab_ids):
-                for f in files:
-                    r = await self.attach_file(f, tid)
-                    status = "OK" if r.get('success') else f"FAIL: {r.get('error', '')}"
-                    print(f"  Tab {i+1}: {Path(f).name} - {status}")
-                
-                # 添付完了まで待機（送信ボタンがenabledになるまで）
-                print(f"  Tab {i+1}: Waiting for attachment ready...")
-                ready = await self._wait_for_attachment_ready(tid)
-                if ready:
-                    print(f"  Tab {i+1}: Attachment ready")
-                else:
-                    print(f"  Tab {i+1}: Warning - attachment may not be ready")
-        
-        # 3. 質問を送信
-        print(f"\n[2/4] Sending questions...")
-        for i, (tid, q) in enumerate(zip(tab_ids, questions)):
-            send_result = await self.send_message(q, tid)
-            status = "OK" if send_result.get('success') else f"FAIL: {send_result.get('error', '')}"
-            print(f"  Tab {i+1}: Sent '{q[:50]}...' ({status})")
-            await asyncio.sleep(0.5)
-        
-        # 4. 回答を待機（非同期・各クエリごとに別MDファイル保存）
-        print(f"\n[3/4] Waiting for responses (timeout: {self.timeout}s)...")
-        
         topic = self._derive_topic_from_questions(questions)
         
         # 各クエリごとのMDファイルパスを生成
@@ -887,93 +1672,106 @@ class ChatGPTController:
         
         results = [None] * n  # 結果格納用
         completed = [False] * n  # 完了フラグ
-        
-        async def wait_for_response(tid: int, idx: int, question: str) -> Dict:
-            start = time.time()
-            last_response = ""
-            stable_count = 0
-            MIN_RESPONSE_LEN = 100  # 最低回答長（短すぎる回答は完了とみなさない）
-            STABLE_THRESHOLD = 4   # 安定判定回数（5秒 x 4 = 20秒）
-            
-            while True:
-                elapsed = time.time() - start
-                if elapsed > self.timeout:
-                    url = await self._get_open_tab_url(tid)
-                    result = {
-                        'success': False, 'error': 'Timeout',
-                        'index': idx, 'question': question, 'tab_id': tid,
-                        'url': url,
-                        'response': last_response, 'elapsed': elapsed
-                    }
-                    # タイムアウト時も個別MDに書き込み
-                    self._write_individual_md(md_paths[idx], result)
-                    results[idx] = result
-                    completed[idx] = True
-                    print(f"  Tab {idx+1}: Timeout ({elapsed:.1f}s)")
-                    return result
+        tab_ids: List[Optional[int]] = [None] * n
+        setup_slots = asyncio.Semaphore(max(1, setup_concurrency))
+        cached = {}
+        for idx, question in enumerate(questions):
+            hit = self._cached_result(idx, question, model, thinking, files)
+            if hit:
+                cached[idx] = hit
+        if cached:
+            print(f"[Cache] {len(cached)}/{n} answer(s) served from cache")
+        pending = [idx for idx in range(n) if idx not in cached]
+        warm_tabs = await self.pool.acquire(len(pending), model, thinking) if use_pool else []
+        warm_by_idx = dict(zip(pending, warm_tabs))
+        if warm_tabs:
+            self.pool.start_refill()
+        
+        async def setup_tab(idx: int, question: str) -> Optional[int]:
+            """1タブ分のセットアップ（固定待機ではなく準備完了をプローブしてから次へ進む）"""
+            label = f"Tab {idx+1}"
+            async with setup_slots:
+                warm = warm_by_idx.get(idx)
+                if warm:
+                    tid = warm['id']
+                    print(f"  {label}: ID={tid} (warm)")
+                else:
+                    result = await self.new_tab('https://chatgpt.com/')
+                    tid = result.get('tab', {}).get('id')
+                    if not tid:
+                        print(f"  {label}: FAIL: {result.get('error', 'Failed to open tab')}")
+                        return None
+                    print(f"  {label}: ID={tid}")
+                    if not await self._wait_for_input_ready(tid):
+                        print(f"  {label}: Warning - page may not be ready")
+                tab_ids[idx] = tid
                 
-                generating = await self.is_generating(tid)
-                response = await self.get_response(tid, attached_files=files)
+                if model and not warm:
+                    r = await self.select_model(model, tid)
+                    print(f"  {label}: Model {'OK' if r.get('success') else 'FAIL: ' + str(r.get('error', ''))}")
+                if thinking and not warm:
+                    r = await self.set_thinking(thinking, tid)
+                    print(f"  {label}: Thinking {'OK' if r.get('success') else 'FAIL: ' + str(r.get('error', ''))}")
+                if files:
+                    for f in files:
+                        r = await self.attach_file(f, tid)
+                        status = "OK" if r.get('success') else f"FAIL: {r.get('error', '')}"
+                        print(f"  {label}: {Path(f).name} - {status}")
+                    if not await self._wait_for_attachment_ready(tid):
+                        print(f"  {label}: Warning - attachment may not be ready")
                 
-                if response and len(response) > 5:
-                    if not generating:
-                        if response == last_response:
-                            stable_count += 1
-                            # stable_count >= STABLE_THRESHOLD で安定確認
-                            if stable_count >= STABLE_THRESHOLD:
-                                # 回答が短すぎる場合は待機継続
-                                if len(response) < MIN_RESPONSE_LEN:
-                                    print(f"  Tab {idx+1}: Response too short ({len(response)} chars), waiting...")
-                                    stable_count = 0
-                                    await asyncio.sleep(self.poll_interval)
-                                    continue
-                                
-                                # 完了確定後、DOM確定のため追加で3秒待機
-                                print(f"  Tab {idx+1}: Finalizing response...")
-                                await asyncio.sleep(3)
-                                
-                                # 最終取得（DOM完全確定後）
-                                final_response = await self.get_response(tid, attached_files=files)
-                                
-                                # 最終取得で回答が変わっていたら、安定待機をリセット
-                                if final_response and final_response != response:
-                                    print(f"  Tab {idx+1}: Response still changing, resetting...")
-                                    last_response = final_response
-                                    stable_count = 0
-                                    await asyncio.sleep(self.poll_interval)
-                                    continue
-                                
-                                if final_response and len(final_response) >= len(response):
-                                    response = final_response
-                                
-                                url = await self._get_open_tab_url(tid)
-                                result = {
-                                    'success': True, 'index': idx,
-                                    'question': question, 'response': response,
-                                    'tab_id': tid, 'url': url, 'elapsed': elapsed
-                                }
-                                # 取得した瞬間に個別MDに書き込み
-                                self._write_individual_md(md_paths[idx], result)
-                                results[idx] = result
-                                completed[idx] = True
-                                print(f"  Tab {idx+1}: Done ({elapsed:.1f}s) → {Path(md_paths[idx]).name}")
-                                return result
-                        else:
-                            stable_count = 0
-                    else:
-                        stable_count = 0
-                    last_response = response
-                
-                status = "Generating..." if generating else "Waiting..."
-                print(f"  Tab {idx+1}: {status} ({int(elapsed)}s)")
-                await asyncio.sleep(self.poll_interval)
-        
-        # 非同期で並列実行（各タスクが独立して完了）
-        tasks = [asyncio.create_task(wait_for_response(tid, i, q)) 
-                 for i, (tid, q) in enumerate(zip(tab_ids, questions))]
+                send_result = await self.send_message(question, tid)
+                status = "OK" if send_result.get('success') else f"FAIL: {send_result.get('error', '')}"
+                print(f"  {label}: Sent '{question[:50]}...' ({status})")
+                return tid
         
-        # 全タスク完了を待つ
-        await asyncio.gather(*tasks)
+        async def wait_for_response(tid: int, idx: int, question: str) -> Dict:
+            answer = await self._wait_for_answer(tid, f"Tab {idx+1}", attached_files=files,
+                                                  model=model, thinking=thinking)
+            url = await self._get_open_tab_url(tid)
+            result = {
+                'success': answer['success'], 'index': idx,
+                'question': question, 'response': answer['response'],
+                'tab_id': tid, 'url': url, 'elapsed': answer['elapsed']
+            }
+            if not answer['success']:
+                result['error'] = answer.get('error')
+            self._store_answer(result, model, thinking, files)
+            # 取得した瞬間に個別MDに書き込み（タイムアウト時も）
+            self._write_individual_md(md_paths[idx], result)
+            results[idx] = result
+            completed[idx] = True
+            if answer['success']:
+                print(f"  Tab {idx+1}: Done ({answer['elapsed']:.1f}s) → {Path(md_paths[idx]).name}")
+            return result
+        
+        async def run_question(idx: int, question: str) -> Dict:
+            if idx in cached:
+                # キャッシュヒット: タブを開かずに個別MDを書く
+                self._write_individual_md(md_paths[idx], cached[idx])
+                results[idx] = cached[idx]
+                completed[idx] = True
+                print(f"  Q{idx+1}: Cache hit ({format_age(cached[idx]['cached_at'])} old) → {Path(md_paths[idx]).name}")
+                return cached[idx]
+            tid = await setup_tab(idx, question)
+            if tid is None:
+                result = {
+                    'success': False, 'error': 'Failed to open tab',
+                    'index': idx, 'question': question, 'tab_id': None,
+                    'response': '', 'elapsed': 0
+                }
+                self._write_individual_md(md_paths[idx], result)
+                results[idx] = result
+                completed[idx] = True
+                return result
+            # 送信できたタブから順に回答待ちへ移る（他タブのセットアップ完了は待たない）
+            return await wait_for_response(tid, idx, question)
+        
+        # タブごとに セットアップ → 回答待ち を並行実行（セットアップは setup_concurrency 本まで同時）
+        print(f"\n[1/4] Setting up {len(pending)} ChatGPT tabs (concurrency: {max(1, setup_concurrency)})...")
+        print(f"[2-3/4] Sending each question once its tab is ready, then waiting (timeout: {self.timeout}s)...")
+        await asyncio.gather(*[run_question(i, q) for i, q in enumerate(questions)])
+        tab_ids = [tid for tid in tab_ids if tid is not None]
         
         # 5. 結果サマリー表示
         print(f"\n{'='*60}")
@@ -1005,6 +1803,262 @@ class ChatGPTController:
                 await self.close_tab(tid)
             print("  Done.")
         
+        # 回答の保存・表示を済ませてから、並行して進めていたプールの補充を待つ
+        await self.pool.wait_refill()
+        return results
+    
+    # ========================================
+    # キュー検索（任意件数の質問をワーカータブで順に処理）
+    # ========================================
+    
+    NEW_CHAT_SELECTOR = '[data-testid="create-new-chat-button"]'
+    
+    @staticmethod
+    def _normalize_queue_item(item, model: str = None, thinking: str = None, files: List[str] = None) -> Dict:
+        """質問（文字列 or {question, model, thinking, files}）を、既定値で補ったジョブにする"""
+        if isinstance(item, str):
+            item = {'question': item}
+        job_files = item.get('files')
+        if isinstance(job_files, str):
+            job_files = [job_files]
+        return {
+            'question': str(item.get('question', '')),
+            'model': item.get('model') or model,
+            'thinking': item.get('thinking') or thinking,
+            'files': job_files if job_files is not None else (files or []),
+        }
+    
+    async def _start_new_chat(self, tab_id: int) -> Optional[int]:
+        """回答済みのタブを新しい会話に切り替える（できなければ閉じて新しいタブを開く）"""
+        r = await self.click(self.NEW_CHAT_SELECTOR, tab_id)
+        if r.get('success') and await self._wait_for_input_ready(tab_id, timeout=15):
+            url = await self._get_open_tab_url(tab_id) or ''
+            if '/c/' not in url:
+                return tab_id
+        await self.close_tab(tab_id)
+        result = await self.new_tab('https://chatgpt.com/')
+        new_id = result.get('tab', {}).get('id')
+        if new_id:
+            await self._wait_for_input_ready(new_id)
+        return new_id
+    
+    async def _wait_for_conversation_url(self, tab_id: int, timeout: float = 10.0) -> Optional[str]:
+        """送信後に会話URL（/c/...）が付くまで待って返す（付かなければその時点のURL）"""
+        start = time.time()
+        url = await self._get_open_tab_url(tab_id)
+        while '/c/' not in (url or '') and time.time() - start < timeout:
+            await asyncio.sleep(0.5)
+            url = await self._get_open_tab_url(tab_id)
+        return url
+    
+    async def queue_search(
+        self,
+        questions: List,
+        model: str = None,
+        thinking: str = None,
+        files: List[str] = None,
+        workers: int = 5,
+        close_tabs: bool = False,
+        use_pool: bool = True,
+        state: JobState = None
+    ) -> List[Dict]:
+        """
+        任意件数の質問をキューに積み、最大 workers 個のタブで順に処理する
+        
+        回答を取得したタブは新しい会話に切り替えて次の質問に使い回す（タブ数とセットアップ回数を抑える）。
+        
+        Args:
+            questions: 質問リスト。要素は文字列、または {question, model, thinking, files}（質問ごとの上書き）
+            model: 既定のモデル
+            thinking: 既定の推論強度
+            files: 既定の添付ファイル（質問側で files を指定するとそちらを使う）
+            workers: 同時に使うタブ数
+            close_tabs: 完了後にワーカータブを閉じるか
+            use_pool: ウォームタブのプールがあれば使う
+            state: バッチジョブのチェックポイント（指定時は questions の代わりに state の質問を使い、進捗を記録する）
+        
+        Returns:
+            各質問に対する結果のリスト（入力順）
+        """
+        if state is not None:
+            questions = state.entries
+        jobs = [self._normalize_queue_item(q, model, thinking, files) for q in questions]
+        if state is None:
+            jobs = [j for j in jobs if j['question'].strip()]
+        n = len(jobs)
+        if n == 0:
+            return [{'success': False, 'error': 'No questions provided'}]
+        workers = max(1, min(workers, n))
+        
+        print(f"\n{'='*60}")
+        print(f"ChatGPT Queue Search: {n} questions / {workers} worker tabs")
+        print('='*60)
+        
+        topic = self._derive_topic_from_questions([j['question'] for j in jobs])
+        if state is not None and all(entry.get('md_path') for entry in state.entries):
+            md_paths = [entry['md_path'] for entry in state.entries]  # 再開時は前回のMDに書き込む
+        else:
+            md_paths = self._init_individual_mds([j['question'] for j in jobs], model, thinking, topic=topic,
+                                                 overrides=jobs)
+            if state is not None:
+                for entry, md_path in zip(state.entries, md_paths):
+                    entry['md_path'] = md_path
+                state.save()
+        print(f"[Output] Writing to {len(md_paths)} separate MD files (first: {md_paths[0]})")
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        results: List[Optional[Dict]] = [None] * n
+        reattach_ids: List[int] = []
+        for idx in range(n):
+            entry = state.entries[idx] if state is not None else {}
+            if entry.get('status') == 'done':
+                results[idx] = {'success': True, 'index': idx, 'question': jobs[idx]['question'],
+                                'tab_id': entry.get('tab_id'), 'url': entry.get('url'),
+                                'elapsed': entry.get('elapsed', 0), 'md_path': md_paths[idx], 'resumed': True}
+            elif state is not None and state.resumable(idx):
+                reattach_ids.append(idx)
+            else:
+                queue.put_nowait(idx)
+        if state is not None:
+            print(f"[Job] {n - queue.qsize() - len(reattach_ids)} done, "
+                  f"{len(reattach_ids)} to re-attach, {queue.qsize()} to ask")
+        workers = max(1, min(workers, queue.qsize())) if queue.qsize() else 0
+        warm_tabs = await self.pool.acquire(workers, model, thinking) if use_pool and workers else []
+        if warm_tabs:
+            self.pool.start_refill()
+        worker_tabs: List[Optional[int]] = [None] * workers
+        reattached_tabs: List[int] = []
+        
+        def checkpoint(idx: int, **fields):
+            if state is not None:
+                state.mark(idx, **fields)
+        
+        def record(idx: int, tid: Optional[int], url: Optional[str], answer: Dict):
+            result = {
+                'success': answer['success'], 'index': idx,
+                'question': jobs[idx]['question'], 'response': answer['response'],
+                'tab_id': tid, 'url': url, 'elapsed': answer['elapsed']
+            }
+            if answer.get('cached'):
+                result['cached'] = True
+                result['cached_at'] = answer['cached_at']
+            if not answer['success']:
+                result['error'] = answer.get('error')
+            self._store_answer(result, jobs[idx]['model'], jobs[idx]['thinking'], jobs[idx]['files'])
+            self._write_individual_md(md_paths[idx], result)
+            result['md_path'] = md_paths[idx]
+            results[idx] = result
+            checkpoint(idx, status='done' if answer['success'] else 'failed', tab_id=tid, url=url,
+                       elapsed=answer['elapsed'], error=answer.get('error'))
+            done = sum(1 for r in results if r is not None)
+            if answer.get('cached'):
+                status = f"Cache hit ({format_age(answer['cached_at'])} old)"
+            else:
+                status = f"Done ({answer['elapsed']:.1f}s)" if answer['success'] else f"FAIL ({answer.get('error')}) ({answer['elapsed']:.1f}s)"
+            print(f"  Q{idx+1}: {status} [{done}/{n}]")
+        
+        async def reattach(idx: int):
+            """送信済みの質問: 記録した会話URLのタブに再接続して回答だけ取得する"""
+            entry = state.entries[idx]
+            url, tid = entry['url'], entry.get('tab_id')
+            if not tid or await self._get_open_tab_url(tid) != url:
+                result = await self.new_tab(url)
+                tid = result.get('tab', {}).get('id')
+                if not tid:
+                    checkpoint(idx, status='queued', tab_id=None)
+                    queue.put_nowait(idx)
+                    return
+                await self._wait_for_input_ready(tid)
+            reattached_tabs.append(tid)
+            checkpoint(idx, status='sent', tab_id=tid)
+            print(f"  Q{idx+1}: Re-attached to tab {tid} ({url})")
+            answer = await self._wait_for_answer(tid, f"Q{idx+1}", attached_files=jobs[idx]['files'],
+                                              model=jobs[idx]['model'], thinking=jobs[idx]['thinking'])
+            record(idx, tid, await self._get_open_tab_url(tid) or url, answer)
+        
+        async def run_worker(w: int):
+            label = f"Worker {w+1}"
+            tab = None  # {'id', 'model', 'thinking', 'used'}
+            if w < len(warm_tabs):
+                tab = {'id': warm_tabs[w]['id'], 'model': warm_tabs[w].get('model'),
+                       'thinking': warm_tabs[w].get('thinking'), 'used': False}
+            while True:
+                try:
+                    idx = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                job = jobs[idx]
+                hit = self._cached_result(idx, job['question'], job['model'], job['thinking'], job['files'])
+                if hit:
+                    record(idx, None, hit['url'], hit)
+                    continue
+                
+                # タブを用意（初回は新規、2問目以降は新しい会話に切り替えて使い回す）
+                if tab is None:
+                    result = await self.new_tab('https://chatgpt.com/')
+                    tid = result.get('tab', {}).get('id')
+                    if tid:
+                        await self._wait_for_input_ready(tid)
+                        tab = {'id': tid, 'model': None, 'thinking': None, 'used': False}
+                elif tab['used']:
+                    tid = await self._start_new_chat(tab['id'])
+                    tab = {'id': tid, 'model': tab['model'] if tid == tab['id'] else None,
+                           'thinking': tab['thinking'] if tid == tab['id'] else None,
+                           'used': False} if tid else None
+                if tab is None:
+                    record(idx, None, None, {'success': False, 'error': 'Failed to open tab',
+                                             'response': '', 'elapsed': 0})
+                    continue
+                tid = tab['id']
+                worker_tabs[w] = tid
+                
+                # 質問ごとのモデル/Thinking（タブの現在の設定と違うときだけ切り替える）
+                if job['model'] and job['model'] != tab['model']:
+                    r = await self.select_model(job['model'], tid)
+                    tab['model'] = job['model'] if r.get('success') else None
+                if job['thinking'] and job['thinking'] != tab['thinking']:
+                    r = await self.set_thinking(job['thinking'], tid)
+                    tab['thinking'] = job['thinking'] if r.get('success') else None
+                for f in job['files']:
+                    r = await self.attach_file(f, tid)
+                    if not r.get('success'):
+                        print(f"  {label}: {Path(f).name} - FAIL: {r.get('error', '')}")
+                if job['files']:
+                    await self._wait_for_attachment_ready(tid)
+                
+                send_result = await self.send_message(job['question'], tid)
+                tab['used'] = True
+                print(f"  {label}: Q{idx+1} sent to tab {tid} "
+                      f"({'OK' if send_result.get('success') else 'FAIL: ' + str(send_result.get('error', ''))})")
+                if send_result.get('success'):
+                    if state is not None:
+                        checkpoint(idx, status='sent', tab_id=tid, url=await self._wait_for_conversation_url(tid))
+                    answer = await self._wait_for_answer(tid, f"Q{idx+1}", attached_files=job['files'],
+                                                          model=job['model'], thinking=job['thinking'])
+                else:
+                    answer = {'success': False, 'error': send_result.get('error', 'Send failed'),
+                              'response': '', 'elapsed': 0}
+                record(idx, tid, await self._get_open_tab_url(tid), answer)
+        
+        # 再接続に失敗した質問はキューに戻るので、空になるまでワーカーを回す
+        await asyncio.gather(*[run_worker(w) for w in range(workers)], *[reattach(i) for i in reattach_ids])
+        while not queue.empty():
+            extra = max(1, min(len(worker_tabs) or 1, queue.qsize()))
+            worker_tabs.extend([None] * extra)
+            await asyncio.gather(*[run_worker(len(worker_tabs) - extra + w) for w in range(extra)])
+        
+        ok = sum(1 for r in results if r and r.get('success'))
+        print(f"\n[Queue] {ok}/{n} succeeded")
+        
+        tab_ids = [tid for tid in worker_tabs if tid is not None] + reattached_tabs
+        if close_tabs:
+            for tid in tab_ids:
+                await self.close_tab(tid)
+        else:
+            session_entries = await self._build_session_entries(tab_ids, topic=topic)
+            self._save_session_tabs(session_entries)
+        
+        await self.pool.wait_refill()
         return results
     
     # ========================================
@@ -1018,7 +2072,8 @@ class ChatGPTController:
         thinking: str = None,
         files: List[str] = None,
         tab_id: int = None,
-        close_tab: bool = False
+        close_tab: bool = False,
+        use_pool: bool = True
     ) -> List[Dict]:
         """単一タブで複数の質問を順次送信し、応答を取得
         
@@ -1029,6 +2084,7 @@ class ChatGPTController:
             files: 添付するファイルパスのリスト（このタブに添付）
             tab_id: 既存タブID（省略時は新規タブを作成）
             close_tab: 完了後にタブを閉じるか
+            use_pool: tab_id 省略時、ウォームタブのプールがあれば設定済みタブを使う
         
         Returns:
             各質問に対する結果のリスト
@@ -1056,7 +2112,12 @@ class ChatGPTController:
         print()
         
         # 1. タブを用意
-        if tab_id is None:
+        warm_tabs = await self.pool.acquire(1, model, thinking) if tab_id is None and use_pool else []
+        if warm_tabs:
+            tab_id = warm_tabs[0]['id']
+            print(f"[1/4] Using warm tab: ID={tab_id}")
+            self.pool.start_refill()
+        elif tab_id is None:
             print("[1/4] Opening 1 ChatGPT tab...")
             new_tab_result = await self.new_tab('https://chatgpt.com/')
             tab_id = new_tab_result.get('tab', {}).get('id')
@@ -1068,14 +2129,14 @@ class ChatGPTController:
         else:
             print(f"[1/4] Using existing tab: ID={tab_id}")
         
-        # 2. モデル/Thinking設定
-        if model:
+        # 2. モデル/Thinking設定（ウォームタブは設定済み）
+        if model and not warm_tabs:
             print(f"\n[1.5] Selecting model: {model}...")
             r = await self.select_model(model, tab_id)
             status = "OK" if r.get('success') else f"FAIL: {r.get('error', '')}"
             print(f"  Tab: {status}")
         
-        if thinking:
+        if thinking and not warm_tabs:
             print(f"\n[1.6] Setting thinking: {thinking}...")
             r = await self.set_thinking(thinking, tab_id)
             status = "OK" if r.get('success') else f"FAIL: {r.get('error', '')}"
@@ -1129,7 +2190,28 @@ class ChatGPTController:
             last_response = ""
             stable_count = 0
             MIN_RESPONSE_LEN = 100
-            STABLE_THRESHOLD = 4
+            poller = self.poll_policy.start('chatgpt', model, thinking)
+            
+            streamed = await self.stream_response(tab_id, after_count=pre_count, attached_files=files,
+                                                  label=f"Q{idx+1}")
+            if streamed and len(streamed) >= MIN_RESPONSE_LEN:
+                poller.finish()
+                elapsed = time.time() - start
+                url = await self._get_open_tab_url(tab_id)
+                result = {
+                    'success': True,
+                    'index': idx,
+                    'question': question,
+                    'response': streamed,
+                    'tab_id': tab_id,
+                    'url': url,
+                    'elapsed': elapsed
+                }
+                self._write_individual_md(md_paths[idx], result)
+                result['md_path'] = md_paths[idx]
+                results.append(result)
+                print(f"  Q{idx+1}: Done ({elapsed:.1f}s)")
+                continue
             
             while True:
                 elapsed = time.time() - start
@@ -1142,7 +2224,7 @@ class ChatGPTController:
                         'question': question,
                         'tab_id': tab_id,
                         'url': url,
-                        'response': last_response,
+                        'response': await self._response_at_timeout(tab_id, files, last_response, pre_count),
                         'elapsed': elapsed
                     }
                     self._write_individual_md(md_paths[idx], result)
@@ -1153,15 +2235,16 @@ class ChatGPTController:
                 generating = await self.is_generating(tab_id)
                 response = await self.get_response(tab_id, attached_files=files)
                 current_count = (await self._cmd(type='chatgpt_get_response', tabId=tab_id)).get('responseCount', 0)
+                poller.observe(generating, response if current_count > pre_count and response and len(response) > 5 else '')
                 
                 if current_count > pre_count and response and len(response) > 5:
                     if not generating:
                         if response == last_response:
                             stable_count += 1
-                            if stable_count >= STABLE_THRESHOLD:
+                            if stable_count >= poller.stable_polls:
                                 if len(response) < MIN_RESPONSE_LEN:
                                     stable_count = 0
-                                    await asyncio.sleep(self.poll_interval)
+                                    await asyncio.sleep(poller.interval())
                                     continue
                                 
                                 print("  Finalizing response...")
@@ -1169,13 +2252,15 @@ class ChatGPTController:
                                 
                                 final_response = await self.get_response(tab_id, attached_files=files)
                                 if final_response and final_response != response:
+                                    poller.false_finish()
                                     last_response = final_response
                                     stable_count = 0
-                                    await asyncio.sleep(self.poll_interval)
+                                    await asyncio.sleep(poller.interval())
                                     continue
                                 
                                 if final_response and len(final_response) >= len(response):
                                     response = final_response
+                                poller.finish()
                                 
                                 url = await self._get_open_tab_url(tab_id)
                                 result = {
@@ -1198,7 +2283,7 @@ class ChatGPTController:
                         stable_count = 0
                     last_response = response
                 
-                await asyncio.sleep(self.poll_interval)
+                await asyncio.sleep(poller.interval())
         
         # 4. セッションタブを保存（chatコマンドで継続できるようにする）
         if not close_tab and tab_id:
@@ -1208,6 +2293,7 @@ class ChatGPTController:
         if close_tab and tab_id:
             await self.close_tab(tab_id)
         
+        await self.pool.wait_refill()
         return results
     
     def _get_flow_path(self, filename: str, topic: str = None) -> Path:
@@ -1315,8 +2401,9 @@ class ChatGPTController:
         with open(md_path, 'a', encoding='utf-8') as f:
             f.write("\n".join(lines))
     
-    def _init_individual_mds(self, questions: List[str], model: str = None, thinking: str = None, topic: str = None) -> List[str]:
-        """各クエリごとのMDファイルを初期化し、パスリストを返す"""
+    def _init_individual_mds(self, questions: List[str], model: str = None, thinking: str = None, topic: str = None,
+                             overrides: List[Dict] = None) -> List[str]:
+        """各クエリごとのMDファイルを初期化し、パスリストを返す（overrides: 質問ごとの model/thinking 上書き）"""
         from datetime import datetime
         
         now = datetime.now()
@@ -1326,14 +2413,15 @@ class ChatGPTController:
         for i, question in enumerate(questions):
             filename = f"chatgpt_q{i+1}_{timestamp}.md"
             save_path = self._get_flow_path(filename, topic)
+            override = overrides[i] if overrides else {}
             
             # ヘッダーを書き込み
             lines = [
                 f"# ChatGPT Search Result - Q{i+1}",
                 f"",
                 f"**実行日時**: {now.strftime('%Y-%m-%d %H:%M:%S')}",
-                f"**モデル**: {model or 'default'}",
-                f"**Thinking**: {thinking or 'default'}",
+                f"**モデル**: {override.get('model') or model or 'default'}",
+                f"**Thinking**: {override.get('thinking') or thinking or 'default'}",
                 f"",
                 f"## 質問",
                 f"",
@@ -1375,6 +2463,8 @@ class ChatGPTController:
             f"**応答時間**: {elapsed:.1f}s",
             f"**Tab ID**: {tab_id}",
             f"**URL**: {url}" if url else "",
+            (f"**キャッシュ**: ヒット（{datetime.fromtimestamp(result['cached_at']).strftime('%Y-%m-%d %H:%M:%S')} の回答。"
+             f"ブラウザには送信していません）") if result.get('cached') else "",
             f"",
             f"## 質問",
             f"",
@@ -1432,6 +2522,9 @@ class ChatGPTController:
         if self._ws:
             await self._ws.close()
             self._ws = None
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
     
     async def recover(self, tab_id: int = None, url: str = None, files: List[str] = None) -> Dict:
         """タブIDまたは会話URLを指定して内容を再取得してMDに保存
@@ -1537,7 +2630,7 @@ class ChatGPTController:
         last_response = ""
         stable_count = 0
         MIN_RESPONSE_LEN = 100
-        STABLE_THRESHOLD = 4
+        poller = self.poll_policy.start('chatgpt')
         
         while True:
             elapsed = time.time() - start
@@ -1558,27 +2651,30 @@ class ChatGPTController:
             
             generating = await self.is_generating(tab_id)
             response = await self.get_response(tab_id, attached_files=files)
+            poller.observe(generating, response if response and len(response) > 5 else '')
             
             if response and len(response) > 5:
                 if not generating:
                     if response == last_response:
                         stable_count += 1
-                        if stable_count >= STABLE_THRESHOLD:
+                        if stable_count >= poller.stable_polls:
                             if len(response) < MIN_RESPONSE_LEN:
                                 stable_count = 0
-                                await asyncio.sleep(self.poll_interval)
+                                await asyncio.sleep(poller.interval())
                                 continue
                             
                             await asyncio.sleep(3)
                             final_response = await self.get_response(tab_id, attached_files=files)
                             if final_response and final_response != response:
+                                poller.false_finish()
                                 last_response = final_response
                                 stable_count = 0
-                                await asyncio.sleep(self.poll_interval)
+                                await asyncio.sleep(poller.interval())
                                 continue
                             
                             if final_response and len(final_response) >= len(response):
                                 response = final_response
+                            poller.finish()
                             
                             result_dict = {
                                 'success': True,
@@ -1597,7 +2693,7 @@ class ChatGPTController:
                     stable_count = 0
                 last_response = response
             
-            await asyncio.sleep(self.poll_interval)
+            await asyncio.sleep(poller.interval())
      
     async def chat(self, messages: List[str], tab_id: int = None, wait: bool = True, files: List[str] = None) -> List[Dict]:
         """
@@ -1619,6 +2715,14 @@ class ChatGPTController:
         # タブIDが指定されていない場合、セッションタブから自動選択
         if tab_id is None:
             tab_id = await self.get_active_session_tab()
+            if tab_id is None:
+                # セッションがなければウォームタブで新しい会話を始める
+                warm_tabs = await self.pool.acquire(1)
+                if warm_tabs:
+                    tab_id = warm_tabs[0]['id']
+                    self._save_session_tabs(self._session_tabs + [{'id': tab_id, 'url': None, 'topic': None}])
+                    self.pool.start_refill()
+                    print(f"[Pool] Starting a new session on warm tab ID: {tab_id}")
             if tab_id is None:
                 return [{
                     'success': False, 
@@ -1670,6 +2774,7 @@ class ChatGPTController:
             else:
                 print(f"[Chat {i}/{len(messages)}] Success ({result.get('elapsed', 0):.1f}s)")
         
+        await self.pool.wait_refill()
         return results
     
     async def _chat_single(self, message: str, tab_id: int, wait: bool = True, files: List[str] = None, topic: str = None) -> Dict:
@@ -1701,7 +2806,24 @@ class ChatGPTController:
         last_response = ""
         stable_count = 0
         MIN_RESPONSE_LEN = 100
-        STABLE_THRESHOLD = 4  # 20秒安定
+        poller = self.poll_policy.start('chatgpt')  # チャットのモデルは不明（タブの現在の設定）
+        
+        # push 配信に対応していれば生成完了イベントで即確定（未対応・失敗時は下のポーリングへ）
+        response = await self.stream_response(tab_id, after_count=pre_count, attached_files=files, label="Chat")
+        if response and len(response) >= MIN_RESPONSE_LEN:
+            poller.finish()
+            url = await self._get_open_tab_url(tab_id)
+            if url:
+                for entry in self._session_tabs:
+                    if entry.get('id') == tab_id and entry.get('url') != url:
+                        entry['url'] = url
+                        self._save_session_tabs(self._session_tabs)
+                        break
+            result_dict = {'success': True, 'response': response, 'elapsed': time.time() - start,
+                          'tab_id': tab_id, 'url': url, 'topic': topic, 'question': message}
+            md_path = self._save_chat_response(result_dict, message, files)
+            result_dict['md_path'] = md_path
+            return result_dict
         
         while True:
             elapsed = time.time() - start
@@ -1713,7 +2835,8 @@ class ChatGPTController:
                             entry['url'] = url
                             self._save_session_tabs(self._session_tabs)
                             break
-                result_dict = {'success': False, 'error': 'Timeout', 'response': last_response, 
+                response = await self._response_at_timeout(tab_id, files, last_response, pre_count)
+                result_dict = {'success': False, 'error': 'Timeout', 'response': response,
                               'elapsed': elapsed, 'tab_id': tab_id, 'url': url, 'topic': topic, 'question': message}
                 # タイムアウト時もMD保存
                 md_path = self._save_chat_response(result_dict, message, files)
@@ -1723,17 +2846,18 @@ class ChatGPTController:
             generating = await self.is_generating(tab_id)
             response = await self.get_response(tab_id, attached_files=files)
             current_count = (await self._cmd(type='chatgpt_get_response', tabId=tab_id)).get('responseCount', 0)
+            poller.observe(generating, response if current_count > pre_count and len(response) > 5 else '')
             
             # 新しい回答が追加されている場合
             if current_count > pre_count and len(response) > 5:
                 if not generating:
                     if response == last_response:
                         stable_count += 1
-                        if stable_count >= STABLE_THRESHOLD:
+                        if stable_count >= poller.stable_polls:
                             # 短すぎる回答は待機継続
                             if len(response) < MIN_RESPONSE_LEN:
                                 stable_count = 0
-                                await asyncio.sleep(self.poll_interval)
+                                await asyncio.sleep(poller.interval())
                                 continue
                             
                             # DOM確定待機
@@ -1742,13 +2866,15 @@ class ChatGPTController:
                             # 最終取得
                             final_response = await self.get_response(tab_id, attached_files=files)
                             if final_response and final_response != response:
+                                poller.false_finish()
                                 last_response = final_response
                                 stable_count = 0
-                                await asyncio.sleep(self.poll_interval)
+                                await asyncio.sleep(poller.interval())
                                 continue
                             
                             if final_response and len(final_response) >= len(response):
                                 response = final_response
+                            poller.finish()
                             
                             url = await self._get_open_tab_url(tab_id)
                             if url:
@@ -1769,7 +2895,7 @@ class ChatGPTController:
                     stable_count = 0
                 last_response = response
             
-            await asyncio.sleep(self.poll_interval)
+            await asyncio.sleep(poller.interval())
     
     def _save_chat_response(self, result: Dict, question: str, files: List[str] = None) -> str:
         """chatコマンドの回答をMDファイルに保存
@@ -1864,6 +2990,48 @@ class ChatGPTController:
 # CLI
 # ========================================
 
+def read_question_items(source: str) -> List:
+    """--questions-file を読み込む（'-' は標準入力）
+    
+    1行1質問。JSON として読める行（"..." や {"question", "model", "thinking", "files"}）は
+    質問ごとの上書き付きジョブとして扱う。空行と # で始まる行は無視する。
+    """
+    if source == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    items = []
+    for line in lines:
+        text = line.strip()
+        if not text or text.startswith('#'):
+            continue
+        if text[0] in '{"':
+            try:
+                items.append(json.loads(text))
+                continue
+            except json.JSONDecodeError:
+                pass
+        items.append(text)
+    return items
+
+
+def load_job_file(path: str) -> Tuple[Dict[str, Any], List]:
+    """ジョブファイル（JSONL）を (options, 質問リスト) に分解する
+    
+    {"options": {"model", "thinking", "files", "workers"}} の行はジョブ全体の既定値、
+    それ以外の行は --questions-file と同じ形式の質問として扱う。
+    """
+    options: Dict[str, Any] = {}
+    questions = []
+    for item in read_question_items(path):
+        if isinstance(item, dict) and 'options' in item and 'question' not in item:
+            options.update(item['options'] or {})
+        else:
+            questions.append(item)
+    return options, questions
+
+
 def run_bridge_only():
     """ブリッジサーバーのみをフォアグラウンドで起動"""
     server = BridgeServer()
@@ -1909,6 +3077,20 @@ Examples:
   # 再取得（受け取り側エラー時など）
   python chatgpt_multi.py recover --tab 123
   
+  # キュー検索（件数制限なし。ワーカータブを使い回す）
+  python chatgpt_multi.py queue "質問1" "質問2" ... --workers 5
+  python chatgpt_multi.py queue --questions-file questions.jsonl --workers 8
+  cat questions.txt | python chatgpt_multi.py queue --questions-file -
+  
+  # 再開可能なバッチジョブ（進捗は job.jsonl.state.json に記録）
+  python chatgpt_multi.py run-job job.jsonl
+  python chatgpt_multi.py resume-job job.jsonl
+  
+  # ウォームタブのプール（設定済みタブを保持し search/search1/chat に払い出す）
+  python chatgpt_multi.py pool start --size 6 --model "ChatGPT 5.2 Thinking" --thinking heavy
+  python chatgpt_multi.py pool status
+  python chatgpt_multi.py pool stop
+  
   # 会話URLから再取得（セッションが無い場合など）
   python chatgpt_multi.py recover --url "https://chatgpt.com/c/xxxx"
   
@@ -1922,7 +3104,7 @@ Examples:
     )
     
     parser.add_argument('command', nargs='?', default='search',
-                        help='Command: search, search1, tabs, models, thinking, attach, chat, recover, response, bridge')
+                        help='Command: search, search1, tabs, models, thinking, attach, chat, recover, response, queue, run-job, resume-job, pool, bridge')
     parser.add_argument('questions', nargs='*', help='Questions for parallel search')
     parser.add_argument('--timeout', type=int, default=1800,
                         help='Timeout in seconds (fixed at 1800; option ignored)')
@@ -1941,6 +3123,20 @@ Examples:
                         help='Close tab(s) after operation (search/search1/chat/recover)')
     parser.add_argument('--keep-tabs', action='store_true',
                         help='(Deprecated: tabs are kept by default) Keep tabs open after search')
+    parser.add_argument('--cache', choices=CACHE_MODES, default='off',
+                        help='Answer cache for search/queue: use (serve cached answers), refresh (re-ask and overwrite), '
+                             'off (default)')
+    parser.add_argument('--cache-ttl', type=float, default=168,
+                        help='Answer cache lifetime in hours (default: 168 = 7 days)')
+    parser.add_argument('--poll', choices=POLL_POLICIES, default='adaptive',
+                        help='Response polling: adaptive (learned from past response times, default) '
+                             'or fixed (every --interval seconds, 4 unchanged polls to finish)')
+    parser.add_argument('--questions-file', help='Question list for queue: one per line or JSON lines ("-" for stdin)')
+    parser.add_argument('--workers', type=int, default=5, help='Worker tabs for queue (default: 5)')
+    parser.add_argument('--size', type=int, default=3, help='Number of warm tabs for pool start (default: 3)')
+    parser.add_argument('--no-pool', action='store_true', help='Do not use warm tabs from the pool')
+    parser.add_argument('--setup-concurrency', type=int, default=5,
+                        help='Max tabs set up (open/model/thinking/attach/send) at the same time in search (default: 5)')
     
     args = parser.parse_args()
     
@@ -1955,7 +3151,7 @@ Examples:
         'search', 'search1', 'tabs', 'models', 'thinking', 'set-thinking', 'enable-pro',
         'is-pro', 'set-mode', 'attach', 'chat', 'recover', 'response', 'debug-dropdown',
         'dd', 'screenshot', 'ss', 'screenshot-dropdown', 'ssd', 'inspect',
-        'dom', 'bridge', 'status'
+        'dom', 'bridge', 'status', 'pool', 'queue', 'run-job', 'resume-job'
     ]
     
     # コマンド判定：最初の引数が既知コマンドでなければ質問として扱う
@@ -1970,7 +3166,9 @@ Examples:
     ctrl = ChatGPTController(
         timeout=args.timeout, 
         poll_interval=args.interval,
-        auto_bridge=not args.no_auto_bridge
+        auto_bridge=not args.no_auto_bridge,
+        cache=AnswerCache(AnswerCache.default_path(Path(__file__)), mode=args.cache, ttl=args.cache_ttl * 3600),
+        poll_policy=FixedPollPolicy(args.interval, stable_polls=4) if args.poll == 'fixed' else None
     )
     
     # questionsがあればsearch/search1コマンド
@@ -1985,7 +3183,9 @@ Examples:
             model=args.model,
             thinking=args.thinking,
             files=args.files,
-            close_tabs=args.close_tabs  # デフォルトでタブを保持（False）
+            close_tabs=args.close_tabs,  # デフォルトでタブを保持（False）
+            setup_concurrency=args.setup_concurrency,
+            use_pool=not args.no_pool
         )
         print("\n=== Summary ===")
         for r in results:
@@ -1999,7 +3199,8 @@ Examples:
             thinking=args.thinking,
             files=args.files,
             tab_id=args.tab,
-            close_tab=args.close_tabs
+            close_tab=args.close_tabs,
+            use_pool=not args.no_pool
         )
         print("\n=== Summary ===")
         for r in results:
@@ -2029,6 +3230,89 @@ Examples:
             if effective_tab_id:
                 await ctrl.close_tab(effective_tab_id)
     
+    elif cmd == 'queue':
+        items = list(args.questions or [])
+        if args.questions_file:
+            items += read_question_items(args.questions_file)
+        if not items:
+            print("Error: 'queue' requires questions (arguments or --questions-file)")
+            return
+        results = await ctrl.queue_search(
+            items,
+            model=args.model,
+            thinking=args.thinking,
+            files=args.files,
+            workers=args.workers,
+            close_tabs=args.close_tabs,
+            use_pool=not args.no_pool
+        )
+        print("\n=== Summary ===")
+        for r in results:
+            status = "OK" if r.get('success') else "FAIL"
+            print(f"[{status}] Q{r.get('index', 0)+1}: {r.get('elapsed', 0):.1f}s")
+    
+    elif cmd in ('run-job', 'resume-job'):
+        if not args.questions:
+            print(f"Error: '{cmd}' requires a job file (JSONL)")
+            return
+        job_path = args.questions[0]
+        state = JobState.load(job_path)
+        if cmd == 'run-job':
+            if state is not None and any(e.get('status') != 'done' for e in state.entries):
+                print(f"Error: unfinished job state exists: {state.path}")
+                print(f"Use 'resume-job {job_path}' to continue, or delete the state file to start over.")
+                return
+            options, items = load_job_file(job_path)
+            # CLI オプションはジョブファイルの既定値より優先
+            for key in ('model', 'thinking', 'files'):
+                if getattr(args, key):
+                    options[key] = getattr(args, key)
+            jobs = [ChatGPTController._normalize_queue_item(q, options.get('model'), options.get('thinking'),
+                                                            options.get('files')) for q in items]
+            jobs = [j for j in jobs if j['question'].strip()]
+            if not jobs:
+                print("Error: job file has no questions")
+                return
+            state = JobState.create(job_path, options, jobs)
+            print(f"[Job] Created {state.path} ({len(jobs)} questions)")
+        elif state is None:
+            print(f"Error: no job state found for {job_path} (run 'run-job' first)")
+            return
+        options = state.options
+        await ctrl.queue_search(
+            [],
+            workers=int(options.get('workers') or args.workers),
+            close_tabs=args.close_tabs,
+            use_pool=not args.no_pool,
+            state=state
+        )
+        counts = state.counts()
+        print(f"\n[Job] done: {counts['done']}, failed: {counts['failed']}, "
+              f"pending: {counts['queued'] + counts['sent']} ({state.path})")
+        if counts['done'] < len(state.entries):
+            print(f"  Re-run 'resume-job {job_path}' to retry the rest")
+    
+    elif cmd == 'pool':
+        action = args.questions[0] if args.questions else 'status'
+        if action == 'start':
+            print(f"[Pool] Warming {args.size} tab(s) (model: {args.model or '-'}, thinking: {args.thinking or '-'})...")
+            opened = await ctrl.pool.start(args.size, model=args.model, thinking=args.thinking)
+            print(f"[Pool] Opened {opened} tab(s); {len(ctrl.pool.tabs)}/{ctrl.pool.size} ready")
+        elif action == 'stop':
+            closed = await ctrl.pool.stop()
+            print(f"[Pool] Closed {closed} tab(s)")
+        elif action == 'status':
+            if not ctrl.pool.active:
+                print("[Pool] Not started (use: pool start --size N [--model M] [--thinking T])")
+            else:
+                await ctrl.pool.prune()
+                print(f"[Pool] {len(ctrl.pool.tabs)}/{ctrl.pool.size} warm tab(s) "
+                      f"(model: {ctrl.pool.model or '-'}, thinking: {ctrl.pool.thinking or '-'})")
+                for t in ctrl.pool.tabs:
+                    print(f"  ID={t['id']}")
+        else:
+            print(f"Error: unknown pool action '{action}' (start/status/stop)")
+    
     elif cmd == 'tabs':
         tabs = await ctrl.get_tabs()
         print(f"Open tabs: {len(tabs)}")
@@ -2454,7 +3738,8 @@ Examples:
             questions=questions,
             model=args.model,
             thinking=args.thinking,
-            files=args.files
+            files=args.files,
+            setup_concurrency=args.setup_concurrency
         )
         print("\n=== Summary ===")
         for r in results:
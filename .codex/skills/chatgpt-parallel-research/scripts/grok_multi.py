@@ -36,6 +36,8 @@ Grok Parallel Research Tool
 """
 
 import asyncio
+import hashlib
+import itertools
 import json
 import time
 import base64
@@ -44,6 +46,7 @@ import os
 import sys
 import socket
 import subprocess
+from collections import OrderedDict
 from typing import List, Dict, Optional, Any
 from pathlib import Path
 
@@ -70,6 +73,8 @@ def _ensure_websockets():
 
 websockets = _ensure_websockets()
 from websockets.server import serve
+from answer_cache import AnswerCache, CACHE_MODES, file_digest, format_age
+from poll_policy import AdaptivePollPolicy, FixedPollPolicy, POLL_POLICIES
 
 
 ## httpx/html2text は不要（Chrome拡張経由でDOM取得するため削除）
@@ -83,11 +88,32 @@ class BridgeServer:
     """拡張機能とPythonクライアント間のWebSocketブリッジサーバー"""
     
     PORT = 9224
+    DEFAULT_TIMEOUT = 30.0  # コマンドに bridgeTimeout がないときの応答待ち秒数
+    BLOB_DIR = Path.home() / '.cache' / 'agent_research' / 'blobs'  # 登録済み添付ファイル（内容の SHA-256 名）
+    BLOB_CHUNK = 512 * 1024  # バイナリフレーム1つに載せる本体の上限（websockets の既定上限 1MiB 未満）
+    BLOB_TTL = 7 * 24 * 3600  # 最後に使われてからこの秒数を過ぎた blob は起動時に削除
+    BLOB_MEMORY = 256 * 1024 * 1024  # base64 エンコード済み blob をメモリに保持する上限（文字数）
+    # 一時的な失敗（接続断・タイムアウト・ブリッジ内部エラー）のエラー文字列の先頭。
+    # これ以外のエラーは拡張機能・ブリッジが明示的に拒否したものとして扱う
+    TRANSIENT_ERRORS = ('Connection closed', 'Timeout', 'Extension disconnected', 'Extension not connected',
+                        'Bridge error')
+    
+    @classmethod
+    def is_transient_error(cls, error) -> bool:
+        """コマンドの失敗が一時的なもの（再試行すれば成功しうる）か"""
+        return isinstance(error, str) and error.startswith(cls.TRANSIENT_ERRORS)
     
     def __init__(self):
         self.extension_ws = None
-        self.pending = {}
+        self.pending = {}  # ブリッジ採番の requestId → 応答待ちの Future
+        self.origins = {}  # ブリッジ採番の requestId → 送信元のクライアント接続
+        self.subscriptions = {}  # subscriptionId → push イベントの配送先クライアント接続
+        self.send_locks = {}  # 接続 → 送信ロック（コマンドごとのタスクから同じ接続へ並行して送らない）
+        self.uploads = {}  # (クライアント接続, blobId) → 受信中の blob（一時ファイル・SHA-256・受信済みバイト数）
+        self.encoded_blobs = OrderedDict()  # blobId → base64 文字列（LRU、BLOB_MEMORY まで）
+        self.encoding = {}  # blobId → エンコード中のタスク（同じ blob を並行してエンコードしない）
         self.running = False
+        self._ids = itertools.count(1)
     
     @staticmethod
     def is_running() -> bool:
@@ -107,6 +133,7 @@ class BridgeServer:
             msg = await asyncio.wait_for(ws.recv(), timeout=5.0)
             data = json.loads(msg)
             
+            # 拡張機能からの接続
             if data.get('type') == 'extension_connected':
                 print("[Bridge] Chrome extension connected")
                 self.extension_ws = ws
@@ -114,50 +141,295 @@ class BridgeServer:
                 async for message in ws:
                     try:
                         resp = json.loads(message)
+                        
+                        # pingは無視
                         if resp.get('type') == 'ping':
                             continue
+                        
                         req_id = resp.get('requestId')
-                        if req_id and req_id in self.pending:
-                            self.pending[req_id].set_result(resp)
+                        future = self.pending.get(req_id) if req_id else None
+                        if future is not None and not future.done():
+                            # 購読開始の応答: 以降の push イベントを送信元クライアントへ配送する
+                            sub_id = resp.get('subscriptionId')
+                            if sub_id and req_id in self.origins:
+                                self.subscriptions[sub_id] = self.origins[req_id]
+                            future.set_result(resp)
+                        elif resp.get('type') == 'response_event':
+                            await self.relay_event(resp)
+                            
                     except json.JSONDecodeError:
                         pass
                 
                 print("[Bridge] Chrome extension disconnected")
-                self.extension_ws = None
+                self.send_locks.pop(ws, None)
+                if self.extension_ws is ws:
+                    self.extension_ws = None
+                    # 転送済みで応答待ちのコマンドはタイムアウトを待たずにエラーで返す
+                    for future in list(self.pending.values()):
+                        if not future.done():
+                            future.set_result({'error': 'Extension disconnected'})
+                    for sub_id in list(self.subscriptions):
+                        await self.relay_event({'type': 'response_event', 'subscriptionId': sub_id,
+                                                'event': 'error', 'error': 'Extension disconnected'})
                 return
             
-            async def process_command(cmd_data):
-                if self.extension_ws is None:
-                    await ws.send(json.dumps({'error': 'Extension not connected'}))
-                    return
-                
-                req_id = cmd_data.get('requestId') or f"r{id(cmd_data)}"
-                cmd_data['requestId'] = req_id
-                
-                future = asyncio.get_event_loop().create_future()
-                self.pending[req_id] = future
-                
-                try:
-                    await self.extension_ws.send(json.dumps(cmd_data))
-                    response = await asyncio.wait_for(future, timeout=30.0)
-                    await ws.send(json.dumps(response))
-                except asyncio.TimeoutError:
-                    await ws.send(json.dumps({'error': 'Timeout', 'requestId': req_id}))
-                finally:
-                    self.pending.pop(req_id, None)
+            # Pythonクライアントからのコマンド: 1コマンド1タスクで並行処理し、応答を待たずに次を受信する
+            tasks = set()
             
-            await process_command(data)
+            def spawn(cmd_data):
+                task = asyncio.create_task(self.process_command(ws, cmd_data))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
             
-            async for message in ws:
-                try:
-                    cmd_data = json.loads(message)
-                    await process_command(cmd_data)
-                except json.JSONDecodeError:
-                    pass
+            spawn(data)
+            try:
+                async for message in ws:
+                    if isinstance(message, bytes):
+                        # blob のチャンク: 順序を保つため受信ループ内でそのまま書き込む
+                        self.receive_blob_chunk(ws, message)
+                        continue
+                    try:
+                        spawn(json.loads(message))
+                    except json.JSONDecodeError:
+                        pass
+            finally:
+                # クライアント切断: 返送先のなくなった処理中コマンドと購読、受信途中の blob は打ち切る
+                for task in list(tasks):
+                    task.cancel()
+                await self.drop_subscriptions(ws)
+                self.discard_uploads(ws)
+                self.send_locks.pop(ws, None)
                 
         except Exception as e:
             print(f"[Bridge] Error: {e}")
     
+    async def process_command(self, ws, cmd_data: Dict):
+        """
+        1コマンドを拡張機能へ転送し、応答を送信元のクライアント接続へ返す
+
+        requestId はブリッジが接続をまたいで一意に採番し直す（クライアントごとの連番が
+        衝突しないように）。応答には元の requestId を付け直して返す。
+        応答待ちの秒数はコマンドの bridgeTimeout で指定できる（省略時は DEFAULT_TIMEOUT）。
+        blob_begin / blob_commit はブリッジ自身が処理し、blobId 付きの添付コマンドは
+        登録済み blob を fileData に展開してから転送する。
+        """
+        client_id = cmd_data.get('requestId')
+        timeout = cmd_data.pop('bridgeTimeout', None)
+        try:
+            timeout = float(timeout) if timeout is not None else self.DEFAULT_TIMEOUT
+        except (TypeError, ValueError):
+            timeout = self.DEFAULT_TIMEOUT
+        
+        def reply(payload: Dict) -> str:
+            if client_id is not None:
+                payload['requestId'] = client_id
+            else:
+                payload.pop('requestId', None)
+            return json.dumps(payload)
+        
+        try:
+            if cmd_data.get('type') in ('blob_begin', 'blob_commit'):
+                await self.send(ws, reply(self.handle_blob(ws, cmd_data)))
+                return
+            
+            extension_ws = self.extension_ws
+            if extension_ws is None:
+                await self.send(ws, reply({'error': 'Extension not connected'}))
+                return
+            
+            if cmd_data.get('blobId') and 'fileData' not in cmd_data:
+                # 参照渡しの添付: 拡張機能は fileData を受け取るので、ここでエンコード済みの内容に差し替える
+                file_data = await self.encoded_blob(cmd_data.pop('blobId'))
+                if file_data is None:
+                    await self.send(ws, reply({'error': 'Unknown blob', 'blobMissing': True}))
+                    return
+                cmd_data['fileData'] = file_data
+            
+            req_id = f"b{next(self._ids)}"
+            cmd_data['requestId'] = req_id
+            future = asyncio.get_running_loop().create_future()
+            self.pending[req_id] = future
+            self.origins[req_id] = ws
+            try:
+                try:
+                    await self.send(extension_ws, json.dumps(cmd_data))
+                except websockets.exceptions.ConnectionClosed:
+                    response = {'error': 'Extension disconnected'}
+                else:
+                    response = await asyncio.wait_for(future, timeout=timeout)
+            except asyncio.TimeoutError:
+                response = {'error': 'Timeout'}
+            finally:
+                self.pending.pop(req_id, None)
+                self.origins.pop(req_id, None)
+            await self.send(ws, reply(response))
+        except websockets.exceptions.ConnectionClosed:
+            pass  # 送信元の接続が切れている（返送先がない）
+        except Exception as e:
+            # 想定外のエラーでも応答は必ず返す（返さないとクライアントはタイムアウトまで待つ）
+            print(f"[Bridge] Command {cmd_data.get('type')} failed: {e!r}")
+            try:
+                await self.send(ws, reply({'error': f'Bridge error: {e!r}'}))
+            except websockets.exceptions.ConnectionClosed:
+                pass
+    
+    async def send(self, ws, payload):
+        """
+        接続ごとに送信を直列化して送る
+
+        legacy 実装（websockets.server.serve）は同じ接続への並行 send で送信バッファの
+        drain が競合し AssertionError になる（大きな添付を複数タブへ同時に送るときなど）。
+        """
+        lock = self.send_locks.get(ws)
+        if lock is None:
+            lock = self.send_locks[ws] = asyncio.Lock()
+        async with lock:
+            await ws.send(payload)
+    
+    # ---- blob（添付ファイルの登録と参照渡し） ----
+    
+    @classmethod
+    def _blob_path(cls, blob_id) -> Optional[Path]:
+        """blobId（SHA-256 の16進64文字）の保存先。不正な blobId なら None"""
+        if not isinstance(blob_id, str) or len(blob_id) != 64 or any(c not in '0123456789abcdef' for c in blob_id):
+            return None
+        return cls.BLOB_DIR / blob_id
+    
+    def handle_blob(self, ws, cmd_data: Dict) -> Dict:
+        """
+        blob の登録コマンドを処理する
+
+        blob_begin {blobId, size}: 登録済みなら have=True。未登録なら受信を開始し、クライアントは
+            バイナリフレーム（blobId 64バイト + オフセット 8バイト big-endian + 本体）でチャンクを送る。
+        blob_commit {blobId}: 受信した内容のサイズと SHA-256 を検証して登録する。
+        """
+        blob_id = cmd_data.get('blobId')
+        path = self._blob_path(blob_id)
+        if path is None:
+            return {'error': f'Invalid blobId: {blob_id}'}
+        key = (ws, blob_id)
+        
+        if cmd_data['type'] == 'blob_begin':
+            size = cmd_data.get('size')
+            if path.exists() and path.stat().st_size == size:
+                os.utime(path)  # 最終利用時刻（BLOB_TTL の起点）を更新
+                return {'success': True, 'blobId': blob_id, 'have': True}
+            self.discard_uploads(ws, blob_id)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{blob_id}.{os.getpid()}.{next(self._ids)}.part")
+            self.uploads[key] = {'tmp': tmp, 'file': open(tmp, 'wb'), 'sha': hashlib.sha256(),
+                                 'size': size, 'received': 0, 'error': None}
+            return {'success': True, 'blobId': blob_id, 'have': False, 'chunkSize': self.BLOB_CHUNK}
+        
+        upload = self.uploads.pop(key, None)
+        if upload is None:
+            return {'error': f'No upload in progress: {blob_id}', 'blobId': blob_id}
+        upload['file'].close()
+        error = upload['error']
+        if error is None and (upload['received'] != upload['size'] or upload['sha'].hexdigest() != blob_id):
+            error = 'Blob verification failed'
+        if error:
+            upload['tmp'].unlink(missing_ok=True)
+            return {'error': error, 'blobId': blob_id}
+        os.replace(upload['tmp'], path)
+        return {'success': True, 'blobId': blob_id, 'size': upload['received']}
+    
+    def receive_blob_chunk(self, ws, frame: bytes):
+        """blob のチャンク（バイナリフレーム）を受信中の一時ファイルへ追記する"""
+        blob_id = frame[:64].decode('ascii', 'replace')
+        upload = self.uploads.get((ws, blob_id))
+        if upload is None or upload['error']:
+            return
+        offset = int.from_bytes(frame[64:72], 'big')
+        if offset != upload['received']:
+            upload['error'] = f"Unexpected chunk offset {offset} (expected {upload['received']})"
+            return
+        chunk = frame[72:]
+        upload['file'].write(chunk)
+        upload['sha'].update(chunk)
+        upload['received'] += len(chunk)
+    
+    def discard_uploads(self, ws, blob_id: str = None):
+        """受信途中の blob を破棄する（blob_id 省略時はその接続の全件）"""
+        for key in [k for k in self.uploads if k[0] is ws and (blob_id is None or k[1] == blob_id)]:
+            upload = self.uploads.pop(key)
+            upload['file'].close()
+            upload['tmp'].unlink(missing_ok=True)
+    
+    async def encoded_blob(self, blob_id: str) -> Optional[str]:
+        """登録済み blob の base64 文字列（エンコードは1回だけ行い、LRU でメモリに保持）"""
+        data = self.encoded_blobs.get(blob_id)
+        if data is not None:
+            self.encoded_blobs.move_to_end(blob_id)
+            return data
+        path = self._blob_path(blob_id)
+        if path is None or not path.exists():
+            return None
+        
+        task = self.encoding.get(blob_id)
+        if task is None:
+            task = self.encoding[blob_id] = asyncio.ensure_future(asyncio.get_running_loop().run_in_executor(
+                None, lambda: base64.b64encode(path.read_bytes()).decode('ascii')))
+            task.add_done_callback(lambda _: self.encoding.pop(blob_id, None))
+        try:
+            data = await asyncio.shield(task)  # 待っている1クライアントが切断しても他の待機は続ける
+        except OSError:
+            return None
+        os.utime(path)
+        
+        self.encoded_blobs[blob_id] = data
+        total = sum(len(v) for v in self.encoded_blobs.values())
+        while total > self.BLOB_MEMORY and len(self.encoded_blobs) > 1:
+            _, old = self.encoded_blobs.popitem(last=False)
+            total -= len(old)
+        return data
+    
+    def prune_blobs(self) -> int:
+        """BLOB_TTL を過ぎた blob と、中断された受信の一時ファイルを削除する（起動時に呼ぶ）"""
+        if not self.BLOB_DIR.is_dir():
+            return 0
+        removed = 0
+        limit = time.time() - self.BLOB_TTL
+        for path in self.BLOB_DIR.iterdir():
+            try:
+                if path.suffix == '.part' or path.stat().st_mtime < limit:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+    
+    async def relay_event(self, event: Dict):
+        """
+        拡張機能からの push イベント（response_event）を購読元のクライアントへ転送する
+
+        event: delta（本文の差分）/ finished（生成完了）/ error。finished と error で購読を終了する。
+        """
+        sub_id = event.get('subscriptionId')
+        if event.get('event') in ('finished', 'error'):
+            ws = self.subscriptions.pop(sub_id, None)
+        else:
+            ws = self.subscriptions.get(sub_id)
+        if ws is None:
+            return
+        try:
+            await self.send(ws, json.dumps(event))
+        except websockets.exceptions.ConnectionClosed:
+            self.subscriptions.pop(sub_id, None)
+    
+    async def drop_subscriptions(self, ws):
+        """切断したクライアントの購読を解除し、拡張機能側の監視も止める"""
+        for sub_id in [sid for sid, owner in self.subscriptions.items() if owner is ws]:
+            self.subscriptions.pop(sub_id, None)
+            if self.extension_ws is not None:
+                try:
+                    await self.send(self.extension_ws, json.dumps({
+                        'type': 'chatgpt_unsubscribe_response', 'subscriptionId': sub_id,
+                        'requestId': f"b{next(self._ids)}"
+                    }))
+                except websockets.exceptions.ConnectionClosed:
+                    pass
+    
     async def run(self):
         """ブリッジサーバーを起動"""
         self.running = True
@@ -165,7 +437,12 @@ class BridgeServer:
         print("[Bridge] Waiting for Chrome extension connection...")
         print("[Bridge] Press Ctrl+C to stop\n")
         
-        async with serve(self.handler, 'localhost', self.PORT):
+        removed = self.prune_blobs()
+        if removed:
+            print(f"[Bridge] Removed {removed} expired blob(s) from {self.BLOB_DIR}")
+        
+        # localhost 内の中継なので圧縮（permessage-deflate）は使わない（大きな添付で CPU 時間の大半を占めるため）
+        async with serve(self.handler, 'localhost', self.PORT, compression=None):
             await asyncio.Future()
     
     @staticmethod
@@ -199,13 +476,22 @@ class GrokController:
     BRIDGE_URL = "ws://localhost:9224"
     GROK_URL = "https://x.com/i/grok"
     
-    def __init__(self, timeout: int = 1200, poll_interval: int = 5, auto_bridge: bool = True):
+    def __init__(self, timeout: int = 1200, poll_interval: int = 5, auto_bridge: bool = True,
+                 cache: AnswerCache = None, poll_policy=None):
         self.timeout = timeout
         self.poll_interval = poll_interval
         self.auto_bridge = auto_bridge
+        self.cache = cache or AnswerCache(mode='off')  # 回答キャッシュ（CLI では --cache で指定）
+        # 回答待ちの確認間隔（既定は応答時間の履歴から決める。--poll fixed で従来の固定間隔）
+        self.poll_policy = poll_policy or AdaptivePollPolicy(base_interval=poll_interval)
         self._ws = None
         self._request_id = 0
-        self._lock = asyncio.Lock()
+        self._pending: Dict[str, asyncio.Future] = {}  # requestId → 応答待ちの Future
+        self._reader_task = None
+        self._blob_uploads: Dict[str, asyncio.Task] = {}  # blobId → ブリッジへの登録処理（同じ内容は1回だけ送る）
+        self._blob_supported = None  # ブリッジが blob 登録に対応しているか（未確認: None）
+        self._lock = asyncio.Lock()  # 接続処理の排他制御用
+        self._send_lock = asyncio.Lock()  # 送信の排他制御用（並行するコマンドの send を直列化）
     
     async def connect(self):
         """ブリッジサーバーに接続（必要なら自動起動）"""
@@ -220,28 +506,80 @@ class GrokController:
                 self._ws = await websockets.connect(self.BRIDGE_URL)
             except Exception as e:
                 raise ConnectionError(f"Failed to connect to bridge server: {e}")
+            # 接続ごとに応答待ちテーブルと受信タスクを持つ（旧接続の切断処理が混ざらないように）
+            self._pending = {}
+            self._reader_task = asyncio.create_task(self._reader(self._ws, self._pending))
     
-    async def _cmd(self, **kwargs) -> Dict:
-        """コマンドを送信して応答を待つ"""
+    async def _reader(self, ws, pending: Dict[str, asyncio.Future]):
+        """受信専用タスク: 応答を requestId で待機中の Future に振り分ける"""
+        error = 'Connection closed'
+        try:
+            async for message in ws:
+                try:
+                    resp = json.loads(message)
+                except json.JSONDecodeError:
+                    print(f"[Warning] Ignoring malformed message from bridge: {str(message)[:100]!r}")
+                    continue
+                try:
+                    future = pending.pop(resp.get('requestId'), None)
+                    if future is None and 'requestId' not in resp and pending:
+                        # requestId を返さないエラー応答（旧ブリッジ）は送信順で対応付ける
+                        future = pending.pop(next(iter(pending)))
+                    if future is not None and not future.done():
+                        future.set_result(resp)
+                except Exception as e:
+                    # 1件の振り分け失敗で受信タスクを止めない
+                    print(f"[Warning] Failed to dispatch bridge message: {e!r}")
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except Exception as e:
+            error = f'Connection closed: {e!r}'
+            print(f"[Warning] Bridge reader stopped: {e!r}")
+        finally:
+            # 接続断: 応答待ちのコマンドはエラーで返す
+            for future in pending.values():
+                if not future.done():
+                    future.set_result({'error': error})
+            pending.clear()
+    
+    async def _send(self, ws, payload):
+        """送信を直列化して送る（複数タスクから同じ接続へ同時に send しない）"""
+        async with self._send_lock:
+            await ws.send(payload)
+    
+    async def _cmd(self, timeout: float = BridgeServer.DEFAULT_TIMEOUT, **kwargs) -> Dict:
+        """
+        コマンドを送信して応答を待つ（多重化: 1本の WebSocket で複数コマンドを同時に送受信）
+
+        応答の受信は _reader が一括で行い、requestId で各コマンドの Future に振り分ける。
+        timeout はブリッジにも bridgeTimeout として渡し、ブリッジ側の応答待ちと揃える。
+        """
         async with self._lock:
             await self.connect()
-            self._request_id += 1
-            req_id = f"r{self._request_id}"
-            kwargs['requestId'] = req_id
-            
-            await self._ws.send(json.dumps(kwargs))
-            
-            try:
-                response = await asyncio.wait_for(self._ws.recv(), timeout=30)
-                return json.loads(response)
-            except asyncio.TimeoutError:
-                return {'error': 'Timeout waiting for response'}
+        self._request_id += 1
+        req_id = f"r{self._request_id}"
+        kwargs['requestId'] = req_id
+        kwargs['bridgeTimeout'] = timeout
+        pending = self._pending
+        future = asyncio.get_running_loop().create_future()
+        pending[req_id] = future
+        try:
+            await self._send(self._ws, json.dumps(kwargs))
+            # ブリッジの Timeout 応答が先に届くよう少し長めに待つ
+            return await asyncio.wait_for(future, timeout=timeout + 5)
+        except asyncio.TimeoutError:
+            return {'error': 'Timeout waiting for response'}
+        finally:
+            pending.pop(req_id, None)
     
     async def close(self):
         """WebSocket接続を閉じる"""
         if self._ws:
             await self._ws.close()
             self._ws = None
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
     
     # ========================================
     # タブ操作
@@ -374,25 +712,92 @@ class GrokController:
     # ファイル添付（共通機能）
     # ========================================
     
+    async def upload_blob(self, path: Path) -> Optional[str]:
+        """
+        ファイルをブリッジに blob として登録し、blobId（内容の SHA-256）を返す
+
+        同じ内容の登録は1回だけ行う（並行して呼ばれても登録処理を共有し、ブリッジに
+        登録済みなら送信しない）。ブリッジが未対応なら None を返す。
+        """
+        if self._blob_supported is False:
+            return None
+        blob_id = file_digest(path)
+        task = self._blob_uploads.get(blob_id)
+        if task is None or (task.done() and (task.cancelled() or task.result() is None)):
+            task = self._blob_uploads[blob_id] = asyncio.create_task(self._send_blob(path, blob_id))
+        return await asyncio.shield(task)
+    
+    async def _send_blob(self, path: Path, blob_id: str) -> Optional[str]:
+        """blob_begin → バイナリフレームでチャンク送信 → blob_commit（ブリッジがサイズと SHA-256 を検証）"""
+        size = path.stat().st_size
+        resp = await self._cmd(type='blob_begin', blobId=blob_id, size=size)
+        if resp.get('blobId') != blob_id:
+            # 旧ブリッジはコマンドを拡張機能へ素通しするので blobId が返らない
+            if not BridgeServer.is_transient_error(resp.get('error')):
+                self._blob_supported = False
+            return None
+        self._blob_supported = True
+        if resp.get('have'):
+            return blob_id
+        
+        chunk_size = min(int(resp.get('chunkSize') or BridgeServer.BLOB_CHUNK), BridgeServer.BLOB_CHUNK)
+        header = blob_id.encode('ascii')
+        ws = self._ws
+        try:
+            with open(path, 'rb') as f:
+                offset = 0
+                for chunk in iter(lambda: f.read(chunk_size), b''):
+                    await self._send(ws, header + offset.to_bytes(8, 'big') + chunk)
+                    offset += len(chunk)
+        except (OSError, websockets.exceptions.ConnectionClosed) as e:
+            print(f"⚠️ blob送信失敗: {path.name} ({e})")
+            return None
+        
+        resp = await self._cmd(type='blob_commit', blobId=blob_id)
+        if not resp.get('success'):
+            print(f"⚠️ blob登録失敗: {path.name} ({resp.get('error')})")
+            return None
+        print(f"📤 blob登録: {path.name} ({size / (1 << 20):.1f}MB)")
+        return blob_id
+    
     async def attach_file(self, file_path: str, tab_id: int = None) -> Dict:
-        """ファイルを添付"""
+        """
+        ファイルを添付
+
+        内容はブリッジに blob として1回だけ登録し、各タブへは blobId で参照渡しする。
+        blob 未対応のブリッジでは従来どおり fileData（base64）を直接送る。
+        """
         path = Path(file_path)
         if not path.exists():
             return {'success': False, 'error': f'File not found: {file_path}'}
         
-        with open(path, 'rb') as f:
-            file_data = base64.b64encode(f.read()).decode('utf-8')
-        
         mime_type, _ = mimetypes.guess_type(str(path))
         if not mime_type:
             mime_type = 'application/octet-stream'
+        # 大きなファイルほど拡張機能への受け渡しに時間がかかる（1MB あたり1秒を上乗せ）
+        timeout = BridgeServer.DEFAULT_TIMEOUT + path.stat().st_size / (1 << 20)
+        
+        for _ in range(2):
+            blob_id = await self.upload_blob(path)
+            if blob_id is None:
+                break
+            result = await self._cmd(type='attach_file', blobId=blob_id, fileName=path.name,
+                                     mimeType=mime_type, tabId=tab_id, timeout=timeout)
+            if not result.get('blobMissing'):
+                return result
+            # ブリッジ側で blob が消えていた（キャッシュ削除など）: 登録し直して再試行
+            self._blob_uploads.pop(blob_id, None)
+        
+        with open(path, 'rb') as f:
+            file_data = base64.b64encode(f.read()).decode('utf-8')
         
         return await self._cmd(
             type='attach_file',
             fileData=file_data,
             fileName=path.name,
             mimeType=mime_type,
-            tabId=tab_id
+            tabId=tab_id,
+            timeout=timeout
         )
     
     async def attach_files(self, file_paths: List[str], tab_id: int = None) -> List[Dict]:
@@ -491,18 +896,36 @@ class GrokController:
             print("DeepSearch: Enabled")
         print()
         
+        # 0. 回答キャッシュ（DeepThink/DeepSearch の組み合わせを推論設定としてキーに含める）
+        mode_key = '+'.join(name for name, on in (('deepthink', deepthink), ('deepsearch', deepsearch)) if on) or None
+        md_path = self._init_results_md(questions, model, deepthink, deepsearch)
+        results = [None] * n
+        asked = []  # (元の index, 質問)
+        for i, q in enumerate(questions):
+            hit = self.cache.get('grok', q, model, mode_key)
+            if hit is None:
+                asked.append((i, q))
+                continue
+            results[i] = {'success': True, 'index': i, 'question': q, 'response': hit['response'],
+                          'tab_id': None, 'elapsed': 0, 'cached': True, 'cached_at': hit['created_at']}
+            self._append_result_md(md_path, results[i])
+            print(f"  Q{i+1}: Cache hit ({format_age(hit['created_at'])} old) → Saved to MD")
+        if not asked:
+            print(f"\n[Output] Saved to: {md_path}")
+            return results
+        
         # 1. タブを開く
-        print(f"[1/4] Opening {n} Grok tabs...")
+        print(f"[1/4] Opening {len(asked)} Grok tabs...")
         tab_ids = []
-        for i in range(n):
+        for i in range(len(asked)):
             result = await self.new_tab()
             if result.get('tab', {}).get('id'):
                 tab_ids.append(result['tab']['id'])
                 print(f"  Tab {i+1}: ID={result['tab']['id']}")
             await asyncio.sleep(1)
         
-        if len(tab_ids) != n:
-            return [{'success': False, 'error': f'Failed to open tabs: {len(tab_ids)}/{n}'}]
+        if len(tab_ids) != len(asked):
+            return [{'success': False, 'error': f'Failed to open tabs: {len(tab_ids)}/{len(asked)}'}]
         
         print("  Waiting for pages to load...")
         await asyncio.sleep(3)
@@ -534,24 +957,21 @@ class GrokController:
         
         # 3. 質問を送信
         print(f"\n[2/4] Sending questions...")
-        for i, (tid, q) in enumerate(zip(tab_ids, questions)):
+        for i, (tid, (_, q)) in enumerate(zip(tab_ids, asked)):
             await self.send_message(q, tid)
             print(f"  Tab {i+1}: Sent '{q[:50]}...'")
             await asyncio.sleep(0.5)
         
         # 4. 回答を待機
         print(f"\n[3/4] Waiting for responses (timeout: {self.timeout}s)...")
-        
-        md_path = self._init_results_md(questions, model, deepthink, deepsearch)
         print(f"[Output] Writing to: {md_path}")
         
-        results = [None] * n
-        
         async def wait_for_response(tid: int, idx: int, question: str) -> Dict:
             start = time.time()
             last_response = ""
             stable_count = 0
             fallback_attempted = False
+            poller = self.poll_policy.start('grok', model, mode_key)
             
             while True:
                 elapsed = time.time() - start
@@ -585,17 +1005,20 @@ class GrokController:
                 
                 generating = await self.is_generating(tid)
                 response = await self.get_response(tid)
+                poller.observe(generating, response if response and len(response) > 5 else '')
                 
                 if response and len(response) > 5:
                     if not generating:
                         if response == last_response:
                             stable_count += 1
-                            if stable_count >= 2:
+                            if stable_count >= poller.stable_polls:
+                                poller.finish()
                                 result = {
                                     'success': True, 'index': idx,
                                     'question': question, 'response': response,
                                     'tab_id': tid, 'elapsed': elapsed
                                 }
+                                self.cache.put('grok', question, model, mode_key, [], response)
                                 self._append_result_md(md_path, result)
                                 results[idx] = result
                                 print(f"  Tab {idx+1}: Done ({elapsed:.1f}s) → Saved to MD")
@@ -608,10 +1031,10 @@ class GrokController:
                 
                 status = "Generating..." if generating else "Waiting..."
                 print(f"  Tab {idx+1}: {status} ({int(elapsed)}s)")
-                await asyncio.sleep(self.poll_interval)
+                await asyncio.sleep(poller.interval())
         
         tasks = [asyncio.create_task(wait_for_response(tid, i, q)) 
-                 for i, (tid, q) in enumerate(zip(tab_ids, questions))]
+                 for tid, (i, q) in zip(tab_ids, asked)]
         
         await asyncio.gather(*tasks)
         
@@ -707,7 +1130,13 @@ class GrokController:
             ""
         ]
         
-        if success:
+        if success and result.get('cached'):
+            from datetime import datetime
+            cached_at = datetime.fromtimestamp(result['cached_at']).strftime('%Y-%m-%d %H:%M:%S')
+            lines.append(f"**ステータス**: OK (キャッシュ: {cached_at} の回答)")
+            lines.append("")
+            lines.append(response)
+        elif success:
             lines.append(f"**ステータス**: OK ({elapsed:.1f}s)")
             lines.append("")
             lines.append(response)
@@ -790,6 +1219,7 @@ class GrokController:
         start = time.time()
         last_response = ""
         stable_count = 0
+        poller = self.poll_policy.start('grok')
         
         while True:
             elapsed = time.time() - start
@@ -798,18 +1228,20 @@ class GrokController:
             
             generating = await self.is_generating(used_tab_id)
             response = await self.get_response(used_tab_id)
+            poller.observe(generating, response)
             
             # 回答があり、生成中でない場合
             if response and len(response) > 0 and not generating:
                 if response == last_response:
                     stable_count += 1
-                    if stable_count >= 2:
+                    if stable_count >= poller.stable_polls:
+                        poller.finish()
                         return {'success': True, 'response': response, 'elapsed': elapsed}
                 else:
                     stable_count = 0
                 last_response = response
             
-            await asyncio.sleep(self.poll_interval)
+            await asyncio.sleep(poller.interval())
 
 
 # ========================================
@@ -896,6 +1328,14 @@ Examples:
     parser.add_argument('--files', nargs='+', help='Files to attach')
     parser.add_argument('--no-auto-bridge', action='store_true', 
                         help='Disable automatic bridge server startup')
+    parser.add_argument('--cache', choices=CACHE_MODES, default='off',
+                        help='Answer cache for search: use (serve cached answers), refresh (re-ask and overwrite), '
+                             'off (default)')
+    parser.add_argument('--cache-ttl', type=float, default=168,
+                        help='Answer cache lifetime in hours (default: 168 = 7 days)')
+    parser.add_argument('--poll', choices=POLL_POLICIES, default='adaptive',
+                        help='Response polling: adaptive (learned from past response times, default) '
+                             'or fixed (every --interval seconds, 2 unchanged polls to finish)')
     parser.add_argument('--keep-tabs', action='store_true',
                         help='Keep tabs open after search')
     parser.add_argument('--deepthink', action='store_true',
@@ -910,7 +1350,9 @@ Examples:
     ctrl = GrokController(
         timeout=args.timeout, 
         poll_interval=args.interval,
-        auto_bridge=not args.no_auto_bridge
+        auto_bridge=not args.no_auto_bridge,
+        cache=AnswerCache(AnswerCache.default_path(Path(__file__)), mode=args.cache, ttl=args.cache_ttl * 3600),
+        poll_policy=FixedPollPolicy(args.interval, stable_polls=2) if args.poll == 'fixed' else None
     )
     
     # questionsがあればsearchコマンド
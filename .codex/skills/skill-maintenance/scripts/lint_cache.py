@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Lint・検証結果の永続キャッシュ（.agent-cache/lint.sqlite）
+
+lint_mdc_rules.py / lint_skills.py / validate_rules.py / validate_skills.py から共通利用する。
+
+- キー: (ツール名, ファイルパス, 設定) → 内容ハッシュが前回と一致すれば診断結果をそのまま再生
+- 設定 = ツール本体と共通モジュール（SHARED_MODULES）のソースのハッシュ + PyYAML の有無
+         + 結果に影響するフラグ（--check-mandatory 等）
+- --changed-only 用に git の変更ファイル（HEAD との差分 + 未追跡）を返す
+
+使用例:
+    with LintCache(__file__, {"check_mandatory": True}, enabled=not args.no_cache) as cache:
+        digest = file_digest(path)
+        diagnostics = cache.get(path, digest)
+        if diagnostics is None:
+            diagnostics = lint(path)
+            cache.put(path, digest, diagnostics)
+
+無効化: --no-cache または環境変数 AGENT_LINT_CACHE=0
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from doc_cache import find_cache_dir, load_document
+from frontmatter_utils import yaml_available
+
+LINT_CACHE_FILE_NAME = "lint.sqlite"
+
+# 各ツールが診断に使う共通モジュール（変われば全ツールのキャッシュを無効にする）
+SHARED_MODULES = ("lint_cache.py", "doc_cache.py", "frontmatter_utils.py", "lint_report.py")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    tool TEXT NOT NULL,
+    path TEXT NOT NULL,
+    config TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    diagnostics TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (tool, path, config)
+)
+"""
+
+
+def file_digest(path: Path) -> Optional[str]:
+    """ファイル内容のハッシュ（読み込めなければ None = キャッシュしない）"""
+    try:
+        return load_document(path).sha1
+    except Exception:
+        return None
+
+
+def skill_dir_digest(skill_dir: Path) -> Optional[str]:
+    """SKILL.md の内容とディレクトリ構成（ファイル・フォルダ名）からハッシュを作る"""
+    skill_md = Path(skill_dir) / "SKILL.md"
+    digest = hashlib.sha1()
+    if skill_md.exists():
+        content = file_digest(skill_md)
+        if content is None:
+            return None
+        digest.update(content.encode())
+    for dirpath, dirnames, filenames in os.walk(skill_dir):
+        dirnames.sort()
+        rel = os.path.relpath(dirpath, skill_dir)
+        digest.update(f"d:{rel}\n".encode("utf-8"))
+        for name in sorted(filenames):
+            digest.update(f"f:{rel}/{name}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LintCache:
+    """ツール単位の診断結果キャッシュ（失敗時は黙ってキャッシュなしで動作する）"""
+
+    def __init__(self, tool_file: str, flags: Optional[Dict[str, Any]] = None,
+                 enabled: bool = True, db_path: Optional[Path] = None):
+        tool_path = Path(tool_file).resolve()
+        self.tool = tool_path.stem
+        config = hashlib.sha1(tool_path.read_bytes())
+        shared_dir = Path(__file__).resolve().parent
+        for name in SHARED_MODULES:
+            try:
+                config.update(hashlib.sha1((shared_dir / name).read_bytes()).digest())
+            except OSError:
+                config.update(f"missing:{name}".encode("utf-8"))
+        # フロントマターの検証は PyYAML の有無で結果が変わる
+        config.update(f"yaml={int(yaml_available())}".encode("utf-8"))
+        config.update(json.dumps(flags or {}, sort_keys=True).encode("utf-8"))
+        self.config = config.hexdigest()
+        env_enabled = os.environ.get("AGENT_LINT_CACHE", "1").lower() not in ("0", "off", "false", "no")
+        self.enabled = enabled and env_enabled
+        self.db_path = db_path or find_cache_dir() / LINT_CACHE_FILE_NAME
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> "LintCache":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if not self.enabled:
+            return None
+        if self._conn is None:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(str(self.db_path), timeout=5)
+                self._conn.execute(_SCHEMA)
+            except (OSError, sqlite3.Error):
+                self.enabled = False
+                return None
+        return self._conn
+
+    def get(self, path, digest: Optional[str]) -> Optional[Any]:
+        """内容ハッシュが一致する前回の診断結果を返す（なければ None）"""
+        conn = self._connect() if digest else None
+        if conn is None:
+            self.misses += 1
+            return None
+        try:
+            row = conn.execute(
+                "SELECT content_hash, diagnostics FROM results WHERE tool = ? AND path = ? AND config = ?",
+                (self.tool, str(path), self.config),
+            ).fetchone()
+        except sqlite3.Error:
+            row = None
+        if row is None or row[0] != digest:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[1])
+
+    def put(self, path, digest: Optional[str], diagnostics: Any):
+        """診断結果（JSON化できる値）を保存"""
+        conn = self._connect() if digest else None
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (self.tool, str(path), self.config, digest,
+                 json.dumps(diagnostics, ensure_ascii=False), time.time()),
+            )
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.commit()
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+
+def git_changed_files(cwd: Optional[Path] = None) -> Optional[Set[Path]]:
+    """HEAD からの変更ファイル（ステージ済み・未ステージ・未追跡）を絶対パスで返す。git が使えなければ None"""
+    def git(*args: str, where: Optional[Path] = None) -> str:
+        return subprocess.run(["git", *args], cwd=where, capture_output=True, text=True, check=True).stdout
+
+    try:
+        top = Path(git("rev-parse", "--show-toplevel", where=cwd).strip())
+        names = git("diff", "--name-only", "HEAD", where=top)
+        names += git("ls-files", "--others", "--exclude-standard", where=top)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {(top / name).resolve() for name in names.splitlines() if name.strip()}
+
+
+def select_changed(paths: Iterable[Path], changed: Set[Path]) -> List[Path]:
+    """変更ファイル、または変更ファイルを含むディレクトリだけを残す"""
+    selected: List[Path] = []
+    for path in paths:
+        resolved = Path(path).resolve()
+        if resolved in changed or (resolved.is_dir() and any(resolved in c.parents for c in changed)):
+            selected.append(path)
+    return selected
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+ChatGPT / Grok の回答キャッシュ（SQLite）
+
+同じ質問・モデル・推論設定・添付ファイル内容の組み合わせで得た回答を保存し、再実行時は
+ブラウザに送らずに返す。キーは正規化した質問（NFKC・連続空白の圧縮・前後空白の除去）と
+プロバイダ・モデル・推論設定・添付ファイル内容の SHA-256 から作る。
+
+- 保存先: Flow ディレクトリがあれば Flow/.answer_cache.sqlite3、なければ ~/.cache/agent_research/answers.sqlite3
+          （環境変数 AGENT_ANSWER_CACHE でパスを上書き）
+- モード: use（ヒットすれば返す）/ refresh（常に聞き直して上書き）/ off（読み書きしない）
+  CLI の既定は off（古い回答を黙って返さないよう、使うときは --cache use を明示する）
+- 有効期限: 既定 7 日（ttl 秒を過ぎたエントリはヒットさせず、読み出し時に削除）
+
+使用例:
+    cache = AnswerCache(AnswerCache.default_path(Path(__file__)), mode="use")
+    hit = cache.get("chatgpt", question, model, thinking, files)
+    if hit is None:
+        response = ...  # ブラウザで質問
+        cache.put("chatgpt", question, model, thinking, files, response, url)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+CACHE_MODES = ("use", "refresh", "off")
+DEFAULT_TTL = 7 * 24 * 3600
+ENV_PATH = "AGENT_ANSWER_CACHE"
+
+_SPACE_RE = re.compile(r"\s+")
+_digests: Dict[Tuple[str, int, int], str] = {}
+
+
+def normalize_question(text: str) -> str:
+    """表記ゆれ（全角/半角・改行や空白の違い）を吸収した質問文"""
+    return _SPACE_RE.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+def format_age(created_at: float) -> str:
+    """キャッシュした回答の経過時間を表示用にする（例: 45s / 12m / 3.5h / 2.0d）"""
+    age = max(0.0, time.time() - created_at)
+    if age < 60:
+        return f"{age:.0f}s"
+    if age < 3600:
+        return f"{age / 60:.0f}m"
+    if age < 86400:
+        return f"{age / 3600:.1f}h"
+    return f"{age / 86400:.1f}d"
+
+
+def file_digest(path) -> str:
+    """添付ファイル内容の SHA-256（mtime/size が同じ間はプロセス内で再計算しない）"""
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return f"missing:{path.name}"
+    memo_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    digest = _digests.get(memo_key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        digest = _digests[memo_key] = sha.hexdigest()
+    return digest
+
+
+def cache_key(provider: str, question: str, model: Optional[str] = None, thinking: Optional[str] = None,
+              files: Iterable = ()) -> str:
+    """キャッシュキー（添付ファイルは名前ではなく内容で比較し、順序は問わない）"""
+    material = [provider, normalize_question(question), model or "", thinking or "",
+                sorted(file_digest(f) for f in files or ())]
+    return hashlib.sha256(json.dumps(material, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """回答キャッシュ本体（mode が off のときは何もしない）"""
+
+    def __init__(self, path=None, mode: str = "use", ttl: float = DEFAULT_TTL):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"unsupported cache mode: {mode}")
+        self.mode = mode
+        self.ttl = ttl
+        self.path = Path(path) if path else None
+        self._db: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def default_path(start: Path) -> Path:
+        """環境変数 > start から遡った Flow ディレクトリ > ~/.cache の順で保存先を決める"""
+        if os.environ.get(ENV_PATH):
+            return Path(os.environ[ENV_PATH]).expanduser()
+        for parent in Path(start).resolve().parents:
+            candidate = parent / "Flow"
+            if candidate.is_dir():
+                return candidate / ".answer_cache.sqlite3"
+        return Path.home() / ".cache" / "agent_research" / "answers.sqlite3"
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off" and self.path is not None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), timeout=10)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                " key TEXT PRIMARY KEY, provider TEXT, question TEXT, model TEXT, thinking TEXT,"
+                " response TEXT NOT NULL, url TEXT, created_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def get(self, provider: str, question: str, model: Optional[str] = None, thinking: Optional[str] = None,
+            files: Iterable = ()) -> Optional[Dict]:
+        """有効期限内の回答を返す（mode が use 以外、または未ヒットなら None）"""
+        if not self.enabled or self.mode != "use":
+            return None
+        key = cache_key(provider, question, model, thinking, files)
+        db = self._connect()
+        row = db.execute("SELECT response, url, created_at FROM answers WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if time.time() - row[2] > self.ttl:
+            db.execute("DELETE FROM answers WHERE key = ?", (key,))
+            db.commit()
+            return None
+        return {"response": row[0], "url": row[1], "created_at": row[2]}
+
+    def put(self, provider: str, question: str, model: Optional[str], thinking: Optional[str], files: Iterable,
+            response: str, url: Optional[str] = None) -> None:
+        """回答を保存（use / refresh のとき。空の回答は保存しない）"""
+        if not self.enabled or not response:
+            return
+        db = self._connect()
+        db.execute(
+            "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (cache_key(provider, question, model, thinking, files), provider, normalize_question(question),
+             model, thinking, response, url, time.time()),
+        )
+        db.commit()
+
+    def purge_expired(self) -> int:
+        """期限切れのエントリを削除して件数を返す"""
+        if not self.enabled or not self.path.exists():
+            return 0
+        db = self._connect()
+        deleted = db.execute("DELETE FROM answers WHERE created_at < ?", (time.time() - self.ttl,)).rowcount
+        db.commit()
+        return deleted
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -9,16 +9,18 @@ SKILL.md のフォーマット、フォルダ構造、必須セクションを
   - .codex/skills/
 """
 
+import os
 import re
 import sys
 import argparse
+import posixpath
 from pathlib import Path
-from typing import List, Dict, Optional, Iterable, Any
+from typing import List, Dict, Optional, Iterable, Iterator, Any, Set
 
-try:
-    import yaml  # type: ignore
-except Exception:
-    yaml = None
+from doc_cache import ParsedDocument, load_document
+from frontmatter_utils import safe_load_yaml, yaml_available
+from lint_cache import LintCache, git_changed_files, select_changed, skill_dir_digest
+from lint_report import Diagnostic, DiagnosticEmitter, add_format_argument
 
 # ===========================================
 # 定数定義
@@ -39,13 +41,20 @@ REQUIRED_FOLDERS = ["assets", "questions", "evaluation"]
 # 環境別のSkillsディレクトリ
 SKILL_DIRS = [".cursor/skills", ".claude/skills", ".codex/skills"]
 
+# Resources から参照されていないファイルを孤立アセットとして報告するフォルダ
+ORPHAN_CHECK_FOLDER = "assets"
+
 
 class LintError:
-    def __init__(self, file: str, line: int, message: str, severity: str = "error"):
+    def __init__(self, file: str, line: int, message: str, severity: str = "error", rule: str = ""):
         self.file = file
         self.line = line
         self.message = message
         self.severity = severity
+        self.rule = rule
+
+    def to_diagnostic(self) -> Diagnostic:
+        return Diagnostic(self.file, self.line, self.rule, self.severity, self.message)
 
     def __str__(self):
         icon = "❌" if self.severity == "error" else "⚠️"
@@ -77,7 +86,7 @@ def extract_front_matter(content: str) -> Optional[str]:
     return match.group(1)
 
 
-def _yaml_error_hint(front_matter: str, exc: Exception) -> Optional[str]:
+def _yaml_error_hint(front_matter: str, exc: Any) -> Optional[str]:
     """YAMLエラーのヒントを生成"""
     message = str(exc)
     if "mapping values are not allowed" in message:
@@ -104,12 +113,13 @@ def _yaml_error_hint(front_matter: str, exc: Exception) -> Optional[str]:
 # 検証関数
 # ===========================================
 
-def check_frontmatter(skill_dir: Path, content: str) -> List[LintError]:
-    """フロントマターを検証"""
+def check_frontmatter(skill_dir: Path, content: str,
+                      document: Optional[ParsedDocument] = None) -> List[LintError]:
+    """フロントマターを検証（document があればキャッシュ済みのパース結果を使う）"""
     errors: List[LintError] = []
     skill_md = skill_dir / "SKILL.md"
 
-    front_matter = extract_front_matter(content)
+    front_matter = document.frontmatter_text if document is not None else extract_front_matter(content)
     if front_matter is None:
         errors.append(LintError(
             str(skill_md), 1,
@@ -117,7 +127,20 @@ def check_frontmatter(skill_dir: Path, content: str) -> List[LintError]:
         ))
         return errors
 
-    if yaml is None:
+    yaml_error: Any = None
+    if document is not None:
+        data: Any = document.frontmatter
+        yaml_error = document.frontmatter_error
+    else:
+        try:
+            data = safe_load_yaml(front_matter)
+        except ImportError:
+            data = None
+        except Exception as exc:
+            yaml_error = exc
+
+    # フラットな key: value は PyYAML なしでもパースできる（範囲外の構文だけ PyYAML が必要）
+    if data is None and yaml_error is None and not yaml_available():
         errors.append(LintError(
             str(skill_md), 0,
             "PyYAML が見つからないため検証できません。`pip install pyyaml` を実行してください。",
@@ -138,11 +161,9 @@ def check_frontmatter(skill_dir: Path, content: str) -> List[LintError]:
                 ))
                 return errors
 
-    try:
-        data: Any = yaml.safe_load(front_matter)
-    except Exception as exc:
-        errors.append(LintError(str(skill_md), 0, f"invalid YAML frontmatter: {exc}"))
-        hint = _yaml_error_hint(front_matter, exc)
+    if yaml_error is not None:
+        errors.append(LintError(str(skill_md), 0, f"invalid YAML frontmatter: {yaml_error}"))
+        hint = _yaml_error_hint(front_matter, yaml_error)
         if hint:
             errors.append(LintError(str(skill_md), 0, f"ヒント: {hint}", "warning"))
         return errors
@@ -166,6 +187,88 @@ def check_frontmatter(skill_dir: Path, content: str) -> List[LintError]:
     return errors
 
 
+class SkillTree:
+    """
+    Skillディレクトリ配下のファイル・フォルダ一覧
+
+    os.scandir でディレクトリごとに1回だけ走査し、Resources参照や必須フォルダの存在確認を
+    メモリ上の集合で行う。一覧だけでは判定できないパス（シンボリックリンクのフォルダ配下、
+    `..` を含む参照、大文字小文字だけが異なる名前）に限り実体を stat して従来と同じ判定にする。
+    """
+
+    def __init__(self, skill_dir: Path):
+        self.root = Path(skill_dir)
+        self.files: Set[str] = set()
+        self.dirs: Set[str] = set()
+        self.children: Dict[str, List[str]] = {}  # 走査したフォルダ → 直下の名前
+        self.links: Set[str] = set()  # 辿っていないシンボリックリンクのフォルダ
+        self._scan()
+        self._folded = {path.casefold() for path in self.files | self.dirs}
+
+    def _scan(self):
+        pending = [""]
+        while pending:
+            rel = pending.pop()
+            names: List[str] = []
+            try:
+                with os.scandir(self.root / rel) as entries:
+                    for entry in entries:
+                        names.append(entry.name)
+                        path = f"{rel}/{entry.name}" if rel else entry.name
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if not is_dir:
+                            self.files.add(path)
+                            continue
+                        self.dirs.add(path)
+                        # os.walk と同様にシンボリックリンクのフォルダは辿らない
+                        if entry.is_symlink():
+                            self.links.add(path)
+                        else:
+                            pending.append(path)
+            except OSError:
+                continue
+            self.children[rel] = names
+
+    @staticmethod
+    def normalize(ref: str) -> str:
+        return posixpath.normpath(ref)
+
+    def _needs_stat(self, ref: str, rel: str) -> bool:
+        """一覧にないパスを実体で確認する必要があるか"""
+        if ".." in ref.split("/") or rel.casefold() in self._folded:
+            return True
+        parts = rel.split("/")
+        return any("/".join(parts[:depth]) in self.links for depth in range(1, len(parts)))
+
+    def exists(self, ref: str) -> bool:
+        rel = self.normalize(ref)
+        if rel in self.files or rel in self.dirs:
+            return True
+        return self._needs_stat(ref, rel) and (self.root / ref).exists()
+
+    def is_dir(self, ref: str) -> bool:
+        rel = self.normalize(ref)
+        if rel in self.dirs:
+            return True
+        if rel in self.files:
+            return False
+        return self._needs_stat(ref, rel) and (self.root / ref).is_dir()
+
+    def is_empty(self, ref: str) -> bool:
+        rel = self.normalize(ref)
+        if rel in self.children:
+            return not self.children[rel]
+        return not any((self.root / ref).iterdir())
+
+    def files_under(self, folder: str) -> List[str]:
+        """フォルダ配下（再帰）のファイル一覧（走査したもののみ）"""
+        prefix = self.normalize(folder) + "/"
+        return sorted(path for path in self.files if path.startswith(prefix))
+
+
 def check_required_sections(skill_dir: Path, content: str) -> List[LintError]:
     """必須セクションの存在を検証"""
     errors: List[LintError] = []
@@ -183,23 +286,23 @@ def check_required_sections(skill_dir: Path, content: str) -> List[LintError]:
     return errors
 
 
-def check_required_folders(skill_dir: Path) -> List[LintError]:
+def check_required_folders(skill_dir: Path, tree: Optional[SkillTree] = None) -> List[LintError]:
     """必須フォルダの存在を検証"""
     errors: List[LintError] = []
+    tree = tree or SkillTree(skill_dir)
 
     for folder in REQUIRED_FOLDERS:
-        folder_path = skill_dir / folder
-        if not folder_path.exists():
+        if not tree.exists(folder):
             errors.append(LintError(
                 str(skill_dir), 0,
                 f"必須フォルダ `{folder}/` が存在しません。"
             ))
-        elif not folder_path.is_dir():
+        elif not tree.is_dir(folder):
             errors.append(LintError(
                 str(skill_dir), 0,
                 f"`{folder}` がディレクトリではありません。"
             ))
-        elif not any(folder_path.iterdir()):
+        elif tree.is_empty(folder):
             errors.append(LintError(
                 str(skill_dir), 0,
                 f"`{folder}/` が空です。少なくとも1つのファイルが必要です。",
@@ -209,10 +312,12 @@ def check_required_folders(skill_dir: Path) -> List[LintError]:
     return errors
 
 
-def check_resources_references(skill_dir: Path, content: str) -> List[LintError]:
-    """Resourcesセクションの参照整合性を検証"""
+def check_resources_references(skill_dir: Path, content: str,
+                               tree: Optional[SkillTree] = None) -> List[LintError]:
+    """Resourcesセクションの参照整合性を検証（存在しない参照と、参照されていない assets/ のファイル）"""
     errors: List[LintError] = []
     skill_md = skill_dir / "SKILL.md"
+    tree = tree or SkillTree(skill_dir)
 
     # Resourcesセクションを抽出
     resources_match = re.search(
@@ -228,24 +333,25 @@ def check_resources_references(skill_dir: Path, content: str) -> List[LintError]
     # 相対パス参照を抽出（./assets/xxx.md, ./questions/xxx.md 等）
     path_refs = re.findall(r"\./([^\s\)]+)", resources_content)
 
+    # ディレクトリ参照（./scripts/ など）も末尾の `/` を除いたパスで確認する
     for ref in path_refs:
-        ref_path = skill_dir / ref
-        if not ref_path.exists():
-            # ディレクトリ参照（./scripts/ など）の場合はディレクトリ存在チェック
-            if ref.endswith("/"):
-                dir_path = skill_dir / ref.rstrip("/")
-                if not dir_path.exists():
-                    errors.append(LintError(
-                        str(skill_md), 0,
-                        f"Resources参照 `./{ref}` が存在しません。",
-                        "warning"
-                    ))
-            else:
-                errors.append(LintError(
-                    str(skill_md), 0,
-                    f"Resources参照 `./{ref}` が存在しません。",
-                    "warning"
-                ))
+        if not tree.exists(ref):
+            errors.append(LintError(
+                str(skill_md), 0,
+                f"Resources参照 `./{ref}` が存在しません。",
+                "warning"
+            ))
+
+    # 参照（ファイル、またはそれを含むフォルダ）のない assets/ 配下のファイル
+    referenced = {tree.normalize(ref) for ref in path_refs}
+    for path in tree.files_under(ORPHAN_CHECK_FOLDER):
+        parts = path.split("/")
+        if not any("/".join(parts[:depth]) in referenced for depth in range(1, len(parts) + 1)):
+            errors.append(LintError(
+                str(skill_md), 0,
+                f"`./{path}` が Resources から参照されていません（孤立アセット）。",
+                "warning"
+            ))
 
     return errors
 
@@ -255,29 +361,41 @@ def lint_skill(skill_dir: Path) -> List[LintError]:
     errors: List[LintError] = []
     skill_md = skill_dir / "SKILL.md"
 
+    # Skillディレクトリを1回だけ走査し、以降の存在確認はこの一覧で行う
+    tree = SkillTree(skill_dir)
+
     # SKILL.mdの存在確認
-    if not skill_md.exists():
+    if not tree.exists("SKILL.md"):
         errors.append(LintError(
             str(skill_dir), 0,
-            "SKILL.md が存在しません。"
+            "SKILL.md が存在しません。",
+            rule="skill-md-missing"
         ))
         return errors
 
     # SKILL.mdの読み込み
     try:
-        content = skill_md.read_text(encoding="utf-8")
+        document = load_document(skill_md)
+        content = document.text
     except Exception as e:
         errors.append(LintError(
             str(skill_md), 0,
-            f"ファイル読み込みエラー: {e}"
+            f"ファイル読み込みエラー: {e}",
+            rule="read-error"
         ))
         return errors
 
-    # 各種検証
-    errors.extend(check_frontmatter(skill_dir, content))
-    errors.extend(check_required_sections(skill_dir, content))
-    errors.extend(check_required_folders(skill_dir))
-    errors.extend(check_resources_references(skill_dir, content))
+    # 各種検証（ルールID = チェック名）
+    checks = [
+        ("frontmatter", check_frontmatter(skill_dir, content, document)),
+        ("required-sections", check_required_sections(skill_dir, content)),
+        ("required-folders", check_required_folders(skill_dir, tree)),
+        ("resources-references", check_resources_references(skill_dir, content, tree)),
+    ]
+    for rule, found in checks:
+        for error in found:
+            error.rule = error.rule or rule
+        errors.extend(found)
 
     return errors
 
@@ -292,6 +410,27 @@ def find_skill_roots(base_path: Path) -> List[Path]:
     return roots
 
 
+def iter_skill_results(skill_dirs: List[Path], use_cache: bool) -> Iterator[List[LintError]]:
+    """Skillごとの検証結果を順に返す（SKILL.md とフォルダ構成が前回と同じならキャッシュ結果を再生）"""
+    with LintCache(__file__, enabled=use_cache) as cache:
+        for skill_dir in skill_dirs:
+            digest = skill_dir_digest(skill_dir)
+            cached = cache.get(skill_dir, digest)
+            if cached is not None:
+                errors = [LintError(*item) for item in cached]
+            else:
+                errors = lint_skill(skill_dir)
+                cache.put(skill_dir, digest, [[e.file, e.line, e.message, e.severity, e.rule] for e in errors])
+            yield errors
+
+
+def finish_empty(args):
+    """チェック対象なしで終了（機械可読出力では空の結果を出す）"""
+    if args.format != "text":
+        DiagnosticEmitter("lint_skills", args.format).summary(skills=0)
+    sys.exit(0)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Skill構造のLint & エラーチェック")
     parser.add_argument(
@@ -311,7 +450,21 @@ def main():
         action="store_true",
         help="警告を非表示"
     )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="git で変更されたファイルを含むSkillのみチェック"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Lint結果キャッシュ（.agent-cache/lint.sqlite）を使わない"
+    )
+    add_format_argument(parser)
     args = parser.parse_args()
+    machine = args.format != "text"
+    # 機械可読出力では stdout を診断専用にし、案内メッセージは stderr へ出す
+    notice = sys.stderr if machine else sys.stdout
 
     if args.no_warnings:
         args.warnings = False
@@ -328,19 +481,34 @@ def main():
         # プロジェクトルートが指定された場合
         roots = find_skill_roots(target)
         if not roots:
-            print("Skills ディレクトリが見つかりません（.cursor/skills, .claude/skills, .codex/skills）")
-            sys.exit(0)
+            print("Skills ディレクトリが見つかりません（.cursor/skills, .claude/skills, .codex/skills）", file=notice)
+            finish_empty(args)
         for root in roots:
             skill_dirs.extend(iter_skill_dirs([root]))
 
     if not skill_dirs:
-        print("チェック対象の Skill が見つかりません")
-        sys.exit(0)
-
-    # 検証実行
+        print("チェック対象の Skill が見つかりません", file=notice)
+        finish_empty(args)
+
+    if args.changed_only:
+        changed = git_changed_files()
+        if changed is None:
+            print("⚠️ git の変更ファイルを取得できないため、全Skillをチェックします", file=notice)
+        else:
+            skill_dirs = select_changed(skill_dirs, changed)
+
+    if machine:
+        # Skillごとの検証が終わるたびに診断を出力
+        with DiagnosticEmitter("lint_skills", args.format) as emitter:
+            for errors in iter_skill_results(skill_dirs, not args.no_cache):
+                emitter.emit(e.to_diagnostic() for e in errors if e.severity == "error" or args.warnings)
+            error_count = emitter.counts["error"]
+            emitter.summary(skills=len(skill_dirs))
+        sys.exit(1 if error_count > 0 else 0)
+
+    # 検証実行（SKILL.md とフォルダ構成が前回と同じならキャッシュ結果を再生）
     all_errors: List[LintError] = []
-    for skill_dir in skill_dirs:
-        errors = lint_skill(skill_dir)
+    for errors in iter_skill_results(skill_dirs, not args.no_cache):
         all_errors.extend(errors)
 
     # 結果表示
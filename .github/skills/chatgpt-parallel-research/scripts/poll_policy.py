@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+回答待ちのポーリング方針（ChatGPT / Grok 共通）
+
+回答が確定するまでの確認間隔と、完了とみなすまでの安定確認回数を決める。
+AdaptivePollPolicy は回答の進み具合と過去の応答時間から間隔を変える。
+
+- 熟考中（本文がまだ出ていない）: 想定の本文開始時刻まで間隔を広げる
+  （履歴がなければ base_interval から徐々に延ばす）
+- 生成中（本文が伸びている）: 短い間隔。履歴があれば想定の完了時刻から逆算し、
+  完了が近づくほど短くする
+- 生成停止後（本文が止まった）: 短い間隔で settle 秒安定を確認する。完了判定の直後に本文が
+  変わった（早すぎた完了判定）履歴が多いモデルは settle を倍にする
+
+応答時間の履歴はプロバイダ・モデル・推論設定ごとに ~/.cache/agent_research/response_times.json
+へ保存し、次回以降の想定時刻に使う（環境変数 AGENT_RESPONSE_TIMES でパスを上書き）。
+FixedPollPolicy は従来どおりの固定間隔。
+
+使用例:
+    policy = AdaptivePollPolicy(ResponseTimeHistory(), base_interval=5)
+    poller = policy.start("chatgpt", model, thinking)
+    while True:
+        poller.observe(generating, response)
+        if response == last_response and not generating:
+            stable_count += 1
+            if stable_count >= poller.stable_polls:
+                poller.finish()
+                break
+        await asyncio.sleep(poller.interval())
+"""
+
+import json
+import math
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+POLL_POLICIES = ("adaptive", "fixed")
+ENV_PATH = "AGENT_RESPONSE_TIMES"
+HISTORY_SIZE = 50  # キーごとに保持する直近のサンプル数
+MIN_SAMPLES = 3  # 想定時刻を使い始めるサンプル数
+
+
+class ResponseTimeHistory:
+    """回答ごとの応答時間（本文開始・生成完了・早すぎた完了判定の回数）の記録"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else self.default_path()
+        self.data: Dict[str, List[Dict]] = self._load()
+
+    @staticmethod
+    def default_path() -> Path:
+        if os.environ.get(ENV_PATH):
+            return Path(os.environ[ENV_PATH]).expanduser()
+        return Path.home() / ".cache" / "agent_research" / "response_times.json"
+
+    def _load(self) -> Dict[str, List[Dict]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def record(self, key: str, total: float, first_token: Optional[float] = None, false_finishes: int = 0) -> None:
+        """1回分を追記して保存（他プロセスの追記を消さないよう、保存直前に読み直す）"""
+        self.data = self._load()
+        samples = self.data.setdefault(key, [])
+        samples.append({"total": round(total, 1),
+                        "first_token": round(first_token, 1) if first_token is not None else None,
+                        "false_finishes": false_finishes, "at": int(time.time())})
+        del samples[:-HISTORY_SIZE]
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[Warning] Failed to save response times: {e}")
+
+    def estimate(self, key: str) -> Optional[Dict]:
+        """
+        想定時刻（中央値）を返す（サンプルが MIN_SAMPLES 未満なら None）
+
+        Returns:
+            {'first_token': 秒 or None, 'total': 秒, 'false_finish_rate': 0〜1}
+        """
+        samples = [s for s in self.data.get(key, []) if isinstance(s, dict) and s.get("total")]
+        if len(samples) < MIN_SAMPLES:
+            return None
+        first = [s["first_token"] for s in samples if s.get("first_token") is not None]
+        return {
+            "first_token": statistics.median(first) if len(first) >= MIN_SAMPLES else None,
+            "total": statistics.median(s["total"] for s in samples),
+            "false_finish_rate": sum(1 for s in samples if s.get("false_finishes")) / len(samples),
+        }
+
+
+class FixedPoller:
+    """固定間隔のポーリング（interval 秒ごと、stable_polls 回連続で同じ本文なら完了）"""
+
+    def __init__(self, interval: float, stable_polls: int):
+        self._interval = interval
+        self.stable_polls = stable_polls
+
+    def observe(self, generating: bool, response: Optional[str]) -> None:
+        pass
+
+    def interval(self) -> float:
+        return self._interval
+
+    def false_finish(self) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+
+class AdaptivePoller:
+    """1回答分のポーリング状態（AdaptivePollPolicy.start で作る）"""
+
+    def __init__(self, policy: 'AdaptivePollPolicy', key: str, estimate: Optional[Dict]):
+        self.policy = policy
+        self.key = key
+        self.estimate = estimate
+        self.start = time.time()
+        self.first_token: Optional[float] = None  # 本文が出始めた時刻（開始からの秒数）
+        self.last_change: Optional[float] = None  # 本文が最後に伸びた時刻（生成完了の目安）
+        self.phase = "thinking"  # thinking / streaming / settling
+        self.false_finishes = 0
+        self._last_text = ""
+        # 想定の本文開始時刻を過ぎても本文が出ないときの間隔（確認のたびに延ばす）
+        self._backoff = policy.min_interval if estimate else policy.base_interval
+        settle = policy.settle * (2 if estimate and estimate["false_finish_rate"] >= 0.2 else 1)
+        self.stable_polls = max(2, math.ceil(settle / policy.min_interval))
+
+    def observe(self, generating: bool, response: Optional[str]) -> None:
+        """今回の確認結果（生成中か・今回の回答本文。まだ出ていなければ空）を反映する"""
+        text = response or ""
+        if not text:
+            self.phase = "thinking"
+        elif generating or text != self._last_text:
+            self.last_change = time.time() - self.start
+            if self.first_token is None:
+                self.first_token = self.last_change
+            self.phase = "streaming"
+        else:
+            self.phase = "settling"
+        self._last_text = text
+
+    def interval(self) -> float:
+        """次の確認までの秒数"""
+        p = self.policy
+        elapsed = time.time() - self.start
+        est = self.estimate or {}
+        if self.phase == "thinking":
+            expected = est.get("first_token")
+            if expected is not None and elapsed < expected:
+                return self._clamp((expected - elapsed) / 2, p.min_interval, p.max_interval)
+            interval, self._backoff = self._backoff, min(self._backoff * p.backoff, p.max_interval)
+            return interval
+        if self.phase == "streaming" and est.get("total") and est.get("first_token") is not None:
+            # 想定の生成時間（完了 - 本文開始）から残りを見積もり、完了が近いほど短くする
+            remaining = self.first_token + (est["total"] - est["first_token"]) - elapsed
+            return self._clamp(remaining / 3, p.min_interval, p.base_interval)
+        return p.min_interval
+
+    def false_finish(self) -> None:
+        """完了判定の直後に本文が変わった（安定確認が短すぎた）"""
+        self.false_finishes += 1
+
+    def finish(self) -> None:
+        """回答が確定した: 応答時間（完了は本文が最後に伸びた時刻。push 配信で確定したときは現在）を履歴に記録する"""
+        total = self.last_change if self.last_change is not None else time.time() - self.start
+        self.policy.history.record(self.key, total, self.first_token, self.false_finishes)
+
+    @staticmethod
+    def _clamp(value: float, low: float, high: float) -> float:
+        return max(low, min(high, value))
+
+
+class FixedPollPolicy:
+    """従来方式: 常に interval 秒ごと、stable_polls 回連続で同じ本文なら完了"""
+
+    def __init__(self, interval: float = 5, stable_polls: int = 4):
+        self.interval = interval
+        self.stable_polls = stable_polls
+
+    def start(self, provider: str, model: Optional[str] = None, thinking: Optional[str] = None) -> FixedPoller:
+        return FixedPoller(self.interval, self.stable_polls)
+
+
+class AdaptivePollPolicy:
+    """回答の進み具合と応答時間の履歴から確認間隔を決める（詳細はモジュールの説明を参照）"""
+
+    def __init__(self, history: ResponseTimeHistory = None, base_interval: float = 5,
+                 min_interval: float = 2, max_interval: float = 20, settle: float = 8, backoff: float = 1.5):
+        self.history = history or ResponseTimeHistory()
+        self.base_interval = base_interval
+        self.min_interval = max(0.1, min(min_interval, base_interval))
+        self.max_interval = max(max_interval, base_interval)
+        # 生成停止後、本文が変わらないことを確認する秒数（固定方式の 4 回分より長くはしない）
+        self.settle = min(settle, 4 * max(base_interval, self.min_interval))
+        self.backoff = backoff
+
+    @staticmethod
+    def key(provider: str, model: Optional[str] = None, thinking: Optional[str] = None) -> str:
+        return f"{provider}:{model or 'default'}:{thinking or 'default'}"
+
+    def start(self, provider: str, model: Optional[str] = None, thinking: Optional[str] = None) -> AdaptivePoller:
+        key = self.key(provider, model, thinking)
+        return AdaptivePoller(self, key, self.history.estimate(key))
+
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+フロントマター（先頭の `--- ... ---` ブロック）の読み取り・編集ユーティリティ
+
+enhanced_generate_agent.py / update_agent_master.py / doc_cache.py から共通利用する。
+
+- ヘッダー領域だけを1回走査する（本文は分割しない）
+- トップレベルの `key: value` 行を行単位で編集する（他の行・本文はそのまま保持）
+- ファイル編集はヘッダーが変わった場合のみ書き込む
+- フラットな `key: value` だけのYAMLは PyYAML を使わずにパースする（safe_load_yaml）
+  ネスト・リスト・複数行値などは PyYAML（CSafeLoader があればそれ）の safe_load にフォールバック
+
+使用例:
+    fm = FrontMatter.parse(content)
+    if not fm.has("alwaysApply"):
+        fm.set("alwaysApply", "false", after="globs")
+    content = fm.render()
+
+    edit_frontmatter_file(path, lambda fm: fm.remove("alwaysApply"))
+
+    data = safe_load_yaml(front_matter_text)  # 構文エラーは FrontMatterError（line / column 付き）
+"""
+
+import importlib.util
+import re
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+DELIMITER = "---"
+
+# トップレベルキー行（インデントなし）: key: value
+KEY_LINE_RE = re.compile(r"^([A-Za-z_][\w-]*)\s*:(.*)$")
+
+
+def _is_delimiter(line: str) -> bool:
+    return line.rstrip() == DELIMITER
+
+
+def _scan_header(content: str) -> Optional[Tuple[int, int, int]]:
+    """
+    先頭のフロントマター位置を返す。
+
+    Returns:
+        (ヘッダー開始, ヘッダー終了(閉じ区切り行の先頭), 本文開始) / フロントマターなしなら None
+    """
+    first_nl = content.find("\n")
+    if first_nl == -1 or not _is_delimiter(content[:first_nl]):
+        return None
+    pos = first_nl + 1
+    while True:
+        nl = content.find("\n", pos)
+        if nl == -1:
+            return None
+        if _is_delimiter(content[pos:nl]):
+            return first_nl + 1, pos, nl + 1
+        pos = nl + 1
+
+
+class FrontMatter:
+    """フロントマターの行リストと本文を保持し、行単位で編集する"""
+
+    def __init__(self, lines: List[str], body: str, present: bool, original: Optional[str] = None,
+                 newline: str = "\n"):
+        self.lines = lines
+        self.newline = newline
+        self.body = body
+        self.present = present
+        self.changed = False
+        self._original = original
+
+    @classmethod
+    def parse(cls, content: str) -> "FrontMatter":
+        """文字列からフロントマターを取り出す（ヘッダー領域のみ分割）"""
+        span = _scan_header(content)
+        if span is None:
+            return cls([], content, present=False, original=content)
+        start, end, body_start = span
+        newline = "\r\n" if content[start - 2:start] == "\r\n" else "\n"
+        header = content[start:end]
+        lines = header[:-1].split("\n") if header else []
+        if newline == "\r\n":
+            lines = [line[:-1] if line.endswith("\r") else line for line in lines]
+        return cls(lines, content[body_start:], present=True, original=content, newline=newline)
+
+    # ----- 参照 -----
+
+    def _indexes(self, key: str) -> List[int]:
+        result = []
+        for i, line in enumerate(self.lines):
+            match = KEY_LINE_RE.match(line)
+            if match and match.group(1) == key:
+                result.append(i)
+        return result
+
+    def has(self, key: str) -> bool:
+        return bool(self._indexes(key))
+
+    def get(self, key: str) -> Optional[str]:
+        """キーの生の値（前後空白除去済み・クォートはそのまま）を返す"""
+        indexes = self._indexes(key)
+        if not indexes:
+            return None
+        return KEY_LINE_RE.match(self.lines[indexes[0]]).group(2).strip()
+
+    def keys(self) -> List[str]:
+        return [m.group(1) for m in (KEY_LINE_RE.match(line) for line in self.lines) if m]
+
+    # ----- 編集 -----
+
+    def set(self, key: str, value: str, after: Optional[str] = None, first: bool = False) -> None:
+        """
+        キーの値を設定する。既存キーは値だけ置換し、なければ挿入する。
+
+        Args:
+            after: 指定キーの直後に挿入（見つからなければ末尾）
+            first: 先頭に挿入
+        """
+        new_line = f"{key}: {value}" if value != "" else f"{key}:"
+        indexes = self._indexes(key)
+        if indexes:
+            for i in indexes:
+                if self.lines[i] != new_line:
+                    self.lines[i] = new_line
+                    self.changed = True
+            return
+
+        if first:
+            position = 0
+        else:
+            anchors = self._indexes(after) if after else []
+            position = anchors[0] + 1 if anchors else len(self.lines)
+        self.lines.insert(position, new_line)
+        self.present = True
+        self.changed = True
+
+    def remove(self, key: str) -> bool:
+        """キー行を削除する（削除した場合 True）"""
+        indexes = self._indexes(key)
+        for i in reversed(indexes):
+            del self.lines[i]
+        if indexes:
+            self.changed = True
+        return bool(indexes)
+
+    # ----- 出力 -----
+
+    def render_header(self) -> str:
+        if not self.present:
+            return ""
+        nl = self.newline
+        return DELIMITER + nl + "".join(line + nl for line in self.lines) + DELIMITER + nl
+
+    def render(self) -> str:
+        """編集後の全文を返す（未変更なら元の文字列をそのまま返す）"""
+        if not self.changed and self._original is not None:
+            return self._original
+        return self.render_header() + self.body
+
+
+def _read_header_lines(handle) -> Tuple[Optional[List[str]], str, str]:
+    """
+    ファイルハンドルからヘッダー部分だけを行単位で読む。
+
+    Returns:
+        (ヘッダー行リスト or None, 読み進めた生テキスト, 改行コード)
+    """
+    consumed: List[str] = []
+    first = handle.readline()
+    consumed.append(first)
+    newline = "\r\n" if first.endswith("\r\n") else "\n"
+    if not first.endswith("\n") or not _is_delimiter(first[:-1]):
+        return None, "".join(consumed), newline
+
+    lines: List[str] = []
+    for raw in handle:
+        consumed.append(raw)
+        if not raw.endswith("\n"):
+            break
+        line = raw[:-len(newline)] if raw.endswith(newline) else raw[:-1]
+        if _is_delimiter(line):
+            return lines, "".join(consumed), newline
+        lines.append(line)
+    return None, "".join(consumed), newline
+
+
+def read_frontmatter_file(path: Path) -> FrontMatter:
+    """ファイル先頭のフロントマターのみを読み込む（body は空）"""
+    with open(path, "r", encoding="utf-8", newline="") as handle:
+        lines, _, newline = _read_header_lines(handle)
+    if lines is None:
+        return FrontMatter([], "", present=False, newline=newline)
+    return FrontMatter(lines, "", present=True, newline=newline)
+
+
+def edit_frontmatter_file(path: Path, editor: Callable[[FrontMatter], None]) -> bool:
+    """
+    ファイルのフロントマターを editor で編集し、変更があった場合のみ書き込む。
+
+    ヘッダーだけを読んで editor を呼び、変更がなければ本文は読まない。
+
+    Returns:
+        書き込んだ場合 True
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8", newline="") as handle:
+        lines, consumed, newline = _read_header_lines(handle)
+        if lines is None:
+            fm = FrontMatter([], "", present=False, newline=newline)
+        else:
+            fm = FrontMatter(lines, "", present=True, newline=newline)
+        editor(fm)
+        if not fm.changed:
+            return False
+        rest = handle.read()
+
+    body = rest if lines is not None else consumed + rest
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        handle.write(fm.render_header() + body)
+    return True
+
+
+def edit_frontmatter_files(paths: Iterable[Path], editor: Callable[[Path, FrontMatter], None]) -> int:
+    """複数ファイルに edit_frontmatter_file を適用し、書き込んだ件数を返す"""
+    written = 0
+    for path in paths:
+        if edit_frontmatter_file(path, lambda fm, p=path: editor(p, fm)):
+            written += 1
+    return written
+
+
+# ===========================================
+# YAML の高速パース（フラットな key: value のみ）
+# ===========================================
+
+# 高速パーサーが扱うキー（PyYAML でも必ず文字列キーになるもの）
+_FAST_KEY_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+# YAML 1.1 の暗黙型（PyYAML の Resolver と同じ判定結果になる値だけを高速パスで解決する）
+_YAML_BOOLS = {
+    "yes": True, "Yes": True, "YES": True, "no": False, "No": False, "NO": False,
+    "true": True, "True": True, "TRUE": True, "false": False, "False": False, "FALSE": False,
+    "on": True, "On": True, "ON": True, "off": False, "Off": False, "OFF": False,
+}
+_YAML_NULLS = {"~", "null", "Null", "NULL"}
+_DECIMAL_RE = re.compile(r"-?(?:0|[1-9][0-9]*)")
+# 数値・タイムスタンプになり得る先頭文字（10進整数以外は PyYAML に任せる）
+_NUMERIC_START = set("-+.0123456789")
+# プレーンスカラーの先頭に置けない（またはそれ自体が別の意味を持つ）文字
+_PLAIN_INDICATORS = set("-?:,[]{}#&*!|>'\"%@`")
+# 二重引用符内で高速パスが扱うエスケープ
+_DQ_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "n": "\n", "t": "\t"}
+# YAML で使えない文字（含まれていれば PyYAML にエラー判定を任せる）
+_NON_PRINTABLE_RE = re.compile(r"[^\n\x20-\x7e\x85\xa0-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]")
+
+_UNSUPPORTED = object()
+
+
+class FrontMatterError(ValueError):
+    """YAMLフロントマターの構文エラー（line / column は1始まり、不明なら 0）"""
+
+    def __init__(self, message: str, line: int = 0, column: int = 0):
+        super().__init__(message)
+        self.message = message
+        self.line = line
+        self.column = column
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def _syntax_error(problem: str, text: str, line: int, column: int) -> FrontMatterError:
+    """PyYAML と同じ体裁（問題 / 位置 / 該当行とキャレット）のエラーを作る"""
+    source = text.split("\n")[line - 1]
+    message = (f'{problem}\n  in "<unicode string>", line {line}, column {column}:\n'
+               f"    {source}\n    {' ' * (column - 1)}^")
+    return FrontMatterError(message, line, column)
+
+
+def _parse_plain(value: str, text: str, line: int, column: int) -> Any:
+    """
+    プレーンスカラー（クォートなし）を解決する。
+
+    column は value の先頭の桁（1始まり）。高速パスで判定できない値は _UNSUPPORTED を返す。
+    """
+    if value[0] in _PLAIN_INDICATORS:
+        return _UNSUPPORTED
+    comment = value.find(" #")
+    if comment != -1:
+        value = value[:comment]
+    value = value.rstrip(" ")
+    colon = value.find(": ")
+    if colon == -1 and value.endswith(":"):
+        colon = len(value) - 1
+    if colon != -1:
+        raise _syntax_error("mapping values are not allowed here", text, line, column + colon)
+    if value in _YAML_BOOLS:
+        return _YAML_BOOLS[value]
+    if value in _YAML_NULLS:
+        return None
+    if value[0] in _NUMERIC_START or value in ("<<", "="):
+        if _DECIMAL_RE.fullmatch(value):
+            return int(value)
+        return _UNSUPPORTED
+    return value
+
+
+def _parse_quoted(value: str) -> Any:
+    """同じ行で閉じるクォート文字列を解決する（後続がコメント以外なら _UNSUPPORTED）"""
+    quote = value[0]
+    chars: List[str] = []
+    i = 1
+    while i < len(value):
+        char = value[i]
+        if quote == "'" and char == "'":
+            if value[i + 1:i + 2] == "'":
+                chars.append("'")
+                i += 2
+                continue
+            break
+        if quote == '"' and char == '"':
+            break
+        if quote == '"' and char == "\\":
+            escaped = _DQ_ESCAPES.get(value[i + 1:i + 2])
+            if escaped is None:
+                return _UNSUPPORTED
+            chars.append(escaped)
+            i += 2
+            continue
+        chars.append(char)
+        i += 1
+    else:
+        # 複数行にまたがるクォート
+        return _UNSUPPORTED
+    rest = value[i + 1:].strip(" ")
+    if rest and not rest.startswith("#"):
+        return _UNSUPPORTED
+    return "".join(chars)
+
+
+def parse_flat_yaml(text: str) -> Any:
+    """
+    トップレベルの `key: value` 行だけで構成されたYAMLを PyYAML なしでパースする。
+
+    値は1行で完結するスカラー（クォート文字列 / 真偽値 / null / 10進整数 / プレーン文字列）のみ。
+    結果は yaml.safe_load と一致する。範囲外の構文を含む場合は _UNSUPPORTED を返し、
+    確実に構文エラーになる行（値の中の `: ` など）は FrontMatterError を送出する。
+    """
+    if "\t" in text or "\r" in text or _NON_PRINTABLE_RE.search(text):
+        return _UNSUPPORTED
+    data: Dict[str, Any] = {}
+    for number, line in enumerate(text.split("\n"), 1):
+        stripped = line.strip(" ")
+        if not stripped or stripped.startswith("#"):
+            continue
+        match = _FAST_KEY_RE.match(line)
+        if match is None:
+            return _UNSUPPORTED
+        key = match.group(0)
+        end = match.end()
+        if line[end:end + 1] != ":" or line[end + 1:end + 2] not in ("", " "):
+            return _UNSUPPORTED
+        if key in _YAML_BOOLS or key in _YAML_NULLS:
+            return _UNSUPPORTED
+        raw = line[end + 1:]
+        value = raw.lstrip(" ")
+        if not value or value.startswith("#"):
+            data[key] = None
+            continue
+        if value[0] in "\"'":
+            parsed = _parse_quoted(value.rstrip(" "))
+        else:
+            parsed = _parse_plain(value, text, number, end + 2 + len(raw) - len(value))
+        if parsed is _UNSUPPORTED:
+            return _UNSUPPORTED
+        data[key] = parsed
+    return data or None
+
+
+def _load_pyyaml():
+    try:
+        import yaml  # type: ignore
+    except Exception:
+        return None
+    return yaml
+
+
+def yaml_available() -> bool:
+    """PyYAML が使えるか（読み込まずに判定する。高速パスの範囲外の構文を扱えるか）"""
+    if "yaml" in sys.modules:
+        return sys.modules["yaml"] is not None
+    return importlib.util.find_spec("yaml") is not None
+
+
+def safe_load_yaml(text: str) -> Any:
+    """
+    yaml.safe_load 相当。フラットな key: value だけなら PyYAML を読み込まずにパースする。
+
+    それ以外は CSafeLoader（libyaml）があれば使う。構文エラーは FrontMatterError
+    （PyYAML 由来のエラーは SafeLoader のメッセージのまま変換し、line / column は problem_mark から）。
+    高速パスの範囲外で PyYAML がなければ ImportError。
+    """
+    try:
+        data = parse_flat_yaml(text)
+    except FrontMatterError:
+        # PyYAML があればそちらの判定・メッセージに揃える
+        if not yaml_available():
+            raise
+        data = _UNSUPPORTED
+    if data is not _UNSUPPORTED:
+        return data
+
+    yaml = _load_pyyaml()
+    if yaml is None:
+        raise ImportError("PyYAML が見つかりません（`pip install pyyaml`）")
+    loader = getattr(yaml, "CSafeLoader", None)
+    if loader is not None:
+        try:
+            return yaml.load(text, Loader=loader)
+        except yaml.YAMLError:
+            # エラーメッセージは libyaml と表現が異なるため、従来どおり SafeLoader で作り直す
+            pass
+    try:
+        return yaml.safe_load(text)
+    except yaml.YAMLError as exc:
+        mark = getattr(exc, "problem_mark", None) or getattr(exc, "context_mark", None)
+        line, column = (mark.line + 1, mark.column + 1) if mark is not None else (0, 0)
+        raise FrontMatterError(str(exc), line, column) from exc
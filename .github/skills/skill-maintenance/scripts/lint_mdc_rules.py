@@ -5,18 +5,26 @@ MDCルールファイルのLint & エラーチェック
 
 追加機能:
   - SKILL.md の YAML フロントマター検証（Codex/Claude Skills）
+  - `lint_mdc_rules.py serve`: エディタ連携用の常駐Lintサーバー（stdio の JSON-RPC / LSP 互換）
+  - `--refs`: 参照グラフ（ref_graph.py）による .mdc / スクリプト / コマンドへの参照切れ検出
 """
 
+import os
 import re
 import sys
+import json
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Set, Any, Optional, Iterable
+from urllib.parse import unquote, urlparse
+from typing import List, Dict, Set, Any, Optional, Iterable, Iterator, Tuple
 
-try:
-    import yaml  # type: ignore
-except Exception:
-    yaml = None
+from doc_cache import ParsedDocument, find_cache_dir, load_document, derive, get_cache, parse_document
+from lint_cache import LintCache, file_digest, git_changed_files, select_changed
+from lint_report import Diagnostic, DiagnosticEmitter, add_format_argument, split_location
+from frontmatter_utils import yaml_available
+from ref_graph import RefGraph, skill_name_for_rule
 
 # SKILL.md フロントマター検出用
 FRONT_MATTER_RE = re.compile(r"\A---\s*\n(.*?)\n---\s*\n", re.DOTALL)
@@ -151,430 +159,443 @@ DEPRECATED_PATTERNS = [
 
 
 class LintError:
-    def __init__(self, file: str, line: int, message: str, severity: str = "error"):
+    def __init__(self, file: str, line: int, message: str, severity: str = "error", rule: str = ""):
         self.file = file
         self.line = line
         self.message = message
         self.severity = severity
+        self.rule = rule
+
+    def to_diagnostic(self) -> Diagnostic:
+        return Diagnostic(self.file, self.line, self.rule, self.severity, self.message)
 
     def __str__(self):
         icon = "❌" if self.severity == "error" else "⚠️"
         return f"{icon} {self.file}:{self.line}: {self.message}"
 
 
-def detect_section_type(line: str) -> str:
-    """行からセクションタイプを判定"""
-    for section_type, schema in SECTION_SCHEMA.items():
-        if re.match(schema["pattern"], line.strip()):
+# ===========================================
+# 1パス走査のルールエンジン
+# ===========================================
+# ファイルを1回だけ行分割・トークン化し、各チェック（ルール）を
+# 行イベント / セクションイベントのコールバックとして呼び出す。
+# チェックを増やしても走査は1回で済む。
+
+# 事前コンパイル済みパターン
+TOP_LEVEL_KEY_RE = re.compile(r"^[a-z_]+:")
+FIELD_RE = re.compile(r"^-?\s*(\w+):")
+LEGACY_MAP_ENTRY_RE = re.compile(r"^\w+:$")
+PATH_REFERENCE_RE = re.compile(r'^path_reference:\s*["\'](.+)["\']')
+SECTION_TYPE_PATTERNS = [(section_type, re.compile(schema["pattern"])) for section_type, schema in SECTION_SCHEMA.items()]
+DEPRECATED_PATTERN_RES = [(pattern, re.compile(pattern)) for pattern in DEPRECATED_PATTERNS]
+
+
+@lru_cache(maxsize=None)
+def _section_type_for(head: str) -> str:
+    for section_type, pattern in SECTION_TYPE_PATTERNS:
+        if pattern.match(head):
             return section_type
     return "other"
 
 
-def parse_sections(content: str) -> List[Dict]:
-    """ファイル内容をセクションごとにパース"""
-    lines = content.split("\n")
-    sections = []
-    current_section = None
-    current_lines = []
-    current_start = 0
-    in_code_block = False
+def detect_section_type(line: str) -> str:
+    """行からセクションタイプを判定"""
+    stripped = line.strip()
+    # パターンは全て行頭の `key:` だけを見るため、キー部分で判定結果をキャッシュする
+    colon = stripped.find(":")
+    if colon == -1:
+        return _section_type_for(stripped)
+    return _section_type_for(stripped[:colon + 1])
 
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
 
-        # コードブロック内はスキップ
-        if stripped.startswith("```"):
-            in_code_block = not in_code_block
-            if current_section:
-                current_lines.append(line)
-            continue
+class LineToken:
+    """1行分のトークン（走査中に1回だけ計算する）"""
+    __slots__ = ("number", "line", "stripped", "indented", "comment", "fence", "in_code", "key")
 
-        if in_code_block:
-            if current_section:
-                current_lines.append(line)
-            continue
+    def __init__(self, number: int, line: str, in_code: bool = False):
+        self.number = number
+        self.line = line
+        self.stripped = line.strip()
+        self.indented = line.startswith(" ") or line.startswith("\t")
+        self.comment = self.stripped.startswith("#")
+        self.fence = self.stripped.startswith("```")
+        self.in_code = in_code  # コードブロック内（フェンス行自身は含まない）
+        # トップレベルキー（インデントなし・コロン付き）
+        if not self.indented and TOP_LEVEL_KEY_RE.match(self.stripped):
+            self.key: Optional[str] = self.stripped.split(":")[0]
+        else:
+            self.key = None
+
+    @property
+    def field(self) -> Optional[str]:
+        """`- key:` / `key:` 形式のフィールド名"""
+        match = FIELD_RE.match(self.stripped)
+        return match.group(1) if match else None
+
+
+class Section:
+    """トップレベルキーで始まるセクション"""
+    __slots__ = ("type", "name", "start", "header")
+
+    def __init__(self, header: LineToken):
+        self.header = header
+        self.type = detect_section_type(header.line)
+        self.name = header.key if header.key is not None else header.stripped.split(":")[0]
+        self.start = header.number
 
-        # トップレベルセクション開始を検出（インデントなし、コロン付き）
-        if re.match(r"^[a-z_]+:", stripped) and not line.startswith(" ") and not line.startswith("\t"):
-            # 前のセクションを保存
-            if current_section:
-                sections.append({
-                    "type": current_section,
-                    "name": current_name,
-                    "start": current_start,
-                    "lines": current_lines,
-                })
-
-            current_section = detect_section_type(line)
-            current_name = stripped.split(":")[0]
-            current_start = i
-            current_lines = [line]
-        elif current_section:
-            current_lines.append(line)
+    @property
+    def literal(self) -> bool:
+        """リテラルブロック形式（ヘッダーが `|` で終わる）"""
+        return self.header.stripped.endswith("|")
 
-    # 最後のセクションを保存
-    if current_section:
-        sections.append({
-            "type": current_section,
-            "name": current_name,
-            "start": current_start,
-            "lines": current_lines,
-        })
 
-    return sections
+class LintRule:
+    """
+    走査イベントを受け取るチェック（Visitor）
 
+    scope = "section": セクション終了ごとに結果を出力（セクション順に並ぶ）
+    scope = "file": ファイル走査の最後に結果を出力
+    """
+    scope = "file"
+    rule_id = ""  # 機械可読出力（--format jsonl / sarif）のルールID
 
-def check_section_fields(section: Dict, file_path: str) -> List[LintError]:
-    """セクション内のフィールドをチェック"""
-    errors = []
-    section_type = section["type"]
-    start_line = section["start"]
+    def begin(self, file_path: str):
+        self.file_path = file_path
+        self.errors: List[LintError] = []
 
-    if section_type not in SECTION_SCHEMA:
-        return errors
+    def error(self, line: int, message: str, severity: str = "error"):
+        self.errors.append(LintError(self.file_path, line, message, severity, self.rule_id))
 
-    schema = SECTION_SCHEMA[section_type]
-    allowed = schema.get("allowed_fields")
-    forbidden = schema.get("forbidden_fields", set())
+    def visit_line(self, token: LineToken):
+        """全行（セクション外・コードブロック内を含む）"""
 
-    # リテラルブロック形式（| で始まる）の場合は中身をチェックしない
-    first_line = section["lines"][0].strip() if section["lines"] else ""
-    if first_line.endswith("|"):
-        return errors
+    def enter_section(self, section: Section):
+        """セクション開始（ヘッダー行）"""
 
-    in_code_block = False
+    def visit_section_line(self, section: Section, token: LineToken):
+        """セクション内のヘッダー以外の行"""
 
-    for i, line in enumerate(section["lines"][1:], start_line + 1):  # 最初の行（セクション名）はスキップ
-        stripped = line.strip()
+    def leave_section(self, section: Section):
+        """セクション終了"""
 
-        # コードブロック内はスキップ
-        if stripped.startswith("```"):
-            in_code_block = not in_code_block
-            continue
-        if in_code_block:
-            continue
+    def end(self):
+        """ファイル走査終了"""
 
-        # コメント行はスキップ
-        if stripped.startswith("#"):
-            continue
 
-        # フィールド抽出（- key: または key: の形式）
-        field_match = re.match(r"^-?\s*(\w+):", stripped)
-        if field_match:
-            field_name = field_match.group(1)
-
-            # 禁止フィールドチェック
-            if field_name in forbidden:
-                errors.append(LintError(
-                    file_path, i,
-                    f"[{section['name']}] 禁止フィールド '{field_name}' （{section_type}セクションでは使用不可）",
-                    "error"
-                ))
-
-            # 許可フィールドチェック（Noneは自由形式）
-            if allowed is not None and field_name not in allowed:
-                # リスト項目内のフィールドのみチェック（- で始まる行の後）
-                if stripped.startswith("-") or (i > start_line + 1 and "- " in section["lines"][0]):
-                    errors.append(LintError(
-                        file_path, i,
-                        f"[{section['name']}] 非標準フィールド '{field_name}' （許可: {', '.join(allowed)}）",
-                        "warning"
-                    ))
+def _overrides(rule: LintRule, method: str) -> bool:
+    return getattr(type(rule), method) is not getattr(LintRule, method)
 
-    return errors
 
+class RuleEngine:
+    """ルール群を1パスで実行する"""
 
-def check_literal_block_format(section: Dict, file_path: str) -> List[LintError]:
-    """リテラルブロック形式かチェック"""
-    errors = []
-    section_type = section["type"]
+    def __init__(self, rules: List[LintRule]):
+        self.rules = rules
+        self.section_rules = [r for r in rules if r.scope == "section"]
+        self.file_rules = [r for r in rules if r.scope != "section"]
+        # 実装されているイベントだけを配信する
+        self._line = [r for r in rules if _overrides(r, "visit_line")]
+        self._enter = [r for r in rules if _overrides(r, "enter_section")]
+        self._section_line = [r for r in rules if _overrides(r, "visit_section_line")]
+        self._leave = [r for r in rules if _overrides(r, "leave_section")]
 
-    if section_type not in SECTION_SCHEMA:
-        return errors
+    def _close_section(self, section: Section, output: List[LintError]):
+        for rule in self._leave:
+            rule.leave_section(section)
+        for rule in self.section_rules:
+            output.extend(rule.errors)
+            rule.errors = []
 
-    schema = SECTION_SCHEMA[section_type]
-    if schema.get("format") == "literal_block":
-        first_line = section["lines"][0].strip()
-        if not first_line.endswith("|"):
-            errors.append(LintError(
-                file_path, section["start"],
-                f"[{section['name']}] 複数行セクションは '|' を使用してください",
-                "warning"
-            ))
+    def run(self, content: str, file_path: str) -> List[LintError]:
+        for rule in self.rules:
+            rule.begin(file_path)
 
-    return errors
+        output: List[LintError] = []
+        section: Optional[Section] = None
+        in_code = False
+        for number, line in enumerate(content.split("\n"), 1):
+            token = LineToken(number, line, in_code)
+            for rule in self._line:
+                rule.visit_line(token)
 
+            if token.fence:
+                in_code = not in_code
+            elif not in_code and token.key is not None:
+                # 新しいセクション開始（コードブロック外のトップレベルキー）
+                if section is not None:
+                    self._close_section(section, output)
+                section = Section(token)
+                for rule in self._enter:
+                    rule.enter_section(section)
+                continue
 
-def check_error_handling_literal_block(section: Dict, file_path: str) -> List[LintError]:
-    """error_handlingリテラルブロック内のフィールドをチェック"""
-    errors = []
+            if section is not None:
+                for rule in self._section_line:
+                    rule.visit_section_line(section, token)
 
-    if section["type"] != "error_handling":
-        return errors
+        if section is not None:
+            self._close_section(section, output)
+
+        for rule in self.rules:
+            rule.end()
+        for rule in self.file_rules:
+            output.extend(rule.errors)
+        return output
 
-    first_line = section["lines"][0].strip() if section["lines"] else ""
-    if not first_line.endswith("|"):
-        return errors  # リテラルブロック形式でなければスキップ
-
-    # リテラルブロック内の各エントリをチェック
-    current_entry_line = None
-    current_entry_fields = set()
-    required_fields = {"id", "message", "recovery_actions"}
-
-    for i, line in enumerate(section["lines"][1:], section["start"] + 1):
-        stripped = line.strip()
-
-        # 新しいエントリの開始（- id: で始まる）
-        if stripped.startswith("- id:"):
-            # 前のエントリの必須フィールドチェック
-            if current_entry_line is not None:
-                missing = required_fields - current_entry_fields
-                if missing:
-                    errors.append(LintError(
-                        file_path, current_entry_line,
-                        f"[{section['name']}] error_handlingエントリに必須フィールドが不足: {', '.join(missing)}",
-                        "error"
-                    ))
-
-            current_entry_line = i
-            current_entry_fields = {"id"}
-
-        # フィールド検出
-        elif stripped.startswith("message:"):
-            current_entry_fields.add("message")
-        elif stripped.startswith("recovery_actions:"):
-            current_entry_fields.add("recovery_actions")
-
-        # 旧形式の検出（- id: ではなく error_name: で始まる）
-        elif re.match(r"^\w+:$", stripped) and not stripped.startswith("-"):
-            # YAMLマップ形式の古い形式
-            errors.append(LintError(
-                file_path, i,
-                f"[{section['name']}] 旧形式のerror_handling: '- id: \"...\"' 形式に変換してください",
-                "error"
-            ))
-
-    # 最後のエントリのチェック
-    if current_entry_line is not None:
-        missing = required_fields - current_entry_fields
-        if missing:
-            errors.append(LintError(
-                file_path, current_entry_line,
-                f"[{section['name']}] error_handlingエントリに必須フィールドが不足: {', '.join(missing)}",
-                "error"
-            ))
 
-    return errors
+def parse_sections(content: str) -> List[Dict]:
+    """ファイル内容をセクションごとにパース"""
+    sections = []
+    current = None
+    in_code_block = False
 
+    for i, line in enumerate(content.split("\n"), 1):
+        token = LineToken(i, line, in_code_block)
 
-def check_next_phases_literal_block(section: Dict, file_path: str) -> List[LintError]:
-    """next_phasesリテラルブロック内のフィールドをチェック"""
-    errors = []
+        # コードブロック内はスキップ
+        if token.fence:
+            in_code_block = not in_code_block
+        elif not in_code_block and token.key is not None:
+            # トップレベルセクション開始を検出（インデントなし、コロン付き）
+            if current:
+                sections.append(current)
+            section = Section(token)
+            current = {"type": section.type, "name": section.name, "start": i, "lines": [line]}
+            continue
 
-    if section["type"] != "next_phases":
-        return errors
+        if current:
+            current["lines"].append(line)
 
-    first_line = section["lines"][0].strip() if section["lines"] else ""
-    if not first_line.endswith("|"):
-        return errors  # リテラルブロック形式でなければスキップ
-
-    # リテラルブロック内の各エントリをチェック
-    current_entry_line = None
-    current_entry_fields = set()
-    required_fields = {"on", "rule", "description"}
-
-    for i, line in enumerate(section["lines"][1:], section["start"] + 1):
-        stripped = line.strip()
-
-        # 新しいエントリの開始（- on: で始まる）
-        if stripped.startswith("- on:"):
-            # 前のエントリの必須フィールドチェック
-            if current_entry_line is not None:
-                missing = required_fields - current_entry_fields
-                if missing:
-                    errors.append(LintError(
-                        file_path, current_entry_line,
-                        f"[{section['name']}] next_phasesエントリに必須フィールドが不足: {', '.join(missing)}",
-                        "error"
-                    ))
-
-            current_entry_line = i
-            current_entry_fields = {"on"}
-
-        # フィールド検出
-        elif stripped.startswith("rule:"):
-            current_entry_fields.add("rule")
-        elif stripped.startswith("description:"):
-            current_entry_fields.add("description")
-
-    # 最後のエントリのチェック
-    if current_entry_line is not None:
-        missing = required_fields - current_entry_fields
-        if missing:
-            errors.append(LintError(
-                file_path, current_entry_line,
-                f"[{section['name']}] next_phasesエントリに必須フィールドが不足: {', '.join(missing)}",
-                "error"
-            ))
+    # 最後のセクションを保存
+    if current:
+        sections.append(current)
 
-    return errors
+    return sections
 
 
-def check_workflow_literal_block(section: Dict, file_path: str) -> List[LintError]:
-    """workflowリテラルブロック内のフィールドをチェック（*_process:）"""
-    errors = []
+# ===========================================
+# セクション単位のルール
+# ===========================================
 
-    if section["type"] != "workflow":
-        return errors
+class SectionFieldsRule(LintRule):
+    """セクション内のフィールドをチェック"""
+    rule_id = "section-fields"
+    scope = "section"
+
+    def enter_section(self, section: Section):
+        schema = SECTION_SCHEMA.get(section.type)
+        # リテラルブロック形式（| で始まる）の場合は中身をチェックしない
+        self.active = schema is not None and not section.literal
+        if self.active:
+            self.allowed = schema.get("allowed_fields")
+            self.forbidden = schema.get("forbidden_fields", set())
+            self.list_header = "- " in section.header.line
+        self.in_code_block = False
+
+    def visit_section_line(self, section: Section, token: LineToken):
+        if not self.active:
+            return
+        stripped = token.stripped
 
-    first_line = section["lines"][0].strip() if section["lines"] else ""
-    if not first_line.endswith("|"):
-        return errors  # リテラルブロック形式でなければスキップ
-
-    # リテラルブロック内の各エントリをチェック
-    current_entry_line = None
-    current_entry_fields = set()
-    required_fields = {"label", "action", "description"}
-    forbidden_fields = SECTION_SCHEMA["workflow"]["forbidden_fields"]
-
-    for i, line in enumerate(section["lines"][1:], section["start"] + 1):
-        stripped = line.strip()
-
-        # 新しいエントリの開始（- label: で始まる）
-        if stripped.startswith("- label:"):
-            # 前のエントリの必須フィールドチェック
-            if current_entry_line is not None:
-                missing = required_fields - current_entry_fields
-                if missing:
-                    errors.append(LintError(
-                        file_path, current_entry_line,
-                        f"[{section['name']}] workflowエントリに必須フィールドが不足: {', '.join(missing)}",
-                        "error"
-                    ))
-
-            current_entry_line = i
-            current_entry_fields = {"label"}
-
-        # フィールド検出
-        elif stripped.startswith("action:"):
-            current_entry_fields.add("action")
-        elif stripped.startswith("description:"):
-            current_entry_fields.add("description")
+        # コードブロック内はスキップ
+        if token.fence:
+            self.in_code_block = not self.in_code_block
+            return
+        if self.in_code_block:
+            return
+
+        # コメント行はスキップ
+        if token.comment:
+            return
+
+        # フィールド抽出（- key: または key: の形式）
+        field_name = token.field
+        if field_name is None:
+            return
 
         # 禁止フィールドチェック
-        field_match = re.match(r"^-?\s*(\w+):", stripped)
-        if field_match:
-            field_name = field_match.group(1)
-            if field_name in forbidden_fields:
-                errors.append(LintError(
-                    file_path, i,
-                    f"[{section['name']}] workflowセクションで禁止フィールド '{field_name}' を使用（許可: label, action, description）。"
-                    f"※既存の処理内容はaction/descriptionに移行し、機能を欠損させないこと",
-                    "error"
-                ))
+        if field_name in self.forbidden:
+            self.error(
+                token.number,
+                f"[{section.name}] 禁止フィールド '{field_name}' （{section.type}セクションでは使用不可）",
+            )
+
+        # 許可フィールドチェック（Noneは自由形式）
+        if self.allowed is not None and field_name not in self.allowed:
+            # リスト項目内のフィールドのみチェック（- で始まる行の後）
+            if stripped.startswith("-") or (token.number > section.start + 1 and self.list_header):
+                self.error(
+                    token.number,
+                    f"[{section.name}] 非標準フィールド '{field_name}' （許可: {', '.join(self.allowed)}）",
+                    "warning",
+                )
+
 
-    # 最後のエントリのチェック
-    if current_entry_line is not None:
-        missing = required_fields - current_entry_fields
+class LiteralBlockFormatRule(LintRule):
+    """リテラルブロック形式かチェック"""
+    rule_id = "literal-block-format"
+    scope = "section"
+
+    def enter_section(self, section: Section):
+        schema = SECTION_SCHEMA.get(section.type)
+        if schema is not None and schema.get("format") == "literal_block" and not section.literal:
+            self.error(section.start, f"[{section.name}] 複数行セクションは '|' を使用してください", "warning")
+
+
+class EntryFieldsRule(LintRule):
+    """
+    リテラルブロック内のエントリ（`- <entry_key>:` 始まり）の必須フィールドをチェック
+
+    error_handling / next_phases / workflow / questions で共通利用する。
+    """
+    scope = "section"
+
+    def __init__(self, section_type: str, entry_key: str, field_keys: List[str], required_fields: Set[str],
+                 forbidden_fields: Optional[Set[str]] = None, legacy_map_check: bool = False):
+        self.section_type = section_type
+        self.rule_id = f"{section_type.replace('_', '-')}-entries"
+        self.entry_prefix = f"- {entry_key}:"
+        self.entry_key = entry_key
+        self.field_prefixes = [(f"{key}:", key) for key in field_keys]
+        self.required_fields = required_fields
+        self.forbidden_fields = forbidden_fields
+        self.legacy_map_check = legacy_map_check
+
+    def enter_section(self, section: Section):
+        # リテラルブロック形式でなければスキップ
+        self.active = section.type == self.section_type and section.literal
+        self.entry_line: Optional[int] = None
+        self.entry_fields: Set[str] = set()
+
+    def _check_entry(self, section: Section):
+        if self.entry_line is None:
+            return
+        missing = self.required_fields - self.entry_fields
         if missing:
-            errors.append(LintError(
-                file_path, current_entry_line,
-                f"[{section['name']}] workflowエントリに必須フィールドが不足: {', '.join(missing)}",
-                "error"
-            ))
+            self.error(
+                self.entry_line,
+                f"[{section.name}] {self.section_type}エントリに必須フィールドが不足: {', '.join(missing)}",
+            )
+
+    def visit_section_line(self, section: Section, token: LineToken):
+        if not self.active:
+            return
+        stripped = token.stripped
+
+        if stripped.startswith(self.entry_prefix):
+            # 新しいエントリの開始 → 前のエントリの必須フィールドチェック
+            self._check_entry(section)
+            self.entry_line = token.number
+            self.entry_fields = {self.entry_key}
+        else:
+            # フィールド検出
+            for prefix, key in self.field_prefixes:
+                if stripped.startswith(prefix):
+                    self.entry_fields.add(key)
+                    break
+            else:
+                # 旧形式の検出（- id: ではなく error_name: で始まるYAMLマップ形式）
+                if self.legacy_map_check and LEGACY_MAP_ENTRY_RE.match(stripped) and not stripped.startswith("-"):
+                    self.error(
+                        token.number,
+                        f"[{section.name}] 旧形式のerror_handling: '- id: \"...\"' 形式に変換してください",
+                    )
 
-    return errors
+        # 禁止フィールドチェック
+        if self.forbidden_fields:
+            field_name = token.field
+            if field_name in self.forbidden_fields:
+                self.error(
+                    token.number,
+                    f"[{section.name}] workflowセクションで禁止フィールド '{field_name}' を使用（許可: label, action, description）。"
+                    f"※既存の処理内容はaction/descriptionに移行し、機能を欠損させないこと",
+                )
 
+    def leave_section(self, section: Section):
+        # 最後のエントリのチェック
+        if self.active:
+            self._check_entry(section)
 
-def check_questions_literal_block(section: Dict, file_path: str) -> List[LintError]:
-    """questionsリテラルブロック内のフィールドをチェック（*_questions:）"""
-    errors = []
 
-    if section["type"] != "questions":
-        return errors
+def error_handling_rule() -> EntryFieldsRule:
+    return EntryFieldsRule("error_handling", "id", ["message", "recovery_actions"],
+                           {"id", "message", "recovery_actions"}, legacy_map_check=True)
 
-    first_line = section["lines"][0].strip() if section["lines"] else ""
-    if not first_line.endswith("|"):
-        return errors  # リテラルブロック形式でなければスキップ
-
-    # リテラルブロック内の各エントリをチェック
-    current_entry_line = None
-    current_entry_fields = set()
-    required_fields = {"key", "question"}
-
-    for i, line in enumerate(section["lines"][1:], section["start"] + 1):
-        stripped = line.strip()
-
-        # 新しいエントリの開始（- key: で始まる）
-        if stripped.startswith("- key:"):
-            # 前のエントリの必須フィールドチェック
-            if current_entry_line is not None:
-                missing = required_fields - current_entry_fields
-                if missing:
-                    errors.append(LintError(
-                        file_path, current_entry_line,
-                        f"[{section['name']}] questionsエントリに必須フィールドが不足: {', '.join(missing)}",
-                        "error"
-                    ))
-
-            current_entry_line = i
-            current_entry_fields = {"key"}
-
-        # フィールド検出
-        elif stripped.startswith("question:"):
-            current_entry_fields.add("question")
-
-    # 最後のエントリのチェック
-    if current_entry_line is not None:
-        missing = required_fields - current_entry_fields
-        if missing:
-            errors.append(LintError(
-                file_path, current_entry_line,
-                f"[{section['name']}] questionsエントリに必須フィールドが不足: {', '.join(missing)}",
-                "error"
-            ))
 
-    return errors
+def next_phases_rule() -> EntryFieldsRule:
+    return EntryFieldsRule("next_phases", "on", ["rule", "description"], {"on", "rule", "description"})
 
 
-def check_deprecated_sections(content: str, file_path: str) -> List[LintError]:
-    """削除対象セクションをチェック"""
-    errors = []
-    lines = content.split("\n")
+def workflow_rule() -> EntryFieldsRule:
+    return EntryFieldsRule("workflow", "label", ["action", "description"], {"label", "action", "description"},
+                           forbidden_fields=SECTION_SCHEMA["workflow"]["forbidden_fields"])
+
+
+def questions_rule() -> EntryFieldsRule:
+    return EntryFieldsRule("questions", "key", ["question"], {"key", "question"})
+
+
+# ===========================================
+# ファイル単位のルール
+# ===========================================
+
+class SectionOrderRule(LintRule):
+    """セクションの順序をチェック"""
+    rule_id = "section-order"
+
+    def begin(self, file_path: str):
+        super().begin(file_path)
+        self.found_sections: List[Section] = []
+
+    def enter_section(self, section: Section):
+        # 標準セクションのみ抽出（順序に含まれるもの）
+        if section.type in SECTION_ORDER:
+            self.found_sections.append(section)
+
+    def end(self):
+        # 00_master_rulesは特殊なので順序チェックをスキップ
+        if "00_master_rules" in self.file_path:
+            return
+
+        last_order_idx = -1
+        for s in self.found_sections:
+            current_idx = SECTION_ORDER.index(s.type)
+            if current_idx < last_order_idx:
+                expected_after = SECTION_ORDER[last_order_idx]
+                self.error(
+                    s.start,
+                    f"[{s.name}] セクション順序違反: '{s.type}' は '{expected_after}' より前に配置すべき",
+                    "warning",
+                )
+            else:
+                last_order_idx = current_idx
 
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
 
+class DeprecatedSectionsRule(LintRule):
+    """削除対象セクションをチェック"""
+    rule_id = "deprecated-sections"
+
+    def visit_line(self, token: LineToken):
         # コメント行・インデント行はスキップ
-        if stripped.startswith("#") or line.startswith(" ") or line.startswith("\t"):
-            continue
+        if token.comment or token.indented:
+            return
+        stripped = token.stripped
 
         for section in DEPRECATED_SECTIONS:
             if stripped.startswith(section):
-                errors.append(LintError(
-                    file_path, i,
-                    f"削除対象セクション '{section}' が存在します",
-                    "error"
-                ))
-
-        for pattern in DEPRECATED_PATTERNS:
-            if re.match(pattern, stripped):
-                errors.append(LintError(
-                    file_path, i,
-                    f"削除対象パターン '{pattern}' に一致するセクションがあります",
-                    "warning"
-                ))
+                self.error(token.number, f"削除対象セクション '{section}' が存在します")
 
-    return errors
+        for pattern, compiled in DEPRECATED_PATTERN_RES:
+            if compiled.match(stripped):
+                self.error(token.number, f"削除対象パターン '{pattern}' に一致するセクションがあります", "warning")
 
 
-def check_nonstandard_sections(content: str, file_path: str) -> List[LintError]:
+class NonstandardSectionsRule(LintRule):
     """非標準セクション（category/items構造）を検出し、標準形式への変換を指示"""
-    errors = []
-    lines = content.split("\n")
+    rule_id = "nonstandard-sections"
 
     # 標準セクション名パターン（これらは許可）
-    standard_patterns = [
+    STANDARD_PATTERNS = [re.compile(p) for p in (
         r"^\w+_(process|workflow):",  # ワークフロー
         r"^\w+_questions:",           # 質問
         r"^\w+_template:",            # テンプレート
@@ -588,429 +609,404 @@ def check_nonstandard_sections(content: str, file_path: str) -> List[LintError]:
         r"^alwaysApply:",             # alwaysApply
         r"^baseline_rule:",           # ベースラインルール
         r"^system_description:",      # システム説明
-    ]
+    )]
 
     # 非標準構造を示すフィールド
-    nonstandard_fields = {"category", "items", "phase", "phases", "steps", "tasks"}
-
-    current_section_name = None
-    current_section_line = 0
-    section_has_nonstandard = False
-    has_category = False
-    has_items = False
-
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
+    NONSTANDARD_FIELDS = {"category", "items", "phase", "phases", "steps", "tasks"}
+
+    def begin(self, file_path: str):
+        super().begin(file_path)
+        self.current_section_name: Optional[str] = None
+        self.current_section_line = 0
+        self.has_category = False
+        self.has_items = False
+
+    def _report(self):
+        # category と items の両方を持つセクションのみ報告
+        if self.current_section_name and self.has_category and self.has_items:
+            self.error(
+                self.current_section_line,
+                f"非標準セクション '{self.current_section_name}' を検出。"
+                f"category/items構造は廃止。→ '*_questions:' (key/question形式) または '*_process:' (label/action/description形式) に変換してください。"
+                f"※変換時は既存のロジック・条件分岐・処理内容を欠損させないこと",
+            )
 
+    def visit_line(self, token: LineToken):
         # コメント行はスキップ
-        if stripped.startswith("#"):
-            continue
+        if token.comment:
+            return
 
         # トップレベルセクション検出（インデントなし）
-        if not line.startswith(" ") and not line.startswith("\t") and re.match(r"^[a-z_]+:", stripped):
-            # 前のセクションの結果を評価
-            if current_section_name and section_has_nonstandard:
-                if has_category and has_items:
-                    errors.append(LintError(
-                        file_path, current_section_line,
-                        f"非標準セクション '{current_section_name}' を検出。"
-                        f"category/items構造は廃止。→ '*_questions:' (key/question形式) または '*_process:' (label/action/description形式) に変換してください。"
-                        f"※変換時は既存のロジック・条件分岐・処理内容を欠損させないこと",
-                        "error"
-                    ))
-
-            # 新しいセクション開始
-            section_name = stripped.split(":")[0]
-
-            # 標準セクションかチェック
-            is_standard = any(re.match(p, stripped) for p in standard_patterns)
-
-            if not is_standard:
-                current_section_name = section_name
-                current_section_line = i
-                section_has_nonstandard = False
-                has_category = False
-                has_items = False
-            else:
-                current_section_name = None
-                section_has_nonstandard = False
+        if token.key is not None:
+            self._report()
+            is_standard = any(p.match(token.stripped) for p in self.STANDARD_PATTERNS)
+            self.current_section_name = None if is_standard else token.key
+            self.current_section_line = token.number
+            self.has_category = False
+            self.has_items = False
 
         # 非標準フィールド検出
-        elif current_section_name:
-            field_match = re.match(r"^-?\s*(\w+):", stripped)
-            if field_match:
-                field_name = field_match.group(1)
-                if field_name in nonstandard_fields:
-                    section_has_nonstandard = True
-                    if field_name == "category":
-                        has_category = True
-                    if field_name == "items":
-                        has_items = True
-
-    # 最後のセクションをチェック
-    if current_section_name and section_has_nonstandard:
-        if has_category and has_items:
-            errors.append(LintError(
-                file_path, current_section_line,
-                f"非標準セクション '{current_section_name}' を検出。"
-                f"category/items構造は廃止。→ '*_questions:' (key/question形式) または '*_process:' (label/action/description形式) に変換してください。"
-                f"※変換時は既存のロジック・条件分岐・処理内容を欠損させないこと",
-                "error"
-            ))
+        elif self.current_section_name:
+            field_name = token.field
+            if field_name == "category":
+                self.has_category = True
+            elif field_name == "items":
+                self.has_items = True
 
-    return errors
+    def end(self):
+        # 最後のセクションをチェック
+        self._report()
 
 
-def check_deprecated_paths_reference(content: str, file_path: str) -> List[LintError]:
+class DeprecatedPathsReferenceRule(LintRule):
     """廃止されたpathsファイル参照をチェック"""
-    errors = []
-    lines = content.split("\n")
-
-    # 廃止されたpathsファイルパターン
-    deprecated_paths_patterns = [
-        r"pmbok_paths\.mdc",
-        r"music_paths\.mdc",
-        r"agent_paths\.mdc",
-        r"\w+_paths\.mdc",  # 任意の*_paths.mdc
-    ]
+    rule_id = "deprecated-paths-reference"
 
-    for i, line in enumerate(lines, 1):
-        for pattern in deprecated_paths_patterns:
-            if re.search(pattern, line):
-                # path_reference行は別関数でチェック済みなのでスキップ
-                if line.strip().startswith("path_reference:"):
-                    continue
-                # コメント内の説明的な言及は許可（#で始まる行）
-                if line.strip().startswith("#"):
-                    continue
-                errors.append(LintError(
-                    file_path, i,
-                    "廃止されたpathsファイル参照: パスはCLAUDE.md/AGENTS.mdで一元管理してください",
-                    "error"
-                ))
-                break  # 1行で複数マッチしても1エラーに
+    # 廃止されたpathsファイル（pmbok_paths.mdc / agent_paths.mdc 等、任意の *_paths.mdc）
+    PATTERN = re.compile(r"\w+_paths\.mdc")
 
-    return errors
+    def visit_line(self, token: LineToken):
+        # path_reference行は別ルールでチェック、コメント内の説明的な言及は許可
+        if token.comment or token.stripped.startswith("path_reference:"):
+            return
+        if self.PATTERN.search(token.line):
+            # 1行で複数マッチしても1エラーに
+            self.error(token.number, "廃止されたpathsファイル参照: パスはCLAUDE.md/AGENTS.mdで一元管理してください")
 
 
-def check_master_triggers(content: str, file_path: str) -> List[LintError]:
+class MasterTriggersRule(LintRule):
     """master_triggersが個別ルールに存在しないかチェック"""
-    errors = []
+    rule_id = "master-triggers"
 
-    lines = content.split("\n")
-    for i, line in enumerate(lines, 1):
-        if line.strip().startswith("master_triggers:"):
-            errors.append(LintError(
-                file_path, i,
-                "master_triggers は CLAUDE.md/AGENTS.md で一元管理してください",
-                "error"
-            ))
-
-    return errors
+    def visit_line(self, token: LineToken):
+        if token.stripped.startswith("master_triggers:"):
+            self.error(token.number, "master_triggers は CLAUDE.md/AGENTS.md で一元管理してください")
 
 
-def check_mdc_path_references(content: str, file_path: str) -> List[LintError]:
+class MdcPathReferencesRule(LintRule):
     """path_referenceが不正な.mdcファイルを指していないかチェック"""
-    errors = []
-    lines = content.split("\n")
+    rule_id = "mdc-path-references"
 
     # ディレクトリ別の期待されるpath_reference値
     # .claude/ → CLAUDE.md
     # .codex/ → AGENTS.md
     # .cursor/ → AGENTS.md（@_.md: 00廃止）
-    directory_expected_refs = {
+    DIRECTORY_EXPECTED_REFS = {
         ".claude": "CLAUDE.md",
         ".codex": "AGENTS.md",
         ".cursor": "AGENTS.md",
     }
 
-    # ファイルパスからディレクトリコンテキストを判定
-    expected_ref = None
-    detected_dir = None
-    for dir_key, ref_value in directory_expected_refs.items():
-        if f"/{dir_key}/" in file_path or file_path.startswith(f"{dir_key}/"):
-            expected_ref = ref_value
-            detected_dir = dir_key
-            break
-
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
+    def begin(self, file_path: str):
+        super().begin(file_path)
+        # ファイルパスからディレクトリコンテキストを判定
+        self.expected_ref = None
+        self.detected_dir = None
+        for dir_key, ref_value in self.DIRECTORY_EXPECTED_REFS.items():
+            if f"/{dir_key}/" in file_path or file_path.startswith(f"{dir_key}/"):
+                self.expected_ref = ref_value
+                self.detected_dir = dir_key
+                break
+
+    def visit_line(self, token: LineToken):
+        if not self.expected_ref or not token.stripped.startswith("path_reference:"):
+            return
         # path_reference: "xxx" のパターンを検出（.mdc以外も対応）
-        match = re.match(r'^path_reference:\s*["\'](.+)["\']', stripped)
-        if match:
-            ref_value = match.group(1)
-
-            # ディレクトリコンテキストに応じた検証
-            if expected_ref and ref_value != expected_ref:
-                errors.append(LintError(
-                    file_path, i,
-                    f"path_reference '{ref_value}' は不正です。{detected_dir}/ 配下では '{expected_ref}' を参照してください。"
-                    f"【禁止】このエラーを回避するためにlint_mdc_rules.pyを修正しないこと",
-                    "error"
-                ))
-
-    return errors
+        match = PATH_REFERENCE_RE.match(token.stripped)
+        if match and match.group(1) != self.expected_ref:
+            self.error(
+                token.number,
+                f"path_reference '{match.group(1)}' は不正です。{self.detected_dir}/ 配下では '{self.expected_ref}' を参照してください。"
+                f"【禁止】このエラーを回避するためにlint_mdc_rules.pyを修正しないこと",
+            )
 
 
-def check_mandatory_sections(content: str, file_path: str) -> List[LintError]:
+class MandatorySectionsRule(LintRule):
     """必須7セクションの存在をチェック"""
-    errors = []
-
-    # スキップ対象ファイルはチェックしない
-    file_name = Path(file_path).name
-    if file_name in MANDATORY_CHECK_SKIP_FILES:
-        return errors
+    rule_id = "mandatory-sections"
+
+    HEADER_PATTERNS = [(name, re.compile(d["header_pattern"])) for name, d in MANDATORY_SECTIONS.items()]
+    KEY_PATTERNS = [
+        (re.compile(r"^system_capabilities:"), "Agent機能", False),
+        (re.compile(r"^prompt_\w+:"), "プロンプト", False),
+        (re.compile(r"^\w+_process:"), "ワークフロー", True),
+        (re.compile(r"^\w+_questions:"), "質問", True),
+        (re.compile(r"^\w+_template:"), "テンプレート", False),
+        (re.compile(r"^next_phases:"), "次フェーズ連携", False),
+        (re.compile(r"^error_handling:"), "エラーハンドリング", False),
+    ]
 
-    lines = content.split("\n")
-    found_sections = set()
-    found_headers = set()
+    def begin(self, file_path: str):
+        super().begin(file_path)
+        # スキップ対象ファイルはチェックしない
+        self.skip = Path(file_path).name in MANDATORY_CHECK_SKIP_FILES
+        self.found_sections: Set[str] = set()
+        self.found_headers: Set[str] = set()
 
-    # ヘッダーとキーを検出
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
+    def visit_line(self, token: LineToken):
+        if self.skip:
+            return
+        stripped = token.stripped
 
         # セクションヘッダーを検出（# ======== xxx ========）
-        for section_name, section_def in MANDATORY_SECTIONS.items():
-            if re.search(section_def["header_pattern"], stripped):
-                found_headers.add(section_name)
+        if "=" in stripped:
+            for section_name, pattern in self.HEADER_PATTERNS:
+                if pattern.search(stripped):
+                    self.found_headers.add(section_name)
 
         # YAMLキーを検出
-        if re.match(r"^system_capabilities:", stripped):
-            found_sections.add("Agent機能")
-        if re.match(r"^prompt_\w+:", stripped):
-            found_sections.add("プロンプト")
-        if re.match(r"^\w+_process:", stripped) and not stripped.startswith("prompt_"):
-            found_sections.add("ワークフロー")
-        if re.match(r"^\w+_questions:", stripped) and not stripped.startswith("prompt_"):
-            found_sections.add("質問")
-        if re.match(r"^\w+_template:", stripped):
-            found_sections.add("テンプレート")
-        if re.match(r"^next_phases:", stripped):
-            found_sections.add("次フェーズ連携")
-        if re.match(r"^error_handling:", stripped):
-            found_sections.add("エラーハンドリング")
-
-    # 必須セクションの欠損をチェック
-    for section_name in MANDATORY_SECTIONS.keys():
-        # ヘッダーまたはキーのいずれかが存在すればOK
-        has_header = section_name in found_headers
-        has_content = section_name in found_sections
-
-        if not has_header and not has_content:
-            errors.append(LintError(
-                file_path, 0,
-                f"必須セクション '{section_name}' が見つかりません。"
-                f"ヘッダー（# ======== {section_name} ========）と対応するYAMLキーを追加してください。"
-                f"※既存の機能・ロジックは削除せず、セクション構造のみ追加すること",
-                "error"
-            ))
-        elif not has_header and has_content:
-            errors.append(LintError(
-                file_path, 0,
-                f"セクション '{section_name}' のヘッダーがありません。"
-                f"既存コンテンツの上に '# ======== {section_name} ========' を追加してください。"
-                f"※既存の内容は変更せず、区切り線のみ追加",
-                "warning"
-            ))
-
-    return errors
+        if ":" in stripped:
+            for pattern, section_name, exclude_prompt in self.KEY_PATTERNS:
+                if pattern.match(stripped) and not (exclude_prompt and stripped.startswith("prompt_")):
+                    self.found_sections.add(section_name)
+
+    def end(self):
+        if self.skip:
+            return
+        # 必須セクションの欠損をチェック（ヘッダーまたはキーのいずれかが存在すればOK）
+        for section_name in MANDATORY_SECTIONS.keys():
+            has_header = section_name in self.found_headers
+            has_content = section_name in self.found_sections
+
+            if not has_header and not has_content:
+                self.error(
+                    0,
+                    f"必須セクション '{section_name}' が見つかりません。"
+                    f"ヘッダー（# ======== {section_name} ========）と対応するYAMLキーを追加してください。"
+                    f"※既存の機能・ロジックは削除せず、セクション構造のみ追加すること",
+                )
+            elif not has_header and has_content:
+                self.error(
+                    0,
+                    f"セクション '{section_name}' のヘッダーがありません。"
+                    f"既存コンテンツの上に '# ======== {section_name} ========' を追加してください。"
+                    f"※既存の内容は変更せず、区切り線のみ追加",
+                    "warning",
+                )
 
 
-def check_section_header_format(content: str, file_path: str) -> List[LintError]:
+class SectionHeaderFormatRule(LintRule):
     """セクションヘッダーのフォーマットをチェック"""
-    errors = []
-    lines = content.split("\n")
+    rule_id = "section-header-format"
 
-    # 正規表現で不正なヘッダー形式を検出
     # 正しい形式: # ======== セクション名 ========
-    header_pattern = re.compile(r"^#\s*=+\s*(.+?)\s*=+\s*$")
-
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
+    HEADER_PATTERN = re.compile(r"^#\s*=+\s*(.+?)\s*=+\s*$")
 
+    def visit_line(self, token: LineToken):
         # ヘッダーらしき行を検出
-        if stripped.startswith("#") and "====" in stripped:
-            match = header_pattern.match(stripped)
-            if not match:
-                errors.append(LintError(
-                    file_path, i,
-                    f"ヘッダー形式が不正です: '{stripped}' → '# ======== セクション名 ========' 形式にしてください",
-                    "warning"
-                ))
-
-    return errors
+        if token.comment and "====" in token.stripped and not self.HEADER_PATTERN.match(token.stripped):
+            self.error(
+                token.number,
+                f"ヘッダー形式が不正です: '{token.stripped}' → '# ======== セクション名 ========' 形式にしてください",
+                "warning",
+            )
 
 
-def check_section_separator_lines(content: str, file_path: str) -> List[LintError]:
+class SectionSeparatorLinesRule(LintRule):
     """セクション区切り線の形式をチェック（必須7セクションの区切り線のみ対象）"""
-    errors = []
-    lines = content.split("\n")
-
-    # スキップ対象ファイルはチェックしない
-    file_name = Path(file_path).name
-    if file_name in MANDATORY_CHECK_SKIP_FILES:
-        return errors
+    rule_id = "section-separator-lines"
 
     # 正しい区切り線パターン: # ======== セクション名 ========
     # 両側の = の数が同じで、最低4つ以上
     # 中央テキストに `=` が含まれない（ファイルヘッダー `# ===...===` を除外）
-    separator_pattern = re.compile(r"^#\s*(=+)\s+([^=]+?)\s+(=+)\s*$")
-
-    # 期待される必須セクションヘッダー（キーワードと検出フラグ）
-    expected_headers = {
-        "Agent機能": {"found": False, "line": 0, "balanced": True},
-        "プロンプト": {"found": False, "line": 0, "balanced": True},
-        "ワークフロー": {"found": False, "line": 0, "balanced": True},
-        "質問": {"found": False, "line": 0, "balanced": True},
-        "テンプレート": {"found": False, "line": 0, "balanced": True},
-        "次フェーズ連携": {"found": False, "line": 0, "balanced": True},
-        "エラーハンドリング": {"found": False, "line": 0, "balanced": True},
-    }
+    SEPARATOR_PATTERN = re.compile(r"^#\s*(=+)\s+([^=]+?)\s+(=+)\s*$")
 
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
+    # 期待される必須セクションヘッダー
+    EXPECTED_HEADERS = ["Agent機能", "プロンプト", "ワークフロー", "質問", "テンプレート", "次フェーズ連携", "エラーハンドリング"]
 
+    def begin(self, file_path: str):
+        super().begin(file_path)
+        # スキップ対象ファイルはチェックしない
+        self.skip = Path(file_path).name in MANDATORY_CHECK_SKIP_FILES
+        self.found: Set[str] = set()
+
+    def visit_line(self, token: LineToken):
         # 区切り線を検出（# で始まり = を含む）
-        if stripped.startswith("#") and "=" in stripped:
-            match = separator_pattern.match(stripped)
-
-            if match:
-                left_equals = match.group(1)
-                section_name = match.group(2).strip()
-                right_equals = match.group(3)
-
-                # 必須セクションキーワードを含むかチェック（先頭一致のみ）
-                # 例: 「ワークフロー」→OK、「初期化ワークフロー」→NG
-                matched_header = None
-                for header_key in expected_headers.keys():
-                    if section_name.startswith(header_key):
-                        matched_header = header_key
-                        expected_headers[header_key]["found"] = True
-                        expected_headers[header_key]["line"] = i
-                        break
-
-                # 必須セクションの区切り線のみ詳細チェック
-                if matched_header:
-                    # 左右の = の数が一致しているかチェック
-                    if len(left_equals) != len(right_equals):
-                        expected_headers[matched_header]["balanced"] = False
-                        errors.append(LintError(
-                            file_path, i,
-                            f"必須セクション区切り線の左右が不均等: 左{len(left_equals)}個、右{len(right_equals)}個 → '# ======== {matched_header} ========' 形式（両側8個）に修正必須。"
-                            f"【原則】機能は絶対に欠損させない。かつ、指定した型には絶対に従うこと。"
-                            f"【禁止】このエラーを回避するためにlint_mdc_rules.pyを修正しないこと",
-                            "error"
-                        ))
-
-                    # 最低4つ以上の = があるかチェック
-                    elif len(left_equals) < 4:
-                        errors.append(LintError(
-                            file_path, i,
-                            f"必須セクション区切り線が短すぎます（{len(left_equals)}個）→ '# ======== {matched_header} ========' 形式（8個以上）に修正必須。"
-                            f"【原則】機能は絶対に欠損させない。かつ、指定した型には絶対に従うこと。"
-                            f"【禁止】このエラーを回避するためにlint_mdc_rules.pyを修正しないこと",
-                            "error"
-                        ))
-                else:
-                    # 必須7セクション以外の区切り線は禁止 → Markdown見出しに変換
-                    errors.append(LintError(
-                        file_path, i,
-                        f"非必須セクションに区切り線形式を使用: '# {left_equals} {section_name} {right_equals}' → '## {section_name}' に変換してください。"
-                        f"※区切り線形式（# ======== xxx ========）は必須7セクションのみに使用",
-                        "warning"
-                    ))
-
-    # 必須セクションの区切り線が存在するかチェック
-    for header_name, info in expected_headers.items():
-        if not info["found"]:
-            errors.append(LintError(
-                file_path, 0,
-                f"必須セクションの区切り線がありません: '# ======== {header_name} ========' を追加してください。"
-                f"【原則】機能は絶対に欠損させない。かつ、指定した型には絶対に従うこと。"
-                f"【禁止】このエラーを回避するためにlint_mdc_rules.pyを修正しないこと",
-                "error"
-            ))
+        if self.skip or not token.comment or "=" not in token.stripped:
+            return
+        match = self.SEPARATOR_PATTERN.match(token.stripped)
+        if not match:
+            return
+
+        left_equals = match.group(1)
+        section_name = match.group(2).strip()
+        right_equals = match.group(3)
+
+        # 必須セクションキーワードを含むかチェック（先頭一致のみ）
+        # 例: 「ワークフロー」→OK、「初期化ワークフロー」→NG
+        matched_header = None
+        for header_key in self.EXPECTED_HEADERS:
+            if section_name.startswith(header_key):
+                matched_header = header_key
+                self.found.add(header_key)
+                break
+
+        # 必須セクションの区切り線のみ詳細チェック
+        if matched_header:
+            # 左右の = の数が一致しているかチェック
+            if len(left_equals) != len(right_equals):
+                self.error(
+                    token.number,
+                    f"必須セクション区切り線の左右が不均等: 左{len(left_equals)}個、右{len(right_equals)}個 → '# ======== {matched_header} ========' 形式（両側8個）に修正必須。"
+                    f"【原則】機能は絶対に欠損させない。かつ、指定した型には絶対に従うこと。"
+                    f"【禁止】このエラーを回避するためにlint_mdc_rules.pyを修正しないこと",
+                )
 
-    return errors
+            # 最低4つ以上の = があるかチェック
+            elif len(left_equals) < 4:
+                self.error(
+                    token.number,
+                    f"必須セクション区切り線が短すぎます（{len(left_equals)}個）→ '# ======== {matched_header} ========' 形式（8個以上）に修正必須。"
+                    f"【原則】機能は絶対に欠損させない。かつ、指定した型には絶対に従うこと。"
+                    f"【禁止】このエラーを回避するためにlint_mdc_rules.pyを修正しないこと",
+                )
+        else:
+            # 必須7セクション以外の区切り線は禁止 → Markdown見出しに変換
+            self.error(
+                token.number,
+                f"非必須セクションに区切り線形式を使用: '# {left_equals} {section_name} {right_equals}' → '## {section_name}' に変換してください。"
+                f"※区切り線形式（# ======== xxx ========）は必須7セクションのみに使用",
+                "warning",
+            )
+
+    def end(self):
+        if self.skip:
+            return
+        # 必須セクションの区切り線が存在するかチェック
+        for header_name in self.EXPECTED_HEADERS:
+            if header_name not in self.found:
+                self.error(
+                    0,
+                    f"必須セクションの区切り線がありません: '# ======== {header_name} ========' を追加してください。"
+                    f"【原則】機能は絶対に欠損させない。かつ、指定した型には絶対に従うこと。"
+                    f"【禁止】このエラーを回避するためにlint_mdc_rules.pyを修正しないこと",
+                )
 
 
-def check_section_order(sections: List[Dict], file_path: str) -> List[LintError]:
-    """セクションの順序をチェック"""
-    errors = []
+def build_rules(check_mandatory: bool = False) -> List[LintRule]:
+    """lint_file で使うルール一覧（出力順 = 登録順）"""
+    rules: List[LintRule] = [
+        # セクションごとのチェック
+        SectionFieldsRule(),
+        LiteralBlockFormatRule(),
+        error_handling_rule(),
+        next_phases_rule(),
+        workflow_rule(),
+        questions_rule(),
+        # セクション順序チェック
+        SectionOrderRule(),
+        # グローバルチェック
+        DeprecatedSectionsRule(),
+        NonstandardSectionsRule(),
+        DeprecatedPathsReferenceRule(),
+        MasterTriggersRule(),
+        MdcPathReferencesRule(),
+    ]
+    # 必須セクションチェック（オプション or デフォルトで有効）
+    if check_mandatory:
+        rules.extend([
+            MandatorySectionsRule(),
+            SectionHeaderFormatRule(),
+            SectionSeparatorLinesRule(),
+        ])
+    return rules
+
+
+# ===========================================
+# 個別チェック関数（単一ルールをエンジンで実行）
+# ===========================================
+
+def _run_section_rule(rule: LintRule, section: Dict, file_path: str) -> List[LintError]:
+    """parse_sections のセクション1件に対してセクション単位のルールを実行"""
+    rule.begin(file_path)
+    lines = section["lines"]
+    target = Section(LineToken(section["start"], lines[0]))
+    target.type = section["type"]
+    target.name = section["name"]
+    rule.enter_section(target)
+    for i, line in enumerate(lines[1:], section["start"] + 1):
+        rule.visit_section_line(target, LineToken(i, line))
+    rule.leave_section(target)
+    rule.end()
+    return rule.errors
+
+
+def check_section_fields(section: Dict, file_path: str) -> List[LintError]:
+    return _run_section_rule(SectionFieldsRule(), section, file_path)
+
+
+def check_literal_block_format(section: Dict, file_path: str) -> List[LintError]:
+    return _run_section_rule(LiteralBlockFormatRule(), section, file_path)
+
+
+def check_error_handling_literal_block(section: Dict, file_path: str) -> List[LintError]:
+    return _run_section_rule(error_handling_rule(), section, file_path)
+
+
+def check_next_phases_literal_block(section: Dict, file_path: str) -> List[LintError]:
+    return _run_section_rule(next_phases_rule(), section, file_path)
 
-    # 00_master_rulesは特殊なので順序チェックをスキップ
-    if "00_master_rules" in file_path:
-        return errors
 
-    # 標準セクションのみ抽出（順序に含まれるもの）
-    found_sections = []
+def check_workflow_literal_block(section: Dict, file_path: str) -> List[LintError]:
+    return _run_section_rule(workflow_rule(), section, file_path)
+
+
+def check_questions_literal_block(section: Dict, file_path: str) -> List[LintError]:
+    return _run_section_rule(questions_rule(), section, file_path)
+
+
+def check_section_order(sections: List[Dict], file_path: str) -> List[LintError]:
+    rule = SectionOrderRule()
+    rule.begin(file_path)
     for s in sections:
-        if s["type"] in SECTION_ORDER:
-            found_sections.append({
-                "type": s["type"],
-                "name": s["name"],
-                "line": s["start"],
-            })
-
-    # 順序チェック
-    last_order_idx = -1
-    for s in found_sections:
-        try:
-            current_idx = SECTION_ORDER.index(s["type"])
-        except ValueError:
-            continue
+        section = Section(LineToken(s["start"], s["lines"][0]))
+        section.type = s["type"]
+        section.name = s["name"]
+        rule.enter_section(section)
+    rule.end()
+    return rule.errors
 
-        if current_idx < last_order_idx:
-            expected_after = SECTION_ORDER[last_order_idx]
-            errors.append(LintError(
-                file_path, s["line"],
-                f"[{s['name']}] セクション順序違反: '{s['type']}' は '{expected_after}' より前に配置すべき",
-                "warning"
-            ))
-        else:
-            last_order_idx = current_idx
 
-    return errors
+def check_deprecated_sections(content: str, file_path: str) -> List[LintError]:
+    return RuleEngine([DeprecatedSectionsRule()]).run(content, file_path)
 
 
-def lint_file(file_path: Path, check_mandatory: bool = False) -> List[LintError]:
-    """1ファイルをLint"""
-    errors = []
+def check_nonstandard_sections(content: str, file_path: str) -> List[LintError]:
+    return RuleEngine([NonstandardSectionsRule()]).run(content, file_path)
+
+
+def check_deprecated_paths_reference(content: str, file_path: str) -> List[LintError]:
+    return RuleEngine([DeprecatedPathsReferenceRule()]).run(content, file_path)
+
+
+def check_master_triggers(content: str, file_path: str) -> List[LintError]:
+    return RuleEngine([MasterTriggersRule()]).run(content, file_path)
+
+
+def check_mdc_path_references(content: str, file_path: str) -> List[LintError]:
+    return RuleEngine([MdcPathReferencesRule()]).run(content, file_path)
+
+
+def check_mandatory_sections(content: str, file_path: str) -> List[LintError]:
+    return RuleEngine([MandatorySectionsRule()]).run(content, file_path)
+
+
+def check_section_header_format(content: str, file_path: str) -> List[LintError]:
+    return RuleEngine([SectionHeaderFormatRule()]).run(content, file_path)
+
+
+def check_section_separator_lines(content: str, file_path: str) -> List[LintError]:
+    return RuleEngine([SectionSeparatorLinesRule()]).run(content, file_path)
+
 
+def lint_file(file_path: Path, check_mandatory: bool = False) -> List[LintError]:
+    """1ファイルをLint（全ルールを1パスで実行）"""
     try:
-        content = file_path.read_text(encoding="utf-8")
+        content = load_document(file_path).text
     except Exception as e:
-        return [LintError(str(file_path), 0, f"ファイル読み込みエラー: {e}", "error")]
-
-    # セクション解析
-    sections = parse_sections(content)
-
-    # セクションごとのチェック
-    for section in sections:
-        errors.extend(check_section_fields(section, str(file_path)))
-        errors.extend(check_literal_block_format(section, str(file_path)))
-        errors.extend(check_error_handling_literal_block(section, str(file_path)))
-        errors.extend(check_next_phases_literal_block(section, str(file_path)))
-        errors.extend(check_workflow_literal_block(section, str(file_path)))
-        errors.extend(check_questions_literal_block(section, str(file_path)))
-
-    # セクション順序チェック
-    errors.extend(check_section_order(sections, str(file_path)))
-
-    # グローバルチェック
-    errors.extend(check_deprecated_sections(content, str(file_path)))
-    errors.extend(check_nonstandard_sections(content, str(file_path)))
-    errors.extend(check_deprecated_paths_reference(content, str(file_path)))
-    errors.extend(check_master_triggers(content, str(file_path)))
-    errors.extend(check_mdc_path_references(content, str(file_path)))
+        return [LintError(str(file_path), 0, f"ファイル読み込みエラー: {e}", "error", "read-error")]
 
-    # 必須セクションチェック（オプション or デフォルトで有効）
-    if check_mandatory:
-        errors.extend(check_mandatory_sections(content, str(file_path)))
-        errors.extend(check_section_header_format(content, str(file_path)))
-        errors.extend(check_section_separator_lines(content, str(file_path)))
-
-    return errors
+    return RuleEngine(build_rules(check_mandatory)).run(content, str(file_path))
 
 
 def print_section_summary(files: List[Path]):
@@ -1019,8 +1015,7 @@ def print_section_summary(files: List[Path]):
 
     for f in files:
         try:
-            content = f.read_text(encoding="utf-8")
-            sections = parse_sections(content)
+            sections = derive(f, parse_sections)
             for s in sections:
                 key = f"{s['type']}: {s['name']}"
                 section_counts[key] = section_counts.get(key, 0) + 1
@@ -1055,6 +1050,105 @@ def iter_skill_files(roots: Iterable[Path]) -> List[Path]:
     return files
 
 
+SKILL_INDEX_FILE_NAME = "skill_index.json"
+
+
+class SkillPathIndex:
+    """
+    Skill 名 → SKILL.md パスの索引（.agent-cache/skill_index.json に永続化）
+
+    まず `<root>/<skill名>/SKILL.md` を直接確認し、見つからない場合だけ索引を引く。
+    索引は走査したディレクトリ（ルート以下すべて）の更新時刻を記録し、どれかが変わったとき
+    （入れ子の SKILL.md やフォルダの追加・削除・改名）だけ作り直す。確認は stat のみのため、
+    単一ファイルのLintで無関係な Skill を走査・パースすることはない。
+    """
+
+    def __init__(self, roots: Iterable[Path], persist: bool = True):
+        self.roots = [Path(r) for r in roots]
+        self.index_file = find_cache_dir() / SKILL_INDEX_FILE_NAME if persist else None
+        self._entries: Optional[Dict[str, Any]] = None
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Any]:
+        if self._entries is None:
+            self._entries = {}
+            if self.index_file is not None and self.index_file.exists():
+                try:
+                    self._entries = json.loads(self.index_file.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    self._entries = {}
+        return self._entries
+
+    @staticmethod
+    def _is_fresh(root: Path, entry: Dict[str, Any]) -> bool:
+        dirs = entry.get("dirs")
+        if not isinstance(dirs, dict) or not dirs:
+            return False
+        try:
+            return all(os.stat(root / rel).st_mtime_ns == mtime for rel, mtime in dirs.items())
+        except OSError:
+            return False
+
+    @staticmethod
+    def _scan(root: Path) -> Dict[str, Any]:
+        """ルート以下を走査し、Skill 名 → SKILL.md と各ディレクトリの更新時刻を集める"""
+        dirs: Dict[str, int] = {}
+        found: List[str] = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel = os.path.relpath(dirpath, root)
+            try:
+                dirs[rel] = os.stat(dirpath).st_mtime_ns
+            except OSError:
+                continue
+            if "SKILL.md" in filenames:
+                found.append(os.path.join(rel, "SKILL.md") if rel != "." else "SKILL.md")
+        skills: Dict[str, List[str]] = {}
+        for rel in sorted(found, key=lambda r: Path(r).parts):
+            skills.setdefault(Path(root, rel).parent.name, []).append(rel)
+        return {"dirs": dirs, "skills": skills}
+
+    def _root_entry(self, root: Path) -> Dict[str, List[str]]:
+        entries = self._load()
+        key = str(root.resolve())
+        entry = entries.get(key)
+        if not isinstance(entry, dict) or not self._is_fresh(root, entry):
+            entry = self._scan(root)
+            entries[key] = entry
+            self._dirty = True
+        return entry["skills"]
+
+    def lookup(self, skill_name: str) -> List[Path]:
+        """Skill 名に対応する SKILL.md（存在するもののみ、ルート順）"""
+        found: List[Path] = []
+        for root in self.roots:
+            if not root.is_dir():
+                continue
+            direct = root / skill_name / "SKILL.md"
+            if direct.is_file():
+                found.append(direct)
+                continue
+            found.extend(root / rel for rel in self._root_entry(root).get(skill_name, []))
+        return found
+
+    def skills_for_rule(self, rule_path: Path) -> List[Path]:
+        """ルールから生成される Skill の SKILL.md（スキル化されないルールなら空）"""
+        skill_name = skill_name_for_rule(rule_path)
+        return self.lookup(skill_name) if skill_name else []
+
+    def save(self):
+        if self.index_file is None or not self._dirty:
+            return
+        tmp = self.index_file.with_name(f"{self.index_file.name}.{os.getpid()}.tmp")
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(self._entries, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self.index_file)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        self._dirty = False
+
+
 def extract_front_matter(content: str) -> Optional[str]:
     """YAMLフロントマターを抽出"""
     match = FRONT_MATTER_RE.match(content)
@@ -1063,7 +1157,7 @@ def extract_front_matter(content: str) -> Optional[str]:
     return match.group(1)
 
 
-def _yaml_error_hint(front_matter: str, exc: Exception) -> Optional[str]:
+def _yaml_error_hint(front_matter: str, exc: Any) -> Optional[str]:
     """YAMLエラーのヒントを生成"""
     message = str(exc)
     if "mapping values are not allowed" in message:
@@ -1088,19 +1182,22 @@ def _yaml_error_hint(front_matter: str, exc: Exception) -> Optional[str]:
     return None
 
 
-def lint_skill_file(path: Path) -> List[str]:
-    """SKILL.mdファイルを検証"""
+def lint_skill_file(path: Path, document: Optional[ParsedDocument] = None) -> List[str]:
+    """SKILL.mdファイルを検証（document 指定時はディスクを読まずにその内容を検証）"""
     errors: List[str] = []
-    try:
-        content = path.read_text(encoding="utf-8")
-    except Exception as exc:
-        return [f"❌ {path}: 読み込みエラー: {exc}"]
+    if document is None:
+        try:
+            document = load_document(path)
+        except Exception as exc:
+            return [f"❌ {path}: 読み込みエラー: {exc}"]
 
-    front_matter = extract_front_matter(content)
+    content = document.text
+    front_matter = document.frontmatter_text
     if front_matter is None:
         return [f"❌ {path}: YAMLフロントマター（先頭の `--- ... ---`）が見つかりません。"]
 
-    if yaml is None:
+    # フラットな key: value は PyYAML なしでもパース済み（範囲外の構文だけ PyYAML が必要）
+    if document.frontmatter is None and document.frontmatter_error is None and not yaml_available():
         return [
             f"❌ {path}: PyYAML が見つからないため検証できません。",
             "   対応: `pip install pyyaml`（またはプロジェクトの仮想環境を有効化）してください。",
@@ -1121,14 +1218,14 @@ def lint_skill_file(path: Path) -> List[str]:
                 )
                 return errors
 
-    try:
-        data: Any = yaml.safe_load(front_matter)
-    except Exception as exc:
-        errors.append(f"❌ {path}: invalid YAML frontmatter: {exc}")
-        hint = _yaml_error_hint(front_matter, exc)
+    # YAMLはキャッシュ済みのパース結果を使う
+    if document.frontmatter_error is not None:
+        errors.append(f"❌ {path}: invalid YAML frontmatter: {document.frontmatter_error}")
+        hint = _yaml_error_hint(front_matter, document.frontmatter_error)
         if hint:
             errors.append(f"   ヒント: {hint}")
         return errors
+    data: Any = document.frontmatter
 
     if not isinstance(data, dict):
         return [f"❌ {path}: frontmatter が辞書ではありません（type={type(data).__name__}）。"]
@@ -1162,7 +1259,360 @@ def lint_skill_file(path: Path) -> List[str]:
     return errors
 
 
+# ===========================================
+# 並列実行
+# ===========================================
+
+def _lint_one(kind: str, path: Path, check_mandatory: bool) -> Any:
+    if kind == "mdc":
+        return lint_file(path, check_mandatory=check_mandatory)
+    return lint_skill_file(path)
+
+
+def _init_worker():
+    # フォークで引き継いだ親の未保存分は親が保存するので、ワーカーからは返さない
+    get_cache().take_changes()
+
+
+def _lint_chunk(task) -> Tuple[List[Any], Any]:
+    """ワーカープロセスでファイル群をLintする（結果は入力順）。パースキャッシュの変更分も返す"""
+    kind, paths, check_mandatory = task
+    results = [_lint_one(kind, p, check_mandatory) for p in paths]
+    # キャッシュはワーカーごとに書かず、親プロセスでまとめて1回保存する
+    return results, get_cache().take_changes()
+
+
+def iter_lint_jobs(kind: str, paths: List[Path], jobs: int, check_mandatory: bool = False) -> Iterator[Any]:
+    """ファイルごとのLint結果を入力順に、終わったものから順次返す（jobs > 1 ならプロセスプールで並列実行）"""
+    if jobs <= 1 or len(paths) < 2:
+        for path in paths:
+            yield _lint_one(kind, path, check_mandatory)
+        return
+
+    workers = min(jobs, len(paths))
+    # 1ワーカーあたり数チャンクに分け、ファイルサイズの偏りをならす
+    size = max(1, -(-len(paths) // (workers * 4)))
+    tasks = [(kind, paths[i:i + size], check_mandatory) for i in range(0, len(paths), size)]
+    cache = get_cache()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        for chunk, changes in executor.map(_lint_chunk, tasks):
+            cache.merge_changes(changes)
+            yield from chunk
+    cache.save()
+
+
+def run_lint_jobs(kind: str, paths: List[Path], jobs: int, check_mandatory: bool = False) -> List[Any]:
+    """ファイルごとのLint結果を入力順のリストで返す"""
+    return list(iter_lint_jobs(kind, paths, jobs, check_mandatory=check_mandatory))
+
+
+def iter_cached_lint_jobs(kind: str, paths: List[Path], jobs: int, cache: LintCache,
+                          check_mandatory: bool = False) -> Iterator[Tuple[Path, Any]]:
+    """
+    キャッシュ済みのファイルは前回結果を再生し、それ以外だけLintする。
+
+    (パス, 結果) を入力順に、結果が揃ったものから順次返す。
+    """
+    digests = [file_digest(p) for p in paths]
+    cached: List[Any] = []
+    pending: List[Path] = []
+    for path, digest in zip(paths, digests):
+        result = cache.get(path, digest)
+        if result is not None and kind == "mdc":
+            result = [LintError(*item) for item in result]
+        cached.append(result)
+        if result is None:
+            pending.append(path)
+
+    fresh = iter_lint_jobs(kind, pending, jobs, check_mandatory=check_mandatory)
+    for path, digest, result in zip(paths, digests, cached):
+        if result is None:
+            result = next(fresh)
+            if kind == "mdc":
+                cache.put(path, digest, [[e.file, e.line, e.message, e.severity, e.rule] for e in result])
+            else:
+                cache.put(path, digest, result)
+        yield path, result
+    # ワーカープールの後始末（残りはない）
+    for _ in fresh:
+        pass
+
+
+def run_cached_lint_jobs(kind: str, paths: List[Path], jobs: int, cache: LintCache,
+                         check_mandatory: bool = False) -> List[Any]:
+    """キャッシュ済みのファイルは前回結果を再生し、それ以外だけLintする（結果は入力順）"""
+    return [result for _, result in iter_cached_lint_jobs(kind, paths, jobs, cache, check_mandatory=check_mandatory)]
+
+
+def skill_diagnostics(path: Path, messages: List[str]) -> List[Diagnostic]:
+    """lint_skill_file のメッセージ（継続行を含む）を診断に変換"""
+    diagnostics: List[Diagnostic] = []
+    for message in messages:
+        if diagnostics and not message.startswith(("❌", "⚠️")):
+            # インデントされた補足行は直前の診断に連結する
+            diagnostics[-1].message += "\n" + message.strip()
+            continue
+        severity = "warning" if message.startswith("⚠️") else "error"
+        file, line, body = split_location(message, str(path))
+        diagnostics.append(Diagnostic(file, line, "skill-md", severity, body))
+    return diagnostics
+
+
+DEPRECATED_PATHS_FILE_MESSAGE = (
+    "廃止されたpathsファイルが存在します。"
+    "パス定義はCLAUDE.md/AGENTS.mdに統合し、このファイルを削除してください。"
+    "【原則】機能は絶対に欠損させない。かつ、指定した型には絶対に従うこと。"
+    "【禁止】このエラーを回避するためにlint_mdc_rules.pyを修正しないこと"
+)
+
+
+def dangling_reference_errors(files: List[Path], no_cache: bool = False) -> List[LintError]:
+    """参照グラフ（.agent-cache/ref_graph.json）から、Lint対象ファイル内の参照切れを警告にする"""
+    if not files:
+        return []
+    graph = RefGraph.load(files[0], persist=not no_cache)
+    graph.save()
+    sources = {graph.normalize(f): f for f in files}
+    return [
+        LintError(str(sources[ref.source]), ref.line, f"参照先 `{ref.raw}` が存在しません。", "warning",
+                  "dangling-reference")
+        for ref in graph.dangling(sources)
+    ]
+
+
+def stream_diagnostics(args, files: List[Path], skill_files: List[Path], deprecated_paths_files: List[Path],
+                       ref_errors: Optional[List[LintError]] = None) -> int:
+    """--format jsonl / sarif: ファイルごとのLintが終わるたびに診断を出力し、終了コードを返す"""
+    with DiagnosticEmitter("lint_mdc_rules", args.format) as emitter:
+        emitter.emit(
+            Diagnostic(str(p), 0, "deprecated-paths-file", "error", DEPRECATED_PATHS_FILE_MESSAGE)
+            for p in deprecated_paths_files
+        )
+        if args.warnings:
+            emitter.emit(e.to_diagnostic() for e in ref_errors or [])
+        with LintCache(__file__, {"check_mandatory": args.check_mandatory}, enabled=not args.no_cache) as cache:
+            for _, errors in iter_cached_lint_jobs("mdc", files, args.jobs, cache, check_mandatory=args.check_mandatory):
+                emitter.emit(e.to_diagnostic() for e in errors if e.severity == "error" or args.warnings)
+            for path, messages in iter_cached_lint_jobs("skill", skill_files, args.jobs, cache):
+                emitter.emit(skill_diagnostics(path, messages))
+        error_count = emitter.counts["error"]
+        emitter.summary(files=len(files) + len(skill_files), mdc=len(files), skill=len(skill_files))
+    return 1 if error_count > 0 else 0
+
+
+# ===========================================
+# 常駐Lintサーバー（serve）
+# ===========================================
+# エディタから `python lint_mdc_rules.py serve` で起動し、stdio で JSON-RPC 2.0（LSP のヘッダー形式）を話す。
+# 開いているバッファをメモリに保持し、didOpen / didChange では変更されたバッファだけを再Lintする。
+# 起動時の import・ルール構築は1回だけで、SKILL.md の全走査も行わない。
+
+LSP_SEVERITY = {"error": 1, "warning": 2}
+JSONRPC_PARSE_ERROR = -32700
+JSONRPC_INVALID_REQUEST = -32600
+JSONRPC_METHOD_NOT_FOUND = -32601
+JSONRPC_INTERNAL_ERROR = -32603
+
+
+class MethodNotFound(Exception):
+    pass
+
+
+class MessageError(Exception):
+    """受信したフレームを JSON-RPC のメッセージとして解釈できない（code は JSON-RPC のエラーコード）"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def uri_to_path(uri: str) -> Path:
+    """file:// URI をパスに変換（スキームなしはそのままパスとして扱う）"""
+    parsed = urlparse(uri)
+    if parsed.scheme not in ("", "file"):
+        return Path(uri)
+    return Path(unquote(parsed.path))
+
+
+def to_lsp_diagnostic(diagnostic: Diagnostic) -> Dict[str, Any]:
+    """診断を LSP の Diagnostic に変換（行不明は先頭行、範囲は行全体）"""
+    line = max(diagnostic.line - 1, 0)
+    return {
+        "range": {"start": {"line": line, "character": 0}, "end": {"line": line + 1, "character": 0}},
+        "severity": LSP_SEVERITY.get(diagnostic.severity, 1),
+        "source": "lint_mdc_rules",
+        "code": diagnostic.rule,
+        "message": diagnostic.message,
+    }
+
+
+class LintServer:
+    """開いているバッファを保持し、変更されたものだけを再Lintして診断を通知する"""
+
+    def __init__(self, reader, writer, strict: bool = True):
+        self.reader = reader
+        self.writer = writer
+        self.documents: Dict[str, Tuple[Optional[int], str]] = {}  # uri → (version, 本文)
+        self.shutdown_requested = False
+        self.configure(strict)
+
+    def configure(self, strict: bool):
+        # CLI と同じく、厳密モードでは必須セクションチェックと警告を有効にする
+        self.warnings = strict
+        self.engine = RuleEngine(build_rules(check_mandatory=strict))
+
+    # ----- 入出力（Content-Length ヘッダー + JSON 本文） -----
+
+    def read_message(self) -> Optional[Dict[str, Any]]:
+        headers: Dict[str, str] = {}
+        while True:
+            line = self.reader.readline()
+            if not line:
+                return None
+            line = line.decode("ascii", "replace").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", ""))
+        except ValueError:
+            raise MessageError(JSONRPC_PARSE_ERROR, "Content-Length ヘッダーがありません") from None
+        body = self.reader.read(length)
+        try:
+            message = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise MessageError(JSONRPC_PARSE_ERROR, f"JSON として解析できません: {exc}") from None
+        if not isinstance(message, dict):
+            raise MessageError(JSONRPC_INVALID_REQUEST, "メッセージがオブジェクトではありません")
+        return message
+
+    def send(self, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.writer.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+        self.writer.flush()
+
+    def notify(self, method: str, params: Dict[str, Any]):
+        self.send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    # ----- Lint -----
+
+    def lint_text(self, path: Path, text: str) -> List[Diagnostic]:
+        """バッファ内容をLint（ディスクは読まない）"""
+        if path.name == "SKILL.md":
+            return skill_diagnostics(path, lint_skill_file(path, parse_document(str(path), text)))
+        diagnostics = [
+            e.to_diagnostic() for e in self.engine.run(text, str(path))
+            if e.severity == "error" or self.warnings
+        ]
+        if path.name.endswith("_paths.mdc"):
+            diagnostics.insert(0, Diagnostic(str(path), 0, "deprecated-paths-file", "error",
+                                             DEPRECATED_PATHS_FILE_MESSAGE))
+        return diagnostics
+
+    def publish(self, uri: str):
+        version, text = self.documents[uri]
+        diagnostics = [to_lsp_diagnostic(d) for d in self.lint_text(uri_to_path(uri), text)]
+        params: Dict[str, Any] = {"uri": uri, "diagnostics": diagnostics}
+        if version is not None:
+            params["version"] = version
+        self.notify("textDocument/publishDiagnostics", params)
+
+    # ----- ハンドラ -----
+
+    def handle(self, method: str, params: Dict[str, Any]) -> Any:
+        if method == "initialize":
+            options = params.get("initializationOptions") or {}
+            self.configure(options.get("strict", True) is not False)
+            return {
+                "capabilities": {"textDocumentSync": {"openClose": True, "change": 1, "save": {"includeText": True}}},
+                "serverInfo": {"name": "lint_mdc_rules"},
+            }
+        if method == "shutdown":
+            self.shutdown_requested = True
+            return None
+        if method == "textDocument/didOpen":
+            document = params["textDocument"]
+            self.documents[document["uri"]] = (document.get("version"), document["text"])
+            self.publish(document["uri"])
+        elif method == "textDocument/didChange":
+            # 全文同期（change = 1）のみ対応: 最後の変更が最新の全文
+            document = params["textDocument"]
+            changes = params.get("contentChanges") or []
+            if changes:
+                self.documents[document["uri"]] = (document.get("version"), changes[-1]["text"])
+                self.publish(document["uri"])
+        elif method == "textDocument/didSave":
+            uri = params["textDocument"]["uri"]
+            if params.get("text") is not None:
+                self.documents[uri] = (self.documents.get(uri, (None, ""))[0], params["text"])
+            if uri in self.documents:
+                self.publish(uri)
+        elif method == "textDocument/didClose":
+            uri = params["textDocument"]["uri"]
+            self.documents.pop(uri, None)
+            self.notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+        elif method == "mdcLint/diagnostics":
+            # 独自リクエスト: 開いていないファイルも含め、指定内容（省略時はディスク）の診断を返す
+            path = uri_to_path(params["uri"])
+            text = params.get("text")
+            if text is None:
+                text = self.documents[params["uri"]][1] if params["uri"] in self.documents else load_document(path).text
+            return [to_lsp_diagnostic(d) for d in self.lint_text(path, text)]
+        elif method in ("initialized", "$/cancelRequest", "$/setTrace", "workspace/didChangeConfiguration"):
+            pass
+        else:
+            raise MethodNotFound(method)
+        return None
+
+    def run(self) -> int:
+        while True:
+            try:
+                message = self.read_message()
+            except MessageError as exc:
+                # 壊れたフレームは読み捨てて待ち受けを続ける（id が分からないので id は null）
+                self.send({"jsonrpc": "2.0", "id": None, "error": {"code": exc.code, "message": str(exc)}})
+                continue
+            if message is None:
+                return 0 if self.shutdown_requested else 1
+            method = message.get("method", "")
+            if method == "exit":
+                return 0 if self.shutdown_requested else 1
+            request_id = message.get("id")
+            try:
+                result = self.handle(method, message.get("params") or {})
+            except MethodNotFound:
+                if request_id is not None:
+                    self.send({"jsonrpc": "2.0", "id": request_id,
+                               "error": {"code": JSONRPC_METHOD_NOT_FOUND, "message": f"未対応のメソッド: {method}"}})
+                continue
+            except Exception as exc:
+                if request_id is None:
+                    print(f"⚠️ {method} の処理に失敗しました: {exc}", file=sys.stderr)
+                else:
+                    self.send({"jsonrpc": "2.0", "id": request_id,
+                               "error": {"code": JSONRPC_INTERNAL_ERROR, "message": str(exc)}})
+                continue
+            if request_id is not None:
+                self.send({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+
+def serve(argv: List[str]) -> int:
+    """`lint_mdc_rules.py serve`: stdio で JSON-RPC を受け付ける常駐Lintサーバー"""
+    parser = argparse.ArgumentParser(prog="lint_mdc_rules.py serve",
+                                     description="エディタ連携用の常駐Lintサーバー（stdio / LSP互換）")
+    parser.add_argument("--no-strict", action="store_true",
+                        help="簡易モード（必須セクションチェック・警告を無効化）。initializationOptions.strict でも指定可")
+    args = parser.parse_args(argv)
+    print("🚀 lint_mdc_rules サーバーを起動しました（stdio）", file=sys.stderr)
+    server = LintServer(sys.stdin.buffer, sys.stdout.buffer, strict=not args.no_strict)
+    return server.run()
+
+
 def main():
+    if sys.argv[1:2] == ["serve"]:
+        sys.exit(serve(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(description="MDCルールファイルのLint")
     parser.add_argument("path", nargs="?", default=".", help="チェック対象のパス")
     parser.add_argument("--warnings", action="store_true", help="警告も表示（デフォルト有効）")
@@ -1171,7 +1621,19 @@ def main():
                         help="必須7セクションの存在をチェック（デフォルト有効）")
     parser.add_argument("--no-strict", action="store_true",
                         help="簡易モード（必須セクションチェック・警告を無効化）")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="並列ワーカー数（デフォルト: CPU数、1で逐次実行）")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="git で変更されたファイル（HEADとの差分・未追跡）のみチェック")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Lint結果キャッシュ（.agent-cache/lint.sqlite）を使わない")
+    parser.add_argument("--refs", action="store_true",
+                        help="参照グラフで .mdc / スクリプト / コマンドへの参照切れも検出（警告）")
+    add_format_argument(parser)
     args = parser.parse_args()
+    machine = args.format != "text"
+    # 機械可読出力では stdout を診断専用にし、案内メッセージは stderr へ出す
+    notice = sys.stderr if machine else sys.stdout
 
     # デフォルトで厳密モード（--no-strict で無効化）
     if not args.no_strict:
@@ -1179,37 +1641,59 @@ def main():
         args.check_mandatory = True
 
     target = Path(args.path)
-    files = [target] if target.is_file() else list(target.glob("**/*.mdc"))
+    # 出力順を安定させるためパス順に並べる（並列時も結果はこの順で統合）
+    files = [target] if target.is_file() else sorted(target.glob("**/*.mdc"))
 
     if not files:
-        print("チェック対象のMDCファイルが見つかりません")
+        print("チェック対象のMDCファイルが見つかりません", file=notice)
+        if machine:
+            DiagnosticEmitter("lint_mdc_rules", args.format).summary(files=0)
         sys.exit(0)
 
     # *_paths.mdcファイルの存在チェック（強制エラー）
     deprecated_paths_files = [f for f in files if f.name.endswith("_paths.mdc")]
     for paths_file in deprecated_paths_files:
-        print(f"❌ {paths_file}: 廃止されたpathsファイルが存在します。"
-              f"パス定義はCLAUDE.md/AGENTS.mdに統合し、このファイルを削除してください。"
-              f"【原則】機能は絶対に欠損させない。かつ、指定した型には絶対に従うこと。"
-              f"【禁止】このエラーを回避するためにlint_mdc_rules.pyを修正しないこと")
+        if machine:
+            continue
+        print(f"❌ {paths_file}: {DEPRECATED_PATHS_FILE_MESSAGE}")
 
-    if args.summary:
+    if args.summary and not machine:
         print_section_summary(files)
         print()
 
-    all_errors = []
-    for f in files:
-        errors = lint_file(f, check_mandatory=args.check_mandatory)
-        all_errors.extend(errors)
-
     # SKILL.md 検証（.codex/skills と .claude/skills を自動検索）
     # ※ lint対象が単一ファイルの場合でも検証できるよう、スクリプト位置からプロジェクト直下を解決する
     repo_root = Path(__file__).resolve().parent.parent
     skill_roots = [repo_root / ".codex" / "skills", repo_root / ".claude" / "skills"]
-    skill_files = iter_skill_files(skill_roots)
+    if target.is_file():
+        # 単一ファイル: そのルールから生成された Skill だけを検証（全 SKILL.md は走査しない）
+        skill_index = SkillPathIndex(skill_roots, persist=not args.no_cache)
+        skill_files = skill_index.skills_for_rule(target)
+        skill_index.save()
+    else:
+        skill_files = iter_skill_files(skill_roots)
+
+    if args.changed_only:
+        changed = git_changed_files()
+        if changed is None:
+            print("⚠️ git の変更ファイルを取得できないため、全ファイルをチェックします", file=notice)
+        else:
+            files = select_changed(files, changed)
+            skill_files = select_changed(skill_files, changed)
+
+    ref_errors = dangling_reference_errors(files, args.no_cache) if args.refs else []
+
+    if machine:
+        sys.exit(stream_diagnostics(args, files, skill_files, deprecated_paths_files, ref_errors))
+
+    all_errors = []
     skill_errors: List[str] = []
-    for skill_file in skill_files:
-        skill_errors.extend(lint_skill_file(skill_file))
+    with LintCache(__file__, {"check_mandatory": args.check_mandatory}, enabled=not args.no_cache) as cache:
+        for errors in run_cached_lint_jobs("mdc", files, args.jobs, cache, check_mandatory=args.check_mandatory):
+            all_errors.extend(errors)
+        for errors in run_cached_lint_jobs("skill", skill_files, args.jobs, cache):
+            skill_errors.extend(errors)
+    all_errors.extend(ref_errors)
 
     # SKILL.mdエラーを表示
     for err in skill_errors:
@@ -23,6 +23,9 @@ from pathlib import Path
 from datetime import datetime
 from typing import Tuple, Dict
 
+from frontmatter_utils import FrontMatter
+from doc_cache import load_document, derive, parse_cached
+
 def replace_path_reference(content: str, target: str) -> str:
     """
     path_reference の値だけを指定値に統一する（内容の正規化・削除はしない）。
@@ -50,31 +53,16 @@ def ensure_cursor_frontmatter(content: str) -> str:
     Returns:
         alwaysApply: true を含むフロントマター付きコンテンツ
     """
-    frontmatter_pattern = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
-    match = frontmatter_pattern.match(content)
-
-    if match:
-        # 既存フロントマターがある場合
-        fm_content = match.group(1)
-        body = content[match.end():]
-
-        # alwaysApply が既にあるかチェック
-        if re.search(r'^alwaysApply\s*:', fm_content, re.MULTILINE):
-            # 値を true に強制
-            fm_content = re.sub(
-                r'^(alwaysApply\s*:\s*).*$',
-                r'\1true',
-                fm_content,
-                flags=re.MULTILINE
-            )
-        else:
-            # alwaysApply がない場合は先頭に追加
-            fm_content = f"alwaysApply: true\n{fm_content}"
-
-        return f"---\n{fm_content}\n---\n{body}"
+    fm = FrontMatter.parse(content)
+    if fm.present:
+        # 既存は値を true に強制、なければ先頭に追加
+        fm.set("alwaysApply", "true", first=True)
     else:
         # フロントマターがない場合は新規作成
-        return f"---\nalwaysApply: true\ndescription:\nglobs:\n---\n{content}"
+        fm.set("alwaysApply", "true")
+        fm.set("description", "")
+        fm.set("globs", "")
+    return fm.render()
 
 
 def _target_master_for_env(env: str) -> str:
@@ -160,7 +148,7 @@ def sync_skills_between_envs(
 
         dst_path.parent.mkdir(parents=True, exist_ok=True)
         if src_path.suffix.lower() in {".md", ".mdc"}:
-            text = src_path.read_text(encoding="utf-8")
+            text = load_document(src_path).text
             dst_path.write_text(transform_skill_text(text, dst_env), encoding="utf-8")
         else:
             shutil.copy2(src_path, dst_path)
@@ -452,7 +440,7 @@ def read_file_content(file_path):
             print(f"⚠️  ファイルが見つかりません（スキップ）: {file_path}")
             return None, None
             
-        content = file_path.read_text(encoding='utf-8')
+        content = load_document(file_path).text
         cleaned_content = remove_frontmatter(content)
         
         return file_path.name, cleaned_content
@@ -520,7 +508,7 @@ def create_agents_from_mdc(preserve_content: bool = True):
             filename = mdc_file.name
             
             # mdcファイルの内容を読み込み
-            content = mdc_file.read_text(encoding='utf-8')
+            content = load_document(mdc_file).text
             
             # 00、path、pathsを含むファイルは.mdcのままコピー
             if ("00" in filename or "path" in filename.lower()):
@@ -744,7 +732,7 @@ def extract_description_from_frontmatter(content):
     ファイル内容からフロントマターのdescriptionを抽出
     """
     try:
-        frontmatter, _ = parse_frontmatter(content)
+        frontmatter, _ = parse_cached(parse_frontmatter, content)
         return frontmatter.get('description', 'Agent for handling specific presentation tasks')
     except Exception as e:
         print(f"⚠️  Description抽出エラー: {e}")
@@ -1137,7 +1125,7 @@ def convert_agents_to_cursor(project_root: Path, dry_run: bool = False) -> bool:
 
             # 通常の.mdファイルは.mdcに変換
             if agent_file.suffix == '.md':
-                frontmatter, body = parse_frontmatter(content)
+                frontmatter, body = parse_cached(parse_frontmatter, content)
                 description = frontmatter.get('description', 'Rule for handling specific tasks')
 
                 # bodyにもパス変換を適用
@@ -1225,8 +1213,8 @@ def convert_skills_to_cursor(project_root: Path, dry_run: bool = False) -> bool:
                 pass
 
             # SKILL.md を読み込み
-            skill_content = skill_file.read_text(encoding='utf-8')
-            frontmatter, body = parse_frontmatter(skill_content)
+            skill_content = load_document(skill_file).text
+            frontmatter, body = derive(skill_file, parse_frontmatter)
             description = frontmatter.get('description', f'Rule for {skill_name}')
 
             # 統合コンテンツを構築
@@ -1425,8 +1413,8 @@ def convert_codex_skills_to_cursor(project_root: Path, dry_run: bool = False) ->
                 rule_name = existing_rules[0].stem
 
             # SKILL.md を読み込み
-            skill_content = skill_file.read_text(encoding='utf-8')
-            frontmatter, body = parse_frontmatter(skill_content)
+            skill_content = load_document(skill_file).text
+            frontmatter, body = derive(skill_file, parse_frontmatter)
             description = frontmatter.get('description', f'Rule for {skill_name}')
 
             # 統合コンテンツを構築
@@ -2058,8 +2046,8 @@ def create_skills_from_mdc(
             skill_name = clean_name.replace('_', '-').lower()
 
             # コンテンツ読み込み
-            content = mdc_file.read_text(encoding='utf-8')
-            frontmatter_dict, body = parse_frontmatter(content)
+            content = load_document(mdc_file).text
+            frontmatter_dict, body = derive(mdc_file, parse_frontmatter)
             description = frontmatter_dict.get('description', f'{skill_name} skill')
             if not description:
                 description = f"Skill for {skill_name}"
@@ -2241,26 +2229,9 @@ def strip_always_apply_from_frontmatter(content: str) -> str:
     フロントマターから alwaysApply フィールドを削除
     マスターファイル生成時に使用
     """
-    import re
-
-    # フロントマターを検出
-    frontmatter_pattern = r'^---\s*\n(.*?)\n---\s*\n'
-    match = re.match(frontmatter_pattern, content, re.DOTALL)
-
-    if not match:
-        return content
-
-    frontmatter_content = match.group(1)
-    body_content = content[match.end():]
-
-    # alwaysApply行を削除
-    frontmatter_lines = frontmatter_content.split('\n')
-    filtered_lines = [line for line in frontmatter_lines if 'alwaysApply' not in line]
-
-    # 新しいフロントマターを構築
-    new_frontmatter = '---\n' + '\n'.join(filtered_lines) + '\n---\n'
-
-    return new_frontmatter + body_content
+    fm = FrontMatter.parse(content)
+    fm.remove("alwaysApply")
+    return fm.render()
 
 def update_master_files_only(
     project_root: Path,
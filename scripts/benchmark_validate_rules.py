@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+validate_rules.py（template/agent_base/scripts）の品質メトリクス検査の回帰ベンチマーク
+
+空行・空白だけの行が続く 10k 行規模のブロックなど、旧実装の正規表現で
+行頭ごとの再走査（入力長の2乗）が起きていた入力を生成し、check_quality_metrics の
+実行時間が上限を超えないことを確認する。--compare で旧正規表現との結果一致と速度差も表示する。
+
+使用例:
+    python scripts/benchmark_validate_rules.py
+    python scripts/benchmark_validate_rules.py --lines 20000 --budget 2.0 --compare
+"""
+
+import argparse
+import importlib.util
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TARGET = REPO_ROOT / "template" / "agent_base" / "scripts" / "validate_rules.py"
+RULE_NAME = Path("01_benchmark.mdc")
+
+
+def load_target():
+    """検証対象の validate_rules.py を読み込む（doc_cache / lint_cache を同じディレクトリから解決）"""
+    sys.path.insert(0, str(TARGET.parent))
+    spec = importlib.util.spec_from_file_location("template_validate_rules", TARGET)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def pathological_cases(lines: int) -> Dict[str, str]:
+    """旧正規表現で2乗時間になる入力（各ケース約 lines 行）"""
+    blank = "\n" * lines
+    indent = "    \n" * lines
+    return {
+        # 終端（空行 + インデントなし行）が見つからない巨大ブロック
+        "purpose_unterminated": "prompt_purpose: |\n" + "    text\n" * lines + "  tail",
+        # `\s*\|\s*\n` の後に空白行が続き、終端もない
+        "purpose_blank_run": "prompt_purpose: |" + indent + "x",
+        # 空白行の連なりに対する行頭 `^\s*-\s+` / `^\s+\w+:` の再走査
+        "blank_lines": "prompt_principles: |\n" + indent + "\n- a\n" + blank + "system_capabilities:" + indent,
+        "question_blank_run": blank + "- \n" + indent + "-x\n" + blank,
+        # 項目数の多い system_capabilities（項目ごとのセクション全体検索）
+        "capabilities_many_items": "system_capabilities:\n" + "".join(
+            f'  item_{i}: "description {i}"\n' for i in range(lines)
+        ),
+        "capabilities_unquoted": "system_capabilities:\n" + "".join(
+            f"  item_{i}: description {i}\n" for i in range(lines)
+        ) + '"',
+        # 区切りのない巨大テンプレートブロックと、コロンを含まない長い行
+        "template_huge": "report_template: |\n" + "  # 見出し\n  本文です\n" * (lines // 2),
+        "template_key_like": "a_template: |\n" + "aaaaaaaaaaaaaaaaaaaa\n" * lines,
+    }
+
+
+def legacy_quality_extracts(content: str) -> Tuple:
+    """旧実装の正規表現による抽出結果（--compare 用）"""
+    block = lambda key: re.search(rf'{key}:\s*\|\s*\n((?:.*\n)*?)(?=\n\S|\Z)', content, re.MULTILINE)
+    purpose = block("prompt_purpose")
+    principles = block("prompt_principles")
+    bullets = len(re.findall(r'^\s*[-•]\s+', principles.group(1).strip(), re.MULTILINE)) if principles else None
+    section = re.search(r'system_capabilities:(.*?)(?=\n#|$)', content, re.DOTALL)
+    items = re.findall(r'^\s+\w+:', section.group(1), re.MULTILINE) if section else []
+    descriptions = {}
+    for item in items:
+        match = re.search(rf'{item.strip()}.*?"([^"]+)"', section.group(1))
+        if match:
+            descriptions[item.strip()] = match.group(1)
+    questions = len(re.findall(r'^\s*-\s+key:\s*', content, re.MULTILINE))
+    templates = [m.group(1) for m in re.finditer(
+        r'^[A-Za-z0-9_]+_template:\s*\|\s*\n(.*?)(?=^[A-Za-z0-9_]+:\s|\Z)', content, re.MULTILINE | re.DOTALL)]
+    return (purpose.group(1) if purpose else None, bullets, items, descriptions, questions, templates)
+
+
+def current_quality_extracts(module, content: str) -> Tuple:
+    """現行実装（LiteralBlockIndex ほか）による抽出結果"""
+    blocks = module.LiteralBlockIndex(content)
+    principles = blocks.block("prompt_principles")
+    bullets = module.count_list_items(principles.strip(), bullets="-•") if principles is not None else None
+    section = blocks.section("system_capabilities")
+    items = module.indented_keys(section) if section is not None else []
+    descriptions = module.quoted_descriptions(section, [item.strip() for item in items]) if items else {}
+    questions = module.count_list_items(content, bullets="-", label="key:")
+    return (blocks.block("prompt_purpose"), bullets, items, descriptions, questions, blocks.template_blocks())
+
+
+def timed(func: Callable[[], object]) -> Tuple[float, object]:
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="validate_rules.py 品質メトリクス検査の回帰ベンチマーク")
+    parser.add_argument("--lines", type=int, default=10000, help="各ケースの行数（デフォルト: 10000）")
+    parser.add_argument("--budget", type=float, default=1.0, help="1ケースあたりの上限秒数（デフォルト: 1.0）")
+    parser.add_argument("--compare", action="store_true",
+                        help="旧正規表現との結果一致と速度差も確認（旧実装は遅いので --lines を小さめに）")
+    args = parser.parse_args()
+
+    module = load_target()
+    failures: List[str] = []
+    print(f"🚀 check_quality_metrics ベンチマーク（{args.lines}行/ケース, 上限 {args.budget:.2f}秒）")
+    for name, content in pathological_cases(args.lines).items():
+        seconds, _ = timed(lambda: module.check_quality_metrics(RULE_NAME, content))
+        line = f"  {name:<26} {seconds:8.4f}s"
+        if args.compare:
+            legacy_seconds, legacy = timed(lambda: legacy_quality_extracts(content))
+            if legacy != current_quality_extracts(module, content):
+                failures.append(f"{name}: 旧正規表現と抽出結果が一致しません")
+            line += f"  (旧実装 {legacy_seconds:8.4f}s)"
+        if seconds > args.budget:
+            failures.append(f"{name}: {seconds:.3f}秒（上限 {args.budget:.2f}秒）")
+        print(line)
+
+    if failures:
+        print("\n❌ 回帰を検出しました:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\n✓ すべてのケースが上限時間内に完了しました")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
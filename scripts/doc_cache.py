@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+ルール・Skill文書（.mdc / SKILL.md / .md）のパース結果キャッシュ
+
+validate_rules.py / lint_mdc_rules.py / lint_skills.py / validate_skills.py / update_agent_master.py
+から共通利用する。pre-commit などで複数ツールを続けて実行しても、未変更ファイルは再パースしない。
+
+- 文書単位: (絶対パス, mtime, サイズ) をキーに本文と共通パース結果を保持
+  （フロントマター生テキスト / YAML / YAMLエラー、本文と開始行、行オフセット、見出し一覧）
+  YAML はフラットな key: value なら PyYAML を使わずにパースする（frontmatter_utils.safe_load_yaml）
+- ツール固有パーサーの結果: (パーサー名 + 定義元スクリプトのハッシュ, 本文ハッシュ) をキーに保持
+- .agent-cache/documents.sqlite に永続化（プロセス終了時に変更した行だけを1トランザクションで書き込む）
+  値は JSON で保存する（タプルはタグ付きで復元。JSON で表せない値はメモリ内のみ）
+
+使用例:
+    doc = load_document(path)
+    doc.frontmatter, doc.frontmatter_error, doc.headings, doc.line_of(offset)
+    sections = derive(path, parse_sections)        # ファイルから
+    fm, body = parse_cached(parse_front_matter, text)  # 既に読み込んだ本文から
+
+無効化: 環境変数 AGENT_DOC_CACHE=0（メモリ内キャッシュのみ）
+保存先の変更: 環境変数 AGENT_CACHE_DIR
+"""
+
+import atexit
+import bisect
+import dataclasses
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from frontmatter_utils import safe_load_yaml, yaml_available
+
+# キャッシュ形式（ParsedDocument の構造・フロントマターの解釈を変えたら上げる）
+CACHE_FORMAT = 3
+CACHE_DIR_NAME = ".agent-cache"
+CACHE_FILE_NAME = "documents.sqlite"
+
+# ツール固有パース結果の保持上限（古いものから破棄）
+MAX_DERIVED_ENTRIES = 5000
+
+# 各ツールと同じフロントマター検出パターン
+FRONT_MATTER_RE = re.compile(r"\A---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    document TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS derived (
+    parser TEXT NOT NULL,
+    sha1 TEXT NOT NULL,
+    used REAL NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (parser, sha1)
+);
+"""
+
+_TUPLE_TAG = "__tuple__"
+
+
+@dataclass
+class ParsedDocument:
+    path: str
+    text: str
+    sha1: str
+    frontmatter_text: Optional[str] = None
+    frontmatter: Any = None
+    frontmatter_error: Optional[str] = None
+    body: str = ""
+    body_line: int = 1  # 本文の開始行（1始まり）
+    line_offsets: List[int] = field(default_factory=list)  # 各行の先頭オフセット
+    headings: List[Tuple[int, int, str]] = field(default_factory=list)  # (行番号, レベル, 見出し)
+
+    @property
+    def lines(self) -> List[str]:
+        return self.text.split("\n")
+
+    def line_of(self, offset: int) -> int:
+        """文字オフセットを行番号（1始まり）に変換"""
+        return bisect.bisect_right(self.line_offsets, offset)
+
+
+def parse_document(path: str, text: str) -> ParsedDocument:
+    """本文から共通パース結果を作る"""
+    doc = ParsedDocument(path=path, text=text, sha1=hashlib.sha1(text.encode("utf-8")).hexdigest())
+
+    match = FRONT_MATTER_RE.match(text)
+    if match:
+        doc.frontmatter_text = match.group(1)
+        doc.body = text[match.end():]
+        doc.body_line = text.count("\n", 0, match.end()) + 1
+        try:
+            doc.frontmatter = safe_load_yaml(doc.frontmatter_text)
+        except ImportError:
+            # PyYAML なしでは高速パスの範囲外の構文は解釈しない（frontmatter / error とも None）
+            pass
+        except Exception as exc:
+            doc.frontmatter_error = str(exc)
+    else:
+        doc.body = text
+
+    offsets = [0]
+    pos = text.find("\n")
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = text.find("\n", pos + 1)
+    doc.line_offsets = offsets
+
+    in_code_block = False
+    for number, line in enumerate(text.split("\n"), 1):
+        if number < doc.body_line:
+            continue
+        if line.lstrip().startswith("```"):
+            in_code_block = not in_code_block
+            continue
+        if in_code_block:
+            continue
+        heading = HEADING_RE.match(line)
+        if heading:
+            doc.headings.append((number, len(heading.group(1)), heading.group(2)))
+    return doc
+
+
+def _encode(value: Any) -> Any:
+    """JSON で保存できる形へ変換（タプルはタグ付き。表せない値は TypeError）"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, tuple):
+        return {_TUPLE_TAG: [_encode(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value) or list(value) == [_TUPLE_TAG]:
+            raise TypeError("dict keys must be str")
+        return {key: _encode(item) for key, item in value.items()}
+    raise TypeError(f"{type(value).__name__} is not cacheable")
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if isinstance(value, dict):
+        if list(value) == [_TUPLE_TAG]:
+            return tuple(_decode(item) for item in value[_TUPLE_TAG])
+        return {key: _decode(item) for key, item in value.items()}
+    return value
+
+
+def _dumps(value: Any) -> Optional[str]:
+    """保存用の JSON 文字列（JSON で表せない値なら None = 永続化しない）"""
+    try:
+        return json.dumps(_encode(value), ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+
+
+_source_hashes: Dict[str, str] = {}
+
+
+def _parser_key(func: Callable) -> str:
+    """パーサーのキー（定義元スクリプトが変われば別キーになる）"""
+    module = sys.modules.get(func.__module__)
+    source = getattr(module, "__file__", None) or func.__module__
+    digest = _source_hashes.get(source)
+    if digest is None:
+        try:
+            digest = hashlib.sha1(Path(source).read_bytes()).hexdigest()[:12]
+        except OSError:
+            digest = "nosource"
+        _source_hashes[source] = digest
+    return f"{Path(source).stem}.{func.__qualname__}@{digest}"
+
+
+class DocumentCache:
+    """文書とパース結果のキャッシュ（cache_file=None ならメモリ内のみ）"""
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        self.cache_file = cache_file
+        self._documents: Dict[str, Tuple[int, int, ParsedDocument]] = {}
+        self._derived: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._dirty_documents: set = set()
+        self._dirty_derived: set = set()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    # ----- 永続化 -----
+
+    def _signature(self) -> str:
+        return f"{CACHE_FORMAT}:{int(yaml_available())}"
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """キャッシュDBへ接続（フォーク後の子プロセスでは接続し直す。失敗時は None = メモリ内のみ）"""
+        if self.cache_file is None:
+            return None
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+        self._conn = None
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.cache_file), timeout=10, isolation_level=None)
+            conn.executescript(_SCHEMA)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+            if row is None or row[0] != self._signature():
+                # 形式が変わったキャッシュは作り直す
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.execute("DELETE FROM documents")
+                    conn.execute("DELETE FROM derived")
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES ('signature', ?)", (self._signature(),))
+        except (OSError, sqlite3.Error):
+            # 壊れた・書き込めないキャッシュは使わない（検証結果には影響させない）
+            self.cache_file = None
+            return None
+        self._conn, self._conn_pid = conn, os.getpid()
+        return conn
+
+    def _load_document(self, key: str) -> Optional[Tuple[int, int, ParsedDocument]]:
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute("SELECT mtime_ns, size, document FROM documents WHERE path = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            return row[0], row[1], ParsedDocument(**_decode(json.loads(row[2])))
+        except (sqlite3.Error, ValueError, TypeError):
+            return None
+
+    def _load_derived(self, key: Tuple[str, str]) -> Optional[Tuple[float, Any]]:
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute("SELECT used, value FROM derived WHERE parser = ? AND sha1 = ?", key).fetchone()
+            return (row[0], _decode(json.loads(row[1]))) if row is not None else None
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def save(self):
+        """変更した行だけをディスクへ書き込む（書き込みロックを取った1トランザクションで行う）"""
+        if not (self._dirty_documents or self._dirty_derived):
+            return
+        conn = self._connect()
+        if conn is None:
+            return
+        documents = []
+        for key in self._dirty_documents:
+            mtime_ns, size, doc = self._documents[key]
+            encoded = _dumps(dataclasses.asdict(doc))
+            if encoded is not None:
+                documents.append((key, mtime_ns, size, encoded))
+        derived = []
+        for key in self._dirty_derived:
+            used, value = self._derived[key]
+            encoded = _dumps(value)
+            if encoded is not None:
+                derived.append((key[0], key[1], used, encoded))
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany("INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)", documents)
+                conn.executemany("INSERT OR REPLACE INTO derived VALUES (?, ?, ?, ?)", derived)
+                count = conn.execute("SELECT COUNT(*) FROM derived").fetchone()[0]
+                if count > MAX_DERIVED_ENTRIES:
+                    conn.execute(
+                        "DELETE FROM derived WHERE rowid IN (SELECT rowid FROM derived ORDER BY used LIMIT ?)",
+                        (count - MAX_DERIVED_ENTRIES,),
+                    )
+        except sqlite3.Error:
+            # キャッシュの保存失敗は検証結果に影響させない
+            return
+        self._dirty_documents.clear()
+        self._dirty_derived.clear()
+
+    def take_changes(self) -> Tuple[Dict, Dict]:
+        """未保存の変更分を取り出す（ワーカープロセスから親プロセスへ渡し、親で1回だけ保存するため）"""
+        documents = {key: self._documents[key] for key in self._dirty_documents}
+        derived = {key: self._derived[key] for key in self._dirty_derived}
+        self._dirty_documents.clear()
+        self._dirty_derived.clear()
+        return documents, derived
+
+    def merge_changes(self, changes: Tuple[Dict, Dict]):
+        """take_changes の結果を取り込む（次の save で書き込まれる）"""
+        documents, derived = changes
+        self._documents.update(documents)
+        self._derived.update(derived)
+        self._dirty_documents.update(documents)
+        self._dirty_derived.update(derived)
+
+    # ----- 参照 -----
+
+    def get(self, path) -> ParsedDocument:
+        """文書を返す（未変更なら再読込・再パースしない）。読み込み失敗時は OSError / UnicodeDecodeError"""
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        entry = self._documents.get(key)
+        if entry is None:
+            entry = self._load_document(key)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            self._documents[key] = entry
+            self.hits += 1
+            return entry[2]
+
+        self.misses += 1
+        text = Path(key).read_text(encoding="utf-8")
+        doc = parse_document(key, text)
+        self._documents[key] = (stat.st_mtime_ns, stat.st_size, doc)
+        self._dirty_documents.add(key)
+        return doc
+
+    def _derive(self, func: Callable[[str], Any], text: str, sha1: str) -> Any:
+        key = (_parser_key(func), sha1)
+        entry = self._derived.get(key)
+        if entry is None:
+            entry = self._load_derived(key)
+        if entry is not None:
+            self._derived[key] = entry
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = func(text)
+        self._derived[key] = (time.time(), value)
+        self._dirty_derived.add(key)
+        return value
+
+    def derive(self, path, func: Callable[[str], Any]) -> Any:
+        """ファイル本文に func を適用した結果を返す（本文とパーサーが同じなら再計算しない）
+
+        戻り値はキャッシュと共有されるため、呼び出し側で変更しないこと。
+        """
+        doc = self.get(path)
+        return self._derive(func, doc.text, doc.sha1)
+
+    def parse_cached(self, func: Callable[[str], Any], text: str) -> Any:
+        """読み込み済みの本文に func を適用した結果を返す"""
+        return self._derive(func, text, hashlib.sha1(text.encode("utf-8")).hexdigest())
+
+
+def find_cache_dir(start: Optional[Path] = None) -> Path:
+    """キャッシュ置き場（AGENT_CACHE_DIR、なければ git ルート or カレントの .agent-cache）"""
+    override = os.environ.get("AGENT_CACHE_DIR")
+    if override:
+        return Path(override)
+    current = (start or Path.cwd()).resolve()
+    for parent in [current] + list(current.parents):
+        if (parent / ".git").exists():
+            return parent / CACHE_DIR_NAME
+    return current / CACHE_DIR_NAME
+
+
+_default_cache: Optional[DocumentCache] = None
+
+
+def get_cache() -> DocumentCache:
+    """プロセス共通のキャッシュを返す（終了時に自動保存）"""
+    global _default_cache
+    if _default_cache is None:
+        enabled = os.environ.get("AGENT_DOC_CACHE", "1").lower() not in ("0", "off", "false", "no")
+        cache_file = find_cache_dir() / CACHE_FILE_NAME if enabled else None
+        _default_cache = DocumentCache(cache_file)
+        atexit.register(_default_cache.save)
+    return _default_cache
+
+
+def load_document(path) -> ParsedDocument:
+    return get_cache().get(path)
+
+
+def derive(path, func: Callable[[str], Any]) -> Any:
+    return get_cache().derive(path, func)
+
+
+def parse_cached(func: Callable[[str], Any], text: str) -> Any:
+    return get_cache().parse_cached(func, text)
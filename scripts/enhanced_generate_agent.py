@@ -13,19 +13,241 @@ Usage:
     
     # 完全カスタム（対話形式）
     python enhanced_generate_agent.py --interactive
+
+    # テンプレートスナップショットを使わず毎回直接コピー
+    python enhanced_generate_agent.py --preset babok --no-template-cache
+
+    # 複数エージェントを1プロセスで並列生成（サマリーレポート付き）
+    python enhanced_generate_agent.py --batch configs.yaml --jobs 8 --overwrite
 """
 
 import os
 import sys
 import re
 import shutil
+import hashlib
 import argparse
-import yaml
 import json
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional
 from dataclasses import dataclass, field
 
+from frontmatter_utils import FrontMatter, edit_frontmatter_files, safe_load_yaml
+
+# テンプレートスナップショット（template/<name> の正規化済みコピー）の保存先のディレクトリ名。
+# リポジトリ内に置くと Lint の対象になるため、ユーザーキャッシュ（または $AGENT_CACHE_DIR）配下に置く
+TEMPLATE_CACHE_DIR = "template_snapshots"
+# 旧バージョンがリポジトリ内に作っていた保存先（見つけたら削除する）
+LEGACY_TEMPLATE_CACHE_DIR = Path(".agent-cache") / "template_snapshots"
+# スナップショットの構造・正規化ロジックを変えたら上げる（キャッシュキーに含まれる）
+TEMPLATE_SNAPSHOT_FORMAT = 3
+# 同一テンプレートについて保持するスナップショット数
+TEMPLATE_SNAPSHOT_KEEP = 3
+# スナップショットからの展開方式
+LINK_MODES = ("copy", "reflink", "hardlink")
+
+# マニフェストなしの場合に既定でコピーするディレクトリ（cursor_bank除外）
+DEFAULT_COPY_TARGETS = [
+    {"path": ".claude", "type": "dir"},
+    {"path": "scripts", "type": "dir"},
+    {"path": ".cursor/templates", "type": "dir"},
+    {"path": ".gitignore", "type": "file"}
+]
+
+# Linux の FICLONE ioctl（btrfs/XFS 等でのreflink）
+_FICLONE = 0x40049409
+_reflink_supported: Optional[bool] = None
+
+
+def _reflink_file(src: str, dst: str) -> None:
+    """src を dst へ reflink（copy-on-write）で複製する。非対応なら OSError"""
+    import fcntl
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    shutil.copystat(src, dst)
+
+
+def _make_copy_function(link_mode: str):
+    """copytree 用のファイル複製関数を返す（非対応環境では copy2 にフォールバック）"""
+    if link_mode == "hardlink":
+        def _hardlink(src, dst):
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copy2(src, dst)
+            return dst
+        return _hardlink
+
+    if link_mode == "reflink" and sys.platform.startswith("linux"):
+        def _reflink(src, dst):
+            global _reflink_supported
+            if _reflink_supported is not False:
+                try:
+                    _reflink_file(src, dst)
+                    _reflink_supported = True
+                    return dst
+                except OSError:
+                    # 同一プロセス内では以後 reflink を試さない
+                    _reflink_supported = False
+            shutil.copy2(src, dst)
+            return dst
+        return _reflink
+
+    return shutil.copy2
+
+
+def template_cache_root() -> Path:
+    """スナップショットの保存先（$AGENT_CACHE_DIR、なければ ~/.cache/agent_template）"""
+    override = os.environ.get("AGENT_CACHE_DIR")
+    base = Path(override).expanduser() if override else Path.home() / ".cache" / "agent_template"
+    return base / TEMPLATE_CACHE_DIR
+
+
+def _write_text(path: Path, content: str) -> None:
+    """生成ファイルを書き込む（hardlink で展開したファイルはリンクを切ってから書き、スナップショットを汚さない）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        if path.stat().st_nlink > 1:
+            path.unlink()
+    except FileNotFoundError:
+        pass
+    path.write_text(content, encoding='utf-8')
+
+
+def _snapshot_file_stats(files_root: Path) -> Dict[str, List[int]]:
+    """スナップショット内の各ファイルの (サイズ, 更新時刻)。展開先経由の書き換え検出に使う"""
+    stats: Dict[str, List[int]] = {}
+    for dirpath, dirnames, filenames in os.walk(files_root):
+        for name in filenames:
+            path = Path(dirpath) / name
+            st = path.stat()
+            stats[path.relative_to(files_root).as_posix()] = [st.st_size, st.st_mtime_ns]
+    return stats
+
+
+def _iter_template_files(template_root: Path, rel_paths: List[str]):
+    """キャッシュキー算出対象のファイルを (相対パス, Path) で安定順に列挙"""
+    for rel in rel_paths:
+        src = template_root / rel
+        if src.is_file():
+            yield rel, src
+            continue
+        if not src.is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(src):
+            dirnames.sort()
+            for name in sorted(filenames):
+                path = Path(dirpath) / name
+                yield path.relative_to(template_root).as_posix(), path
+
+
+class BufferedWriter:
+    """生成ファイルをメモリに溜め、最後にまとめて書き出すライター（スレッドセーフ）"""
+
+    def __init__(self):
+        self._pending: Dict[Path, str] = {}
+        self._lock = threading.Lock()
+
+    def write_text(self, path: Path, content: str):
+        with self._lock:
+            self._pending[Path(path)] = content
+
+    def read_text(self, path: Path) -> str:
+        """未書き出しの内容があればそれを、なければディスクの内容を返す"""
+        with self._lock:
+            pending = self._pending.get(Path(path))
+        if pending is not None:
+            return pending
+        return Path(path).read_text(encoding='utf-8')
+
+    def exists(self, path: Path) -> bool:
+        with self._lock:
+            if Path(path) in self._pending:
+                return True
+        return Path(path).exists()
+
+    def flush(self) -> int:
+        """溜めた内容をディスクへ書き出し、書き出した件数を返す"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for path in sorted(pending):
+            _write_text(path, pending[path])
+        return len(pending)
+
+
+@dataclass
+class PipelineStage:
+    name: str
+    func: Callable[[], Any]
+    depends_on: List[str] = field(default_factory=list)
+    done_message: str = ""
+    seconds: float = 0.0
+    status: str = "pending"  # pending / done / failed
+
+
+class StagePipeline:
+    """依存関係（DAG）に従ってステージを実行し、独立したステージは並列に走らせる"""
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max(1, max_workers)
+        self.stages: Dict[str, PipelineStage] = {}
+
+    def add(self, name: str, func: Callable[[], Any], depends_on: List[str] = None, done_message: str = ""):
+        if name in self.stages:
+            raise ValueError(f"Duplicated stage: {name}")
+        for dep in depends_on or []:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        self.stages[name] = PipelineStage(name, func, list(depends_on or []), done_message)
+        return self
+
+    def run(self):
+        """全ステージを実行する。失敗したステージがあれば最初の例外を送出する"""
+        remaining = dict(self.stages)
+        finished = set()
+        running = {}
+
+        def timed(stage: PipelineStage):
+            started = time.perf_counter()
+            try:
+                return stage.func()
+            finally:
+                stage.seconds = time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while remaining or running:
+                for name, stage in list(remaining.items()):
+                    if all(dep in finished for dep in stage.depends_on):
+                        del remaining[name]
+                        # print 出力の振り分け（バッチ生成時）を引き継ぐためコンテキストごと実行
+                        ctx = contextvars.copy_context()
+                        running[executor.submit(ctx.run, timed, stage)] = stage
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        stage.status = "failed"
+                        for pending in running:
+                            pending.cancel()
+                        raise error
+                    stage.status = "done"
+                    finished.add(stage.name)
+                    if stage.done_message:
+                        print(stage.done_message)
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """ステージグラフ（依存・所要時間・状態）を返す"""
+        return [
+            {"stage": s.name, "depends_on": s.depends_on, "seconds": round(s.seconds, 4), "status": s.status}
+            for s in self.stages.values()
+        ]
+
 @dataclass
 class AgentConfig:
     agent_name: str = "Custom"
@@ -42,27 +264,29 @@ class AgentConfig:
         if not isinstance(self.directory_structure, dict):
             raise ValueError("Directory structure must be a dictionary")
 
-def get_agent_config(preset: str) -> AgentConfig:
-    """事前定義された設定を取得"""
-    presets = {
-        "babok": AgentConfig(
-            agent_name="BABOK",
-            domain="babok", 
-            description="Business Analysis Body of Knowledge Agent"
-        ),
-        "knowledge": AgentConfig(
-            agent_name="Knowledge",
-            domain="knowledge",
-            description="Knowledge Management Agent"
-        )
-    }
-    if preset not in presets:
+# 事前定義の設定（プリセットが指定する項目のみ。残りは AgentConfig の既定値）
+AGENT_PRESETS: Dict[str, Dict[str, Any]] = {
+    "babok": {
+        "agent_name": "BABOK",
+        "domain": "babok",
+        "description": "Business Analysis Body of Knowledge Agent",
+    },
+    "knowledge": {
+        "agent_name": "Knowledge",
+        "domain": "knowledge",
+        "description": "Knowledge Management Agent",
+    },
+}
+
+def get_agent_config(preset: str, defaults: Optional[Dict[str, Any]] = None) -> AgentConfig:
+    """事前定義された設定を取得（defaults はプリセットが指定しない項目にだけ適用）"""
+    if preset not in AGENT_PRESETS:
         raise ValueError(f"Unknown preset: {preset}")
-    return presets[preset]
+    return AgentConfig(**{**(defaults or {}), **AGENT_PRESETS[preset]})
 
 def list_available_configs() -> List[str]:
     """利用可能な設定プリセットのリストを返す"""
-    return ["babok", "knowledge"]
+    return list(AGENT_PRESETS)
 
 def create_custom_agent_config(agent_name: str, domain: str, description: str) -> AgentConfig:
     """カスタム設定を作成"""
@@ -72,23 +296,102 @@ def create_custom_agent_config(agent_name: str, domain: str, description: str) -
         description=description
     )
 
+def load_batch_configs(batch_file: str) -> List[AgentConfig]:
+    """バッチ定義（YAML/JSON）からAgentConfigのリストを作成
+
+    形式:
+        defaults:            # 任意。各エージェント（preset / config_file 指定も含む）にマージされる
+          directory_structure: {model: flow_stock}
+        agents:
+          - {agent_name: Legal, domain: legal, description: "..."}
+          - {preset: babok, description: "..."}
+          - {config_file: legal_config.yaml}
+
+    優先度（後ろほど強い）: defaults < preset / config_file の内容 < エントリに書いた項目
+
+    トップレベルがリストの場合は agents として扱う。
+    """
+    batch_path = Path(batch_file)
+    with open(batch_path, 'r', encoding='utf-8') as f:
+        if batch_path.suffix in ('.yaml', '.yml'):
+            data = safe_load_yaml(f.read())
+        else:
+            data = json.load(f)
+
+    if isinstance(data, list):
+        data = {"agents": data}
+    if not isinstance(data, dict) or not isinstance(data.get("agents"), list):
+        raise ValueError(f"Batch file must define an 'agents' list: {batch_file}")
+
+    defaults = data.get("defaults") or {}
+    configs: List[AgentConfig] = []
+    for idx, entry in enumerate(data["agents"], 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Batch entry #{idx} must be a mapping")
+        entry = dict(entry)
+        if "preset" in entry:
+            config = get_agent_config(entry.pop("preset"), defaults)
+        elif "config_file" in entry:
+            config_file = batch_path.parent / entry.pop("config_file")
+            with open(config_file, 'r', encoding='utf-8') as f:
+                loaded = safe_load_yaml(f.read()) if config_file.suffix in ('.yaml', '.yml') else json.load(f)
+            config = AgentConfig(**{**defaults, **loaded})
+        else:
+            config = AgentConfig(**{**defaults, **entry})
+            entry = {}
+        # preset/config_file 指定時の残りキーは上書きとして適用
+        for key, value in entry.items():
+            if not hasattr(config, key):
+                raise ValueError(f"Batch entry #{idx}: unknown field '{key}'")
+            setattr(config, key, value)
+        configs.append(config)
+
+    domains = [c.domain for c in configs]
+    duplicated = sorted({d for d in domains if domains.count(d) > 1})
+    if duplicated:
+        raise ValueError(f"Duplicated domains in batch: {', '.join(duplicated)}")
+    return configs
+
+
 class EnhancedAgentGenerator:
-    def __init__(self, template_dir: str, output_base_dir: str):
+    def __init__(self, template_dir: str, output_base_dir: str,
+                 use_template_cache: bool = True, link_mode: str = "reflink",
+                 template_snapshot: Optional[Path] = None, render_workers: int = 4):
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"Unknown link mode: {link_mode} (choose from {', '.join(LINK_MODES)})")
         self.template_dir = Path(template_dir)
         self.output_base_dir = Path(output_base_dir)
         self.config: AgentConfig = None
         self.agent_dir: Path = None
         self.template_rules_copied: bool = False
+        # generate_essential_rules が今回 00_master_rules.mdc を書いたか（共通ルール生成の条件）
+        self.essential_rules_generated: bool = False
+        self.use_template_cache = use_template_cache
+        self.link_mode = link_mode
+        # テンプレート名 → (stat指紋, スナップショットパス)。同一プロセス内の再計算を避ける
+        self._snapshot_memo: Dict[str, Any] = {}
+        # 解決済みスナップショット（バッチ生成時に共有。指定時はテンプレートの再走査を行わない）
+        self.template_snapshot = Path(template_snapshot) if template_snapshot else None
+        # レンダリング段の出力先（generate_agent 実行中のみ BufferedWriter、それ以外は直接書き込み）
+        self.writer: Optional[BufferedWriter] = None
+        self.pipeline: Optional[StagePipeline] = None
+        self.render_workers = render_workers
         
     def generate_agent(self, preset: str = None, config_file: str = None, interactive: bool = False,
                          agent_name: str = None, domain: str = None, description: str = None,
-                         dir_model: str = 'flow_stock'):
-        """エージェント生成のメインフロー"""
+                         dir_model: str = 'flow_stock', config: AgentConfig = None,
+                         overwrite: Optional[bool] = None):
+        """エージェント生成のメインフロー
+
+        overwrite: 既存ディレクトリの扱い（None=確認する / True=上書き / False=スキップ）
+        """
         print("🚀 Starting Enhanced Agent Generation...")
 
         try:
             # 1. 設定のロードまたは対話的作成
-            if interactive:
+            if config is not None:
+                self.config = config
+            elif interactive:
                 self.interactive_config()
             else:
                 self.load_config(preset, config_file, agent_name, domain, description, dir_model)
@@ -103,8 +406,10 @@ class EnhancedAgentGenerator:
             
             # 既存ディレクトリのチェック
             if self.agent_dir.exists():
-                response = input(f"⚠️  Directory {self.agent_dir} already exists. Overwrite? (y/n): ")
-                if response.lower() != 'y':
+                if overwrite is None:
+                    response = input(f"⚠️  Directory {self.agent_dir} already exists. Overwrite? (y/n): ")
+                    overwrite = response.lower() == 'y'
+                if not overwrite:
                     print("Aborted.")
                     return None
                     
@@ -122,21 +427,15 @@ class EnhancedAgentGenerator:
             self.generate_automation_scripts()
             print("✓ Automation scripts generated/copied.")
 
-            # 6. 必須ルールファイルの生成
-            self.generate_essential_rules()
-            print("✓ Essential rules ready in .cursor/rules.")
-            
-            # 7. ドメイン固有ルールの生成
-            self.generate_domain_specific_rules()
-            print("✓ Domain-specific rules generated.")
-            
-            # 7. root.mdの生成
-            self.generate_root_md()
-            print("✓ root.md generated for agent.")
-            
-            # 8. README.mdの生成
-            self.generate_readme()
-            print("✓ README.md generated for agent.")
+            # 6〜8. ルール・root.md・README.md のレンダリング（依存関係に従い並列実行し、最後に一括書き出し）
+            self.writer = BufferedWriter()
+            try:
+                self.pipeline = self.build_render_pipeline()
+                self.pipeline.run()
+                written = self.writer.flush()
+            finally:
+                self.writer = None
+            print(f"✓ Rendered outputs written ({written} files).")
 
             print("\n🎉 Enhanced Agent Generation Completed Successfully!")
             return self.agent_dir
@@ -145,6 +444,37 @@ class EnhancedAgentGenerator:
             print(f"\n❌ Error during agent generation: {e}")
             raise
 
+    def build_render_pipeline(self) -> StagePipeline:
+        """レンダリング段のステージグラフを構築する
+
+        essential_rules → common_rules の順序のみ依存があり、他は独立して並列実行される。
+        """
+        pipeline = StagePipeline(max_workers=self.render_workers)
+        pipeline.add("essential_rules", self.generate_essential_rules,
+                     done_message="✓ Essential rules ready in .cursor/rules.")
+        pipeline.add("common_rules", self.generate_common_rules, depends_on=["essential_rules"],
+                     done_message="✓ Common rules ready in .cursor/rules.")
+        pipeline.add("domain_rules", self.generate_domain_specific_rules,
+                     done_message="✓ Domain-specific rules generated.")
+        pipeline.add("root_md", self.generate_root_md,
+                     done_message="✓ root.md generated for agent.")
+        pipeline.add("readme", self.generate_readme,
+                     done_message="✓ README.md generated for agent.")
+        return pipeline
+
+    def _write_output(self, path: Path, content: str):
+        """生成物を書き出す（パイプライン実行中はバッファへ）"""
+        if self.writer is not None:
+            self.writer.write_text(path, content)
+        else:
+            _write_text(path, content)
+
+    def _essential_rules_present(self) -> bool:
+        target_rules_dir = self.agent_dir / ".cursor" / "rules"
+        master = target_rules_dir / "00_master_rules.mdc"
+        exists = self.writer.exists(master) if self.writer is not None else master.exists()
+        return self.template_rules_copied or exists
+
     def load_config(self, preset: str = None, config_file: str = None, 
                    agent_name: str = None, domain: str = None, description: str = None,
                    dir_model: str = 'flow_stock') -> AgentConfig:
@@ -156,7 +486,7 @@ class EnhancedAgentGenerator:
         elif config_file:
             with open(config_file, 'r', encoding='utf-8') as f:
                 if config_file.endswith('.yaml') or config_file.endswith('.yml'):
-                    config_data = yaml.safe_load(f)
+                    config_data = safe_load_yaml(f.read())
                 else:
                     config_data = json.load(f)
             self.config = self._dict_to_config(config_data)
@@ -322,9 +652,9 @@ class EnhancedAgentGenerator:
 
     def generate_essential_rules(self):
         target_rules_dir = self.agent_dir / ".cursor" / "rules"
-        target_rules_dir.mkdir(parents=True, exist_ok=True)
-        # テンプレ側ルールをコピー済みなら生成をスキップ
-        if self.template_rules_copied or (target_rules_dir / "00_master_rules.mdc").exists():
+        self.essential_rules_generated = False
+        # テンプレ側ルールをコピー済み、または既存なら生成をスキップ
+        if self._essential_rules_present():
             print("✓ Essential rules detected from template. Generation skipped.")
             return
         
@@ -428,11 +758,20 @@ meta:
   domain: "{domain}"
 """
         
-        (target_rules_dir / "00_master_rules.mdc").write_text(master_rules_content, encoding='utf-8')
-        (target_rules_dir / f"{domain}_paths.mdc").write_text(paths_content, encoding='utf-8')
-        
-        # 他の必須ルール
-        self._generate_common_rules(target_rules_dir, domain, agent_name)
+        self._write_output(target_rules_dir / "00_master_rules.mdc", master_rules_content)
+        self._write_output(target_rules_dir / f"{domain}_paths.mdc", paths_content)
+        self.essential_rules_generated = True
+
+        # パイプライン外から呼ばれた場合は他の必須ルールも続けて生成
+        if self.pipeline is None:
+            self._generate_common_rules(target_rules_dir, domain, agent_name)
+
+    def generate_common_rules(self):
+        """必須ルールを生成した場合のみ 90/97/98/99 の共通ルールを生成"""
+        # 00_master_rules.mdc がテンプレ由来・既存の場合は共通ルールも既存のものを使う
+        if not self.essential_rules_generated:
+            return
+        self._generate_common_rules(self.agent_dir / ".cursor" / "rules", self.config.domain, self.config.agent_name)
     
     def generate_domain_specific_rules(self):
         """ドメイン固有ルールを生成しない（01〜のファイルは作成しない）"""
@@ -497,10 +836,10 @@ maintain_rules:
   template_reference: "templates/common_templates.mdc => rule_maintenance_template"
 """
         
-        (target_dir / "90_task_management.mdc").write_text(task_mgmt, encoding='utf-8')
-        (target_dir / "97_flow_to_stock_rules.mdc").write_text(flow_stock, encoding='utf-8')
-        (target_dir / "98_flow_assist.mdc").write_text(flow_assist, encoding='utf-8')
-        (target_dir / "99_rule_maintenance.mdc").write_text(rule_maint, encoding='utf-8')
+        self._write_output(target_dir / "90_task_management.mdc", task_mgmt)
+        self._write_output(target_dir / "97_flow_to_stock_rules.mdc", flow_stock)
+        self._write_output(target_dir / "98_flow_assist.mdc", flow_assist)
+        self._write_output(target_dir / "99_rule_maintenance.mdc", rule_maint)
     
     def generate_root_md(self):
         """エージェント用のroot.mdを生成"""
@@ -554,9 +893,7 @@ version: v1.0
         
         # 追加ファイルをscripts配下に増やさない方針に合わせ、
         # root.mdはエージェント直下に出力する。
-        root_file = self.agent_dir / "root.md"
-        with open(root_file, 'w', encoding='utf-8') as f:
-            f.write(root_content)
+        self._write_output(self.agent_dir / "root.md", root_content)
     
     def _generate_specialized_features(self) -> str:
         """ドメイン特化機能の説明を生成"""
@@ -587,7 +924,7 @@ version: v1.0
         for script_name in ["convert_md_to_mdc.py", "convert_mdc_to_md.py"]:
             script_path = scripts_dir / script_name
             if script_path.exists():
-                content = script_path.read_text(encoding='utf-8')
+                content = self.writer.read_text(script_path) if self.writer is not None else script_path.read_text(encoding='utf-8')
                 
                 # root.mdの参照を修正（相対パスに）
                 content = content.replace(
@@ -601,7 +938,7 @@ version: v1.0
                     f'# {self.config.agent_name} Agent - {"MD to MDC" if "md_to_mdc" in script_name else "MDC to MD"} Conversion Script'
                 )
                 
-                script_path.write_text(content, encoding='utf-8')
+                self._write_output(script_path, content)
     
     def generate_readme(self):
         """エージェント用のREADME.mdを生成"""
@@ -665,9 +1002,7 @@ cd {domain}_agent
 [貢献ガイドラインを追加]
 '''
         
-        readme_file = self.agent_dir / "README.md"
-        with open(readme_file, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
+        self._write_output(self.agent_dir / "README.md", readme_content)
     
     def _generate_trigger_examples(self) -> str:
         """ドメイン特有のトリガー例を生成"""
@@ -682,29 +1017,58 @@ cd {domain}_agent
             return f"- `{self.config.domain}初期化`: プロジェクトをセットアップ"
 
     def copy_from_template_manifest(self, template_name: str = "agent_base"):
-        """template/<name>/MANIFEST.yaml を読み取り、記載の資材をコピー"""
-        template_root = self.template_dir / "template" / template_name
-        manifest_path = template_root / "MANIFEST.yaml"
+        """template/<name>/MANIFEST.yaml を読み取り、記載の資材をコピー
+
+        既定ではテンプレート内容のハッシュをキーにした正規化済みスナップショットを
+        ユーザーキャッシュ（`~/.cache/agent_template/template_snapshots/`、$AGENT_CACHE_DIR で変更可）に
+        作成（初回のみ）し、そこから展開する。
+        """
+        if not self.use_template_cache:
+            self._copy_template_direct(template_name)
+            return
+
+        if self.template_snapshot is not None:
+            self._materialize_snapshot(self.template_snapshot)
+            return
 
-        # フォールバック: マニフェストなしなら既定のディレクトリをコピー（cursor_bank除外）
-        copy_targets = [
-            {"path": ".claude", "type": "dir"},
-            {"path": "scripts", "type": "dir"},
-            {"path": ".cursor/templates", "type": "dir"}
-        ]
+        try:
+            snapshot_dir = self._ensure_template_snapshot(template_name)
+        except Exception as e:
+            print(f"⚠️  Warning: Template snapshot unavailable ({e}). Falling back to direct copy.")
+            self._copy_template_direct(template_name)
+            return
+        self._materialize_snapshot(snapshot_dir)
+
+    def _load_copy_targets(self, template_root: Path) -> List[Dict[str, Any]]:
+        """MANIFEST.yaml の copy_targets を返す（なければ既定値）"""
+        manifest_path = template_root / "MANIFEST.yaml"
+        copy_targets = DEFAULT_COPY_TARGETS
         try:
             if manifest_path.exists():
                 with open(manifest_path, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f) or {}
+                    data = safe_load_yaml(f.read()) or {}
                     copy_targets = data.get('copy_targets', copy_targets)
         except Exception as e:
             print(f"⚠️  Warning: Failed to read manifest {manifest_path}: {e}. Using defaults.")
-
+        return copy_targets
+
+    def _resolve_rules_source(self, template_root: Path) -> Optional[Path]:
+        """テンプレのルール実体の場所（.cursor/templates/rules → .cursor/rules の順）"""
+        for rules_src in (template_root / ".cursor" / "templates" / "rules",
+                          template_root / ".cursor" / "rules"):
+            if rules_src.exists():
+                return rules_src
+        return None
+
+    def _copy_template_entries(self, template_root: Path, dest_root: Path,
+                               copy_targets: List[Dict[str, Any]], copy_function=shutil.copy2) -> List[str]:
+        """copy_targets を dest_root 配下へコピーし、コピーできた相対パスを返す"""
+        copied = []
         for entry in copy_targets:
             rel = entry.get('path')
             etype = entry.get('type', 'dir')
             src = template_root / rel
-            dst = self.agent_dir / rel
+            dst = dest_root / rel
             try:
                 if not src.exists():
                     print(f"⚠️  Skipped: template path not found: {src}")
@@ -716,62 +1080,350 @@ cd {domain}_agent
                     else:
                         dst.unlink()
                 if etype == 'dir':
-                    shutil.copytree(src, dst)
+                    shutil.copytree(src, dst, copy_function=copy_function)
                 else:
                     dst.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(src, dst)
+                    copy_function(src, dst)
+                copied.append(rel)
                 print(f"✓ Copied from template: {rel}")
             except Exception as e:
                 print(f"⚠️  Warning: Could not copy {rel} from template: {e}")
+        return copied
+
+    def _copy_template_rules(self, rules_src: Path, rules_dst: Path, copy_function=shutil.copy2) -> bool:
+        """テンプレのルール実体を rules_dst に配置（既存は置換）"""
+        try:
+            if rules_dst.exists():
+                shutil.rmtree(rules_dst)
+            shutil.copytree(rules_src, rules_dst, copy_function=copy_function)
+            print(f"✓ Copied rules from template: {rules_src} -> {rules_dst}")
+            return True
+        except Exception as e:
+            print(f"⚠️  Warning: Could not copy rules dir: {e}")
+            return False
+
+    def _copy_template_direct(self, template_name: str = "agent_base"):
+        """スナップショットを使わずテンプレートから直接コピー（従来動作）"""
+        template_root = self.template_dir / "template" / template_name
+        copy_targets = self._load_copy_targets(template_root)
+        self._copy_template_entries(template_root, self.agent_dir, copy_targets)
 
         # 追加: テンプレのルール実体がある場合は .cursor/rules に配置
+        rules_src = self._resolve_rules_source(template_root)
         rules_dst = self.agent_dir / ".cursor" / "rules"
-        primary_rules_src = template_root / ".cursor" / "templates" / "rules"
-        fallback_rules_src = template_root / ".cursor" / "rules"
+        if rules_src and self._copy_template_rules(rules_src, rules_dst):
+            self.template_rules_copied = True
+            self._normalize_rule_flags(rules_dst)
+
+    def _template_fingerprint(self, template_root: Path, rel_paths: List[str], content: bool) -> str:
+        """テンプレート資材の指紋（content=False なら stat、True なら内容ハッシュ）"""
+        digest = hashlib.sha256(f"format={TEMPLATE_SNAPSHOT_FORMAT}\n".encode())
+        for rel, path in _iter_template_files(template_root, rel_paths):
+            digest.update(rel.encode('utf-8') + b"\0")
+            if content:
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(chunk)
+            else:
+                st = path.stat()
+                digest.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
 
-        rules_sources = [primary_rules_src, fallback_rules_src]
-        for rules_src in rules_sources:
-            if not rules_src.exists():
-                continue
-            try:
-                if rules_dst.exists():
-                    shutil.rmtree(rules_dst)
-                shutil.copytree(rules_src, rules_dst)
-                self.template_rules_copied = True
+    def _ensure_template_snapshot(self, template_name: str) -> Path:
+        """テンプレート内容に対応するスナップショットを返す（なければ作成）"""
+        template_root = self.template_dir / "template" / template_name
+        if not template_root.exists():
+            raise FileNotFoundError(f"template not found: {template_root}")
+        cache_root = template_cache_root()
+        legacy_root = self.template_dir / LEGACY_TEMPLATE_CACHE_DIR
+        if legacy_root.is_dir():
+            # リポジトリ内の旧スナップショットは Lint 対象になるため片付ける
+            shutil.rmtree(legacy_root, ignore_errors=True)
+            print(f"✓ Removed legacy template snapshots: {legacy_root}")
+        copy_targets = self._load_copy_targets(template_root)
+        rules_src = self._resolve_rules_source(template_root)
+
+        key_paths = [entry.get('path') for entry in copy_targets] + ["MANIFEST.yaml"]
+        if rules_src:
+            key_paths.append(rules_src.relative_to(template_root).as_posix())
+
+        # stat指紋が変わっていなければ内容ハッシュを再計算しない
+        stat_key = self._template_fingerprint(template_root, key_paths, content=False)
+        memo = self._snapshot_memo.get(template_name)
+        if memo and memo[0] == stat_key and memo[1].exists():
+            return memo[1]
+
+        index_path = cache_root / "index.json"
+        index: Dict[str, Any] = {}
+        try:
+            index = json.loads(index_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            index = {}
+        # 保存先は複数のチェックアウトで共有するため、テンプレートの絶対パスごとに記録する
+        index_key = str(template_root.resolve())
+        indexed = index.get(index_key, {})
+        if indexed.get("stat_key") == stat_key:
+            content_hash = indexed.get("content_hash")
+        else:
+            content_hash = self._template_fingerprint(template_root, key_paths, content=True)
+
+        snapshot_dir = cache_root / f"{template_name}-{content_hash[:16]}"
+        if (snapshot_dir / "snapshot.json").exists() and not self._snapshot_intact(snapshot_dir):
+            # hardlink 展開先を編集ソフトが上書きした等でスナップショットが変わっている
+            print(f"⚠️  Warning: Template snapshot {snapshot_dir.name} was modified. Rebuilding.")
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+        if not (snapshot_dir / "snapshot.json").exists():
+            self._build_template_snapshot(template_root, snapshot_dir, copy_targets, rules_src, content_hash)
+            self._prune_template_snapshots(cache_root, template_name, keep=snapshot_dir)
+        else:
+            print(f"✓ Using template snapshot: {snapshot_dir.name}")
+
+        index[index_key] = {"stat_key": stat_key, "content_hash": content_hash}
+        cache_root.mkdir(parents=True, exist_ok=True)
+        tmp_index = index_path.with_name(f"index.json.{os.getpid()}.tmp")
+        tmp_index.write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding='utf-8')
+        os.replace(tmp_index, index_path)
+
+        self._snapshot_memo[template_name] = (stat_key, snapshot_dir)
+        return snapshot_dir
+
+    def _build_template_snapshot(self, template_root: Path, snapshot_dir: Path,
+                                 copy_targets: List[Dict[str, Any]], rules_src: Optional[Path],
+                                 content_hash: str):
+        """テンプレートをコピー・正規化したスナップショットを作成（一時ディレクトリ経由で原子的に配置）"""
+        print(f"🧊 Building template snapshot: {snapshot_dir.name}")
+        staging = snapshot_dir.with_name(f".{snapshot_dir.name}.{os.getpid()}.tmp")
+        if staging.exists():
+            shutil.rmtree(staging)
+        files_root = staging / "files"
+        files_root.mkdir(parents=True)
+
+        entries = self._copy_template_entries(template_root, files_root, copy_targets)
+        has_rules = False
+        if rules_src:
+            rules_dst = files_root / ".cursor" / "rules"
+            if self._copy_template_rules(rules_src, rules_dst):
+                # alwaysApply の正規化はスナップショット作成時に一度だけ行う
                 self._normalize_rule_flags(rules_dst)
-                print(f"✓ Copied rules from template: {rules_src} -> {rules_dst}")
-                break
-            except Exception as e:
-                print(f"⚠️  Warning: Could not copy rules dir: {e}")
+                has_rules = True
+
+        meta = {
+            "format": TEMPLATE_SNAPSHOT_FORMAT,
+            "template": template_root.name,
+            "content_hash": content_hash,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "entries": [
+                {"path": entry.get('path'), "type": entry.get('type', 'dir')}
+                for entry in copy_targets if entry.get('path') in entries
+            ],
+            "rules": has_rules,
+            "files": _snapshot_file_stats(files_root),
+        }
+        (staging / "snapshot.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding='utf-8')
+
+        try:
+            os.replace(staging, snapshot_dir)
+        except OSError:
+            # 並行生成で先に作成された場合はそちらを使う
+            shutil.rmtree(staging, ignore_errors=True)
+            if not (snapshot_dir / "snapshot.json").exists():
+                raise
+
+    @staticmethod
+    def _snapshot_intact(snapshot_dir: Path) -> bool:
+        """スナップショットのファイルが作成時から変わっていないか（サイズと更新時刻で確認）"""
+        try:
+            meta = json.loads((snapshot_dir / "snapshot.json").read_text(encoding='utf-8'))
+            return _snapshot_file_stats(snapshot_dir / "files") == meta.get("files")
+        except (OSError, ValueError):
+            return False
+
+    def _prune_template_snapshots(self, cache_root: Path, template_name: str, keep: Path):
+        """同一テンプレートの古いスナップショットを削除（直近 TEMPLATE_SNAPSHOT_KEEP 件を保持）"""
+        snapshots = sorted(
+            (p for p in cache_root.glob(f"{template_name}-*") if p.is_dir() and p != keep),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for stale in snapshots[TEMPLATE_SNAPSHOT_KEEP - 1:]:
+            shutil.rmtree(stale, ignore_errors=True)
+
+    def _materialize_snapshot(self, snapshot_dir: Path):
+        """スナップショットを self.agent_dir へ展開（link_mode に応じて reflink/hardlink/コピー）"""
+        meta = json.loads((snapshot_dir / "snapshot.json").read_text(encoding='utf-8'))
+        files_root = snapshot_dir / "files"
+        copy_function = _make_copy_function(self.link_mode)
+
+        entries = list(meta.get("entries", []))
+        if meta.get("rules"):
+            entries.append({"path": ".cursor/rules", "type": "dir"})
+
+        for entry in entries:
+            rel = entry["path"]
+            src = files_root / rel
+            dst = self.agent_dir / rel
+            if dst.exists():
+                if dst.is_dir():
+                    shutil.rmtree(dst)
+                else:
+                    dst.unlink()
+            if entry.get("type", "dir") == "dir":
+                shutil.copytree(src, dst, copy_function=copy_function)
+            else:
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                copy_function(src, dst)
+            print(f"✓ Materialized from template snapshot: {rel}")
+
+        if meta.get("rules"):
+            self.template_rules_copied = True
 
     def _normalize_rule_flags(self, rules_dir: Path):
         """テンプレートからコピーしたルールのalwaysApply設定を整える"""
-        # 直接のmdcファイルとサブディレクトリ内のmdcファイルの両方を処理
-        for rule_path in rules_dir.rglob('*.mdc'):
+        def apply(rule_path: Path, fm: FrontMatter):
+            # フロントマター内にalwaysApplyが既にあれば尊重する
+            if not fm.present or fm.has('alwaysApply'):
+                return
             name = rule_path.name
             target = 'true' if (name.startswith('00_') or name.endswith('_paths.mdc')) else 'false'
-            lines = rule_path.read_text(encoding='utf-8').splitlines()
-            
-            # フロントマター内にalwaysApplyが既に存在するかチェック
-            has_always_apply = False
-            frontmatter_end = -1
-            for idx, line in enumerate(lines):
-                if line.strip() == '---' and idx > 0:
-                    frontmatter_end = idx
-                    break
-                if idx < frontmatter_end or frontmatter_end == -1:
-                    if 'alwaysApply:' in line:
-                        has_always_apply = True
-                        break
-            if has_always_apply:
-                continue
-                
-            for idx, line in enumerate(lines):
-                if line.strip().startswith('globs:'):
-                    lines.insert(idx + 1, f'alwaysApply: {target}')
-                    break
-            rule_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+            fm.set('alwaysApply', target, after='globs')
+
+        # 直接のmdcファイルとサブディレクトリ内のmdcファイルの両方を処理
+        edit_frontmatter_files(rules_dir.rglob('*.mdc'), apply)
+
+
+class _ThreadLocalStdout:
+    """実行コンテキスト（スレッド）ごとに print 出力を個別バッファへ振り分ける stdout ラッパー"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._buffer: contextvars.ContextVar = contextvars.ContextVar("stdout_buffer", default=None)
+
+    def capture(self, buffer: Optional[List[str]]):
+        self._buffer.set(buffer)
+
+    def write(self, text):
+        buffer = self._buffer.get()
+        if buffer is None:
+            return self._stream.write(text)
+        buffer.append(text)
+        return len(text)
 
+    def flush(self):
+        self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+@dataclass
+class BatchResult:
+    agent_name: str
+    domain: str
+    status: str = "pending"  # ok / skipped / failed
+    seconds: float = 0.0
+    agent_dir: Optional[str] = None
+    error: Optional[str] = None
+    stages: List[Dict[str, Any]] = field(default_factory=list)
+    log: str = ""
+
+
+def generate_agents_batch(template_dir: Path, output_base_dir: Path, configs: List[AgentConfig],
+                          jobs: int = 4, overwrite: bool = False, use_template_cache: bool = True,
+                          link_mode: str = "reflink", template_name: str = "agent_base") -> List[BatchResult]:
+    """複数エージェントを1プロセスで生成する
+
+    テンプレート（マニフェスト・ルール含む）のスナップショット解決は最初に1回だけ行い、
+    各エージェントの展開・レンダリングはスレッドプールで並列実行する。
+    """
+    snapshot_dir = None
+    if use_template_cache:
+        preparer = EnhancedAgentGenerator(template_dir, output_base_dir, link_mode=link_mode)
+        try:
+            snapshot_dir = preparer._ensure_template_snapshot(template_name)
+        except Exception as e:
+            print(f"⚠️  Warning: Template snapshot unavailable ({e}). Falling back to direct copy.")
+
+    results = [BatchResult(agent_name=c.agent_name, domain=c.domain) for c in configs]
+    stdout = _ThreadLocalStdout(sys.stdout)
+
+    def run(index: int) -> BatchResult:
+        result = results[index]
+        log: List[str] = []
+        stdout.capture(log)
+        started = time.perf_counter()
+        generator = None
+        try:
+            generator = EnhancedAgentGenerator(
+                template_dir, output_base_dir,
+                use_template_cache=use_template_cache and snapshot_dir is not None,
+                link_mode=link_mode, template_snapshot=snapshot_dir,
+            )
+            agent_dir = generator.generate_agent(config=configs[index], overwrite=overwrite)
+            if agent_dir is None:
+                result.status = "skipped"
+            else:
+                result.status = "ok"
+                result.agent_dir = str(agent_dir)
+        except Exception as e:
+            result.status = "failed"
+            result.error = str(e)
+        finally:
+            result.seconds = time.perf_counter() - started
+            if generator is not None and generator.pipeline is not None:
+                result.stages = generator.pipeline.describe()
+            stdout.capture(None)
+            result.log = "".join(log)
+        return result
+
+    original_stdout = sys.stdout
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            for result in executor.map(run, range(len(configs))):
+                icon = {"ok": "✓", "skipped": "⏭️ ", "failed": "❌"}.get(result.status, "?")
+                print(f"{icon} {result.domain}_agent ({result.seconds:.2f}s)")
+    finally:
+        sys.stdout = original_stdout
+
+    return results
+
+
+def print_stage_timings(stages: List[Dict[str, Any]]):
+    """レンダリング段のステージグラフと所要時間を表示"""
+    print("\n⏱  Render stages")
+    for stage in stages:
+        deps = ", ".join(stage["depends_on"]) or "-"
+        print(f"  {stage['stage']:<18} {stage['seconds'] * 1000:>8.2f}ms  {stage['status']:<7} after: {deps}")
+
+
+def print_batch_report(results: List[BatchResult], total_seconds: float, report_path: str = None):
+    """バッチ生成のサマリーを表示し、必要ならJSONで保存"""
+    print("\n📊 Batch Generation Summary")
+    print("=" * 60)
+    for r in results:
+        detail = r.agent_dir if r.status == "ok" else (r.error or "already exists")
+        print(f"  {r.status:<8} {r.seconds:>7.2f}s  {r.domain:<20} {detail}")
+    counts = {s: sum(1 for r in results if r.status == s) for s in ("ok", "skipped", "failed")}
+    print("-" * 60)
+    print(f"  total: {len(results)} / ok: {counts['ok']} / skipped: {counts['skipped']} / "
+          f"failed: {counts['failed']} / wall: {total_seconds:.2f}s")
+
+    for r in results:
+        if r.status == "failed" and r.log:
+            print(f"\n--- log: {r.domain}_agent ---\n{r.log.rstrip()}")
+
+    if report_path:
+        report = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "total_seconds": round(total_seconds, 3),
+            "agents": [
+                {k: (round(v, 3) if k == "seconds" else v) for k, v in r.__dict__.items() if k != "log"}
+                for r in results
+            ],
+        }
+        Path(report_path).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n📝 Report saved: {report_path}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Enhanced LLM-Driven Agent Generation Script")
@@ -783,6 +1435,20 @@ if __name__ == "__main__":
     parser.add_argument("--description", help="Agent description")
     parser.add_argument("--dir-model", choices=['flow_stock', 'input_output'], default='flow_stock', 
                        help="Directory model to use")
+    parser.add_argument("--no-template-cache", action="store_true",
+                       help="Copy template assets directly instead of using the cached template snapshot")
+    parser.add_argument("--link-mode", choices=list(LINK_MODES), default="reflink",
+                       help="How to materialize files from the template snapshot "
+                            "(reflink falls back to copy; hardlink shares inodes with the snapshot, "
+                            "files the generator writes are unlinked first)")
+    parser.add_argument("--batch", help="Generate every agent listed in a batch file (YAML or JSON)")
+    parser.add_argument("--jobs", type=int, default=min(8, os.cpu_count() or 1),
+                       help="Parallel workers for --batch")
+    parser.add_argument("--overwrite", action="store_true",
+                       help="Overwrite existing agent directories without asking (skipped otherwise in --batch)")
+    parser.add_argument("--report", help="Write the --batch summary report as JSON")
+    parser.add_argument("--timings", action="store_true",
+                       help="Print the render stage graph with per-stage timings")
     
     args = parser.parse_args()
     
@@ -790,7 +1456,25 @@ if __name__ == "__main__":
     template_dir = Path(__file__).parent.parent  # agent_template directory
     output_base_dir = template_dir / "output"  # output directory
     
-    generator = EnhancedAgentGenerator(template_dir, output_base_dir)
+    if args.batch:
+        try:
+            batch_configs = load_batch_configs(args.batch)
+        except Exception as e:
+            print(f"\n❌ Error: {e}")
+            sys.exit(1)
+        print(f"🚀 Starting batch generation: {len(batch_configs)} agents, {args.jobs} workers")
+        batch_started = time.perf_counter()
+        batch_results = generate_agents_batch(
+            template_dir, output_base_dir, batch_configs,
+            jobs=args.jobs, overwrite=args.overwrite,
+            use_template_cache=not args.no_template_cache, link_mode=args.link_mode,
+        )
+        print_batch_report(batch_results, time.perf_counter() - batch_started, args.report)
+        sys.exit(1 if any(r.status == "failed" for r in batch_results) else 0)
+
+    generator = EnhancedAgentGenerator(template_dir, output_base_dir,
+                                       use_template_cache=not args.no_template_cache,
+                                       link_mode=args.link_mode)
     
     try:
         agent_dir = generator.generate_agent(
@@ -800,9 +1484,12 @@ if __name__ == "__main__":
             agent_name=args.agent_name,
             domain=args.domain,
             description=args.description,
-            dir_model=args.dir_model
+            dir_model=args.dir_model,
+            overwrite=True if args.overwrite else None
         )
         print(f"\n✨ Agent successfully generated at: {agent_dir}")
+        if args.timings and generator.pipeline is not None:
+            print_stage_timings(generator.pipeline.describe())
     except Exception as e:
         print(f"\n❌ Error: {e}")
         sys.exit(1)
@@ -90,6 +90,7 @@ logs/
 # Agent specific
 Flow/Private/*
 !Flow/Private/.gitkeep
+.agent-cache/
 
 # Environment variables
 .env
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Lint・検証結果の機械可読出力（--format jsonl / sarif）
+
+lint_mdc_rules.py / lint_skills.py / validate_rules.py / validate_skills.py から共通利用する。
+ファイルの検査が終わるたびに診断結果を書き出してフラッシュするため、エディタ連携や CI の
+アノテーションが全体の完了を待たずに逐次取り込める。
+
+- jsonl: 1行1診断 {"type": "diagnostic", "tool", "file", "line", "rule", "severity", "message"}
+         最終行に {"type": "summary", "tool", "errors", "warnings", ...}
+- sarif: SARIF 2.1.0（results を逐次書き出し、tool.driver.rules は最後にまとめて出力）
+
+使用例:
+    with DiagnosticEmitter("validate_rules", args.format) as emitter:
+        for path in files:
+            emitter.emit(Diagnostic(str(path), 0, "front-matter", "error", message) for message in lint(path))
+        emitter.summary(files=len(files))
+"""
+
+import json
+import re
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple
+
+OUTPUT_FORMATS = ("text", "jsonl", "sarif")
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_LEVELS = {"error": "error", "warning": "warning", "note": "note"}
+
+# 人向けメッセージ先頭の "❌ path:line: " / "path: " を分解する
+_ICON_RE = re.compile(r"^(?:❌|⚠️)\s*")
+_LOCATION_RE = re.compile(r"^(?P<file>[^\s:][^:\n]*?)(?::(?P<line>\d+))?: (?P<message>.*)$", re.DOTALL)
+
+
+@dataclass
+class Diagnostic:
+    file: str
+    line: int  # 1始まり（0 = 行不明）
+    rule: str
+    severity: str  # error / warning / note
+    message: str
+
+
+def split_location(text: str, default_file: str = "") -> Tuple[str, int, str]:
+    """
+    `❌ path:line: message` / `path: message` 形式の文字列を (ファイル, 行, 本文) に分解する。
+
+    先頭がパスでなければ (default_file, 0, 元の文字列) を返す。
+    """
+    body = _ICON_RE.sub("", text, count=1)
+    match = _LOCATION_RE.match(body)
+    if match and (not default_file or _same_file(match.group("file"), default_file)):
+        return match.group("file"), int(match.group("line") or 0), match.group("message")
+    return default_file, 0, body
+
+
+def _same_file(candidate: str, expected: str) -> bool:
+    candidate_path = Path(candidate)
+    expected_path = Path(expected)
+    return (candidate_path == expected_path or candidate_path.name == expected_path.name
+            or candidate_path.resolve() == expected_path.resolve())
+
+
+def add_format_argument(parser) -> None:
+    """--format オプションを追加する（デフォルトは従来の人向け出力）"""
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="text",
+                        help="出力形式（text: 人向け / jsonl: 1行1診断 / sarif: SARIF 2.1.0）")
+
+
+class DiagnosticEmitter:
+    """診断結果を jsonl / sarif でストリーム出力する"""
+
+    def __init__(self, tool: str, fmt: str = "jsonl", stream: Optional[TextIO] = None,
+                 root: Optional[Path] = None):
+        if fmt not in ("jsonl", "sarif"):
+            raise ValueError(f"unsupported format: {fmt}")
+        self.tool = tool
+        self.format = fmt
+        self.stream = stream or sys.stdout
+        self.root = Path(root or Path.cwd()).resolve()
+        self.counts: Dict[str, int] = {"error": 0, "warning": 0, "note": 0}
+        self._rules: Dict[str, str] = {}
+        self._started = False
+        self._closed = False
+        self._first_result = True
+
+    def __enter__(self) -> "DiagnosticEmitter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _uri(self, file: str) -> str:
+        path = Path(file)
+        if path.is_absolute():
+            try:
+                path = path.resolve().relative_to(self.root)
+            except ValueError:
+                return path.as_posix()
+        return path.as_posix()
+
+    def _start(self):
+        if self._started:
+            return
+        self._started = True
+        if self.format == "sarif":
+            self.stream.write(
+                '{"$schema": ' + json.dumps(SARIF_SCHEMA) + ', "version": "2.1.0", "runs": [{"results": [\n'
+            )
+
+    def emit(self, diagnostics: Iterable[Diagnostic]) -> int:
+        """1ファイル分の診断を書き出してフラッシュする（書き出した件数を返す）"""
+        self._start()
+        written = 0
+        for diagnostic in diagnostics:
+            severity = diagnostic.severity if diagnostic.severity in self.counts else "error"
+            self.counts[severity] += 1
+            self._rules.setdefault(diagnostic.rule, severity)
+            if self.format == "jsonl":
+                record = {"type": "diagnostic", "tool": self.tool, **asdict(diagnostic)}
+                record["file"] = self._uri(diagnostic.file)
+                record["severity"] = severity
+                self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                separator = "" if self._first_result else ",\n"
+                self._first_result = False
+                self.stream.write(separator + json.dumps(self._sarif_result(diagnostic, severity), ensure_ascii=False))
+            written += 1
+        self.stream.flush()
+        return written
+
+    def _sarif_result(self, diagnostic: Diagnostic, severity: str) -> Dict[str, Any]:
+        location: Dict[str, Any] = {"artifactLocation": {"uri": self._uri(diagnostic.file)}}
+        if diagnostic.line > 0:
+            location["region"] = {"startLine": diagnostic.line}
+        return {
+            "ruleId": diagnostic.rule,
+            "level": SARIF_LEVELS[severity],
+            "message": {"text": diagnostic.message},
+            "locations": [{"physicalLocation": location}],
+        }
+
+    def summary(self, **fields: Any):
+        """集計を出力して終了する（jsonl は summary 行、sarif は run の properties）"""
+        self.close(fields)
+
+    def close(self, fields: Optional[Dict[str, Any]] = None):
+        if self._closed:
+            return
+        self._closed = True
+        self._start()
+        totals = {"errors": self.counts["error"], "warnings": self.counts["warning"], **(fields or {})}
+        if self.format == "jsonl":
+            record = {"type": "summary", "tool": self.tool, **totals}
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            driver = {
+                "name": self.tool,
+                "rules": [
+                    {"id": rule, "defaultConfiguration": {"level": SARIF_LEVELS[severity]}}
+                    for rule, severity in sorted(self._rules.items())
+                ],
+            }
+            tail = {"tool": {"driver": driver}, "properties": totals}
+            self.stream.write("\n], " + json.dumps(tail, ensure_ascii=False)[1:-1] + "}]}\n")
+        self.stream.flush()
+
+
+def messages_to_diagnostics(messages: Iterable[str], file: str, rule: str,
+                            severity: str = "error") -> List[Diagnostic]:
+    """人向けメッセージ（`path: 本文`）の一覧を、指定したルールIDの診断に変換する"""
+    diagnostics = []
+    for message in messages:
+        path, line, body = split_location(message, file)
+        diagnostics.append(Diagnostic(path or file, line, rule, severity, body))
+    return diagnostics
+
+
+def rule_id_for(name: str) -> str:
+    """チェック関数名などからルールIDを作る（check_front_matter → front-matter）"""
+    if name.startswith("check_"):
+        name = name[len("check_"):]
+    return name.replace("_", "-")
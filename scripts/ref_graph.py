@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+ルール・Skill・エージェント・コマンド・スクリプト間の参照グラフ（永続インデックス）
+
+lint_mdc_rules.py（--refs の参照切れ検出）/ update_agent_master.py の変換規則と共通の
+対応関係を1か所で持ち、Lint・同期・影響範囲の確認で本文を毎回走査し直さずに済むようにする。
+
+ノード: リポジトリルートからの相対パス（posix 形式）
+  rule     .cursor/rules/**/*.mdc
+  master   CLAUDE.md / AGENTS.md / master_rules.mdc ほか（update_master_files_only の同期対象）
+  skill    .{cursor,claude,codex}/skills/<name>/SKILL.md
+  agent    .claude/agents/*
+  command  .cursor/commands/*.md / .claude/commands/*.md / .codex/prompts/*.md
+  script   scripts/* / commons_scripts/* / .{cursor,claude,codex}/skills/<name>/scripts/*
+エッジ:
+  references  本文中の参照（rule: "X.mdc" / action: "call X.mdc" / .cursor/rules/... / scripts/x.py 等）
+  generates   ルール → 生成されるエージェント・Skill、マスター → 他のマスター
+  syncs       同名の Skill / コマンドの環境間同期（.cursor ⇔ .claude ⇔ .codex）
+  embeds      大元スクリプト → Skill に埋め込まれた同名スクリプト
+
+永続化: .agent-cache/ref_graph.json（ファイルごとの (mtime_ns, サイズ) と抽出済みの参照）。
+読み込み時に変更・追加されたファイルだけ再抽出し、削除されたファイルは除く。
+
+使用例:
+    graph = RefGraph.load(root)
+    graph.dangling()                                  # 存在しない参照先
+    graph.referrers(".cursor/rules/01_x.mdc")         # 参照元（ファイルと行）
+    graph.impact("scripts/validate_rules.py")         # 変更時に再生成・再同期が必要なファイル
+
+    python scripts/ref_graph.py dangling
+    python scripts/ref_graph.py who .cursor/rules/01_x.mdc
+    python scripts/ref_graph.py impact scripts/validate_rules.py --json
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import re
+import sys
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from doc_cache import find_cache_dir, load_document
+
+# キャッシュ形式（抽出する参照の種類・形式を変えたら上げる）
+GRAPH_FORMAT = 1
+GRAPH_FILE_NAME = "ref_graph.json"
+
+ENVS = ("cursor", "claude", "codex")
+RULES_DIR = ".cursor/rules"
+AGENTS_DIR = ".claude/agents"
+SCRIPT_DIRS = ("scripts", "commons_scripts")  # 優先順（同名なら scripts/ が大元）
+COMMAND_DIRS = (".cursor/commands", ".claude/commands", ".codex/prompts")
+# update_master_files_only が相互に同期するマスターファイル
+MASTER_FILES = (
+    "AGENTS.md",
+    "CLAUDE.md",
+    ".cursor/rules/master_rules.mdc",
+    ".gemini/GEMINI.md",
+    ".kiro/steering/KIRO.md",
+    ".github/copilot-instructions.md",
+)
+
+# 本文中の参照（種類, パターン）。\w は ASCII のみ（日本語の地の文を巻き込まない）
+REFERENCE_PATTERNS = [
+    ("rule", re.compile(r'\brule:\s*"([^"]+\.mdc)"')),
+    ("rule", re.compile(r'\baction:\s*"call\s+([^"\s=>]+\.mdc)')),
+    ("path", re.compile(
+        r"(?<![\w/.-])(\.(?:cursor|claude|codex)/(?:rules|agents|commands|prompts|skills)/[\w./{}\[\]-]*[\w}\]])",
+        re.ASCII,
+    )),
+    ("script", re.compile(r"(?<![\w/.-])((?:\./)?(?:scripts|commons_scripts)/[\w-]+\.(?:py|sh|ps1))\b", re.ASCII)),
+]
+# テンプレート上の書式例（{domain} / XX / 0X_ / NN_ / ファイル名 など）は参照として扱わない
+PLACEHOLDER_RE = re.compile(r"[{}\[\]<>*]|(?:^|/)(?:X+|0X|NN)[_.]|[^\x00-\x7f]")
+
+_SKILL_MD_RE = re.compile(r"^\.(cursor|claude|codex)/skills/([^/]+)/SKILL\.md$")
+_SKILL_SCRIPT_RE = re.compile(r"^\.(cursor|claude|codex)/skills/([^/]+)/scripts/([^/]+)$")
+
+
+def skill_name_for_rule(rule_path) -> Optional[str]:
+    """
+    ルールから生成される Skill 名（update_agent_master.py の変換規則と同じ）
+
+    例: 01_requirements_analysis.mdc → requirements-analysis
+    pathsファイル・00番台はスキル化されないため None を返す。
+    """
+    rule_path = Path(rule_path)
+    if rule_path.suffix != ".mdc" or "paths" in rule_path.name.lower() or "00" in rule_path.name:
+        return None
+    return re.sub(r'^\d+_', '', rule_path.stem).replace('_', '-').lower()
+
+
+def agent_path_for_rule(rule_rel: str) -> str:
+    """ルールから生成されるエージェントファイル（00・path を含むものは .mdc のままコピー）"""
+    name = posixpath.basename(rule_rel)
+    if "00" in name or "path" in name.lower():
+        return f"{AGENTS_DIR}/{name}"
+    return f"{AGENTS_DIR}/{name[:-len('.mdc')]}.md"
+
+
+def node_kind(rel: str) -> str:
+    if rel in MASTER_FILES:
+        return "master"
+    if rel.startswith(RULES_DIR + "/") and rel.endswith(".mdc"):
+        return "rule"
+    if _SKILL_MD_RE.match(rel):
+        return "skill"
+    if _SKILL_SCRIPT_RE.match(rel) or rel.split("/", 1)[0] in SCRIPT_DIRS:
+        return "script"
+    if rel.startswith(AGENTS_DIR + "/"):
+        return "agent"
+    if any(rel.startswith(d + "/") for d in COMMAND_DIRS):
+        return "command"
+    return "file"
+
+
+def extract_references(text: str, line_of) -> List[Tuple[str, str, int]]:
+    """本文から (種類, 参照先の表記, 行番号) を抽出する（書式例は除く）"""
+    found: List[Tuple[str, str, int]] = []
+    seen: Set[Tuple[str, int]] = set()
+    for kind, pattern in REFERENCE_PATTERNS:
+        for match in pattern.finditer(text):
+            raw = match.group(1)
+            if PLACEHOLDER_RE.search(raw):
+                continue
+            line = line_of(match.start(1))
+            if (raw, line) in seen:
+                continue
+            seen.add((raw, line))
+            found.append((kind, raw, line))
+    found.sort(key=lambda item: (item[2], item[1]))
+    return found
+
+
+def find_repo_root(start: Optional[Path] = None) -> Path:
+    """git ルート（なければ start 自身）"""
+    current = Path(start or Path.cwd()).resolve()
+    if current.is_file():
+        current = current.parent
+    for parent in [current] + list(current.parents):
+        if (parent / ".git").exists():
+            return parent
+    return current
+
+
+@dataclass(frozen=True)
+class Reference:
+    source: str  # 参照元（ルート相対）
+    line: int
+    raw: str  # 本文中の表記
+    target: str  # 解決した参照先（ルート相対）
+
+
+class RefGraph:
+    """参照グラフ（RefGraph.load で前回の索引を読み、変更ファイルだけ更新する）"""
+
+    def __init__(self, root: Path, index_file: Optional[Path] = None):
+        self.root = Path(root).resolve()
+        self.index_file = index_file
+        self.nodes: Set[str] = set()
+        self._files: Dict[str, list] = {}  # 参照元 → [mtime_ns, size, [[種類, 表記, 行], ...]]
+        self._dirty = False
+        self.rescanned = 0
+        self._references: Optional[List[Reference]] = None
+        self._incoming: Optional[Dict[str, List[Reference]]] = None
+
+    # ----- 構築 -----
+
+    @classmethod
+    def load(cls, root: Optional[Path] = None, persist: bool = True) -> "RefGraph":
+        root = find_repo_root(root)
+        index_file = find_cache_dir(root) / GRAPH_FILE_NAME if persist else None
+        graph = cls(root, index_file)
+        graph.refresh()
+        return graph
+
+    def _read_index(self) -> Dict[str, list]:
+        if self.index_file is None or not self.index_file.exists():
+            return {}
+        try:
+            data = json.loads(self.index_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if data.get("format") != GRAPH_FORMAT or data.get("root") != str(self.root):
+            return {}
+        return data.get("files", {})
+
+    def _list(self, rel_dir: str, recursive: bool = False, suffixes: Tuple[str, ...] = ()) -> Iterable[Tuple[str, os.stat_result]]:
+        pending = [rel_dir]
+        while pending:
+            current = pending.pop()
+            try:
+                entries = list(os.scandir(self.root / current))
+            except OSError:
+                continue
+            for entry in entries:
+                rel = f"{current}/{entry.name}"
+                try:
+                    if entry.is_dir():
+                        if recursive:
+                            pending.append(rel)
+                        continue
+                    if suffixes and not entry.name.endswith(suffixes):
+                        continue
+                    yield rel, entry.stat()
+                except OSError:
+                    continue
+
+    def _sources(self) -> Iterable[Tuple[str, os.stat_result]]:
+        """参照を抽出するファイル（ルール・マスター・Skill・エージェント・コマンド）"""
+        yield from self._list(RULES_DIR, recursive=True, suffixes=(".mdc",))
+        for rel in MASTER_FILES:
+            if rel.startswith(RULES_DIR + "/"):
+                continue
+            try:
+                yield rel, os.stat(self.root / rel)
+            except OSError:
+                continue
+        for env in ENVS:
+            for skill_dir, _ in self._dirs(f".{env}/skills"):
+                try:
+                    yield f"{skill_dir}/SKILL.md", os.stat(self.root / skill_dir / "SKILL.md")
+                except OSError:
+                    continue
+        yield from self._list(AGENTS_DIR, suffixes=(".md", ".mdc"))
+        for command_dir in COMMAND_DIRS:
+            yield from self._list(command_dir, suffixes=(".md",))
+
+    def _dirs(self, rel_dir: str) -> List[Tuple[str, str]]:
+        try:
+            return sorted((f"{rel_dir}/{e.name}", e.name) for e in os.scandir(self.root / rel_dir) if e.is_dir())
+        except OSError:
+            return []
+
+    def _targets(self) -> Iterable[str]:
+        """参照先としてだけ扱うファイル（スクリプト）"""
+        for script_dir in SCRIPT_DIRS:
+            for rel, _ in self._list(script_dir):
+                yield rel
+        for env in ENVS:
+            for skill_dir, _ in self._dirs(f".{env}/skills"):
+                for rel, _ in self._list(f"{skill_dir}/scripts"):
+                    yield rel
+
+    def refresh(self) -> int:
+        """変更・追加されたファイルだけ参照を再抽出する（再抽出した件数を返す）"""
+        stored = self._read_index()
+        files: Dict[str, list] = {}
+        self.rescanned = 0
+        for rel, stat in self._sources():
+            entry = stored.get(rel)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                files[rel] = entry
+                continue
+            try:
+                document = load_document(self.root / rel)
+            except (OSError, UnicodeDecodeError):
+                continue
+            refs = [list(ref) for ref in extract_references(document.text, document.line_of)]
+            files[rel] = [stat.st_mtime_ns, stat.st_size, refs]
+            self.rescanned += 1
+        self._dirty = self.rescanned > 0 or set(files) != set(stored)
+        self._files = files
+        self.nodes = set(files) | set(self._targets())
+        self._references = None
+        self._incoming = None
+        return self.rescanned
+
+    def save(self):
+        if self.index_file is None or not self._dirty:
+            return
+        data = {"format": GRAPH_FORMAT, "root": str(self.root), "files": self._files}
+        tmp = self.index_file.with_name(f"{self.index_file.name}.{os.getpid()}.tmp")
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self.index_file)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        self._dirty = False
+
+    # ----- 参照の解決 -----
+
+    def exists(self, rel: str) -> bool:
+        return rel in self.nodes or (self.root / rel).exists()
+
+    def resolve(self, source: str, kind: str, raw: str) -> str:
+        """本文中の表記を参照先（ルート相対）に解決する"""
+        if kind == "rule":
+            if raw.startswith(".cursor/") or raw.startswith(".claude/") or raw.startswith(".codex/"):
+                return posixpath.normpath(raw)
+            return f"{RULES_DIR}/{posixpath.basename(raw)}"
+        if kind == "script":
+            local = raw.startswith("./")
+            name = raw[2:] if local else raw
+            skill = _SKILL_MD_RE.match(source)
+            if skill:
+                # Skill 内は同梱スクリプトを優先（./scripts/x は常に Skill 内）
+                bundled = f"{posixpath.dirname(source)}/{name}"
+                if local or self.exists(bundled):
+                    return bundled
+            script = posixpath.basename(name)
+            for script_dir in SCRIPT_DIRS:
+                candidate = f"{script_dir}/{script}"
+                if self.exists(candidate):
+                    return candidate
+            return name
+        return posixpath.normpath(raw)
+
+    def references(self) -> List[Reference]:
+        """全参照（参照元・行順）"""
+        if self._references is None:
+            refs = []
+            for source in sorted(self._files):
+                for kind, raw, line in self._files[source][2]:
+                    refs.append(Reference(source, line, raw, self.resolve(source, kind, raw)))
+            self._references = refs
+        return self._references
+
+    def _incoming_refs(self) -> Dict[str, List[Reference]]:
+        if self._incoming is None:
+            incoming: Dict[str, List[Reference]] = {}
+            for ref in self.references():
+                incoming.setdefault(ref.target, []).append(ref)
+            self._incoming = incoming
+        return self._incoming
+
+    # ----- 生成・同期の対応 -----
+
+    def derived(self, rel: str) -> List[str]:
+        """rel から生成・同期されるファイル（generates / syncs / embeds。存在しないものも含む）"""
+        kind = node_kind(rel)
+        result: List[str] = []
+        if kind == "master":
+            result.extend(m for m in MASTER_FILES if m != rel)
+        elif kind == "rule" and posixpath.dirname(rel) == RULES_DIR:
+            result.append(agent_path_for_rule(rel))
+            skill_name = skill_name_for_rule(rel)
+            if skill_name:
+                result.extend(f".{env}/skills/{skill_name}/SKILL.md" for env in ENVS)
+        elif kind == "skill":
+            name = _SKILL_MD_RE.match(rel).group(2)
+            result.extend(f".{env}/skills/{name}/SKILL.md" for env in ENVS)
+        elif kind == "command":
+            name = posixpath.basename(rel)
+            result.extend(f"{d}/{name}" for d in COMMAND_DIRS)
+        elif kind == "script" and rel.split("/", 1)[0] in SCRIPT_DIRS:
+            name = posixpath.basename(rel)
+            # 同名が scripts/ にあれば commons_scripts/ 側は大元ではない
+            primary = next((f"{d}/{name}" for d in SCRIPT_DIRS if f"{d}/{name}" in self.nodes), rel)
+            if primary == rel:
+                result.extend(n for n in sorted(self.nodes)
+                              if _SKILL_SCRIPT_RE.match(n) and n.endswith("/" + name))
+        return [r for r in result if r != rel]
+
+    # ----- クエリ -----
+
+    def dangling(self, sources: Optional[Iterable[str]] = None) -> List[Reference]:
+        """存在しない参照先を指す参照（sources 指定時はその参照元のみ）"""
+        wanted = set(sources) if sources is not None else None
+        return [ref for ref in self.references()
+                if (wanted is None or ref.source in wanted) and not self.exists(ref.target)]
+
+    def referrers(self, rel: str) -> List[Reference]:
+        """rel を参照している箇所"""
+        return list(self._incoming_refs().get(self.normalize(rel), []))
+
+    def impact(self, rel: str) -> List[str]:
+        """
+        rel を変更したときに再生成・再同期が必要な既存ファイル
+
+        生成・同期・埋め込みの対応を推移的に辿る。スクリプトの場合は、それを参照する
+        ルールから生成される Skill（スクリプトが同梱される）も含む。
+        """
+        start = self.normalize(rel)
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            nexts = list(self.derived(current))
+            if node_kind(current) == "script":
+                for ref in self._incoming_refs().get(current, []):
+                    if node_kind(ref.source) == "rule":
+                        nexts.extend(p for p in self.derived(ref.source) if _SKILL_MD_RE.match(p))
+            for path in nexts:
+                if path not in seen:
+                    seen.add(path)
+                    queue.append(path)
+        seen.discard(start)
+        return sorted(p for p in seen if self.exists(p))
+
+    def normalize(self, path) -> str:
+        """パス（絶対・カレント相対・ルート相対）をルート相対の posix 形式にする"""
+        candidate = Path(path)
+        if not candidate.is_absolute():
+            cwd_path = Path.cwd() / candidate
+            candidate = cwd_path if cwd_path.exists() else self.root / candidate
+        try:
+            return candidate.resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return posixpath.normpath(Path(path).as_posix())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="ルール・Skill・スクリプト間の参照グラフ")
+    parser.add_argument("query", choices=["dangling", "who", "impact", "stats"],
+                        help="dangling: 参照切れ / who: 参照元 / impact: 変更時の再生成対象 / stats: 集計")
+    parser.add_argument("path", nargs="?", help="who / impact の対象ファイル")
+    parser.add_argument("--root", default=None, help="リポジトリルート（デフォルト: カレントの git ルート）")
+    parser.add_argument("--json", action="store_true", help="JSON で出力")
+    parser.add_argument("--no-cache", action="store_true", help="索引（.agent-cache/ref_graph.json）を使わない")
+    args = parser.parse_args()
+    if args.query in ("who", "impact") and not args.path:
+        parser.error(f"{args.query} には対象ファイルを指定してください")
+
+    graph = RefGraph.load(Path(args.root) if args.root else None, persist=not args.no_cache)
+    graph.save()
+
+    if args.query == "dangling":
+        refs = graph.dangling()
+        if args.json:
+            print(json.dumps([ref.__dict__ for ref in refs], ensure_ascii=False, indent=2))
+        else:
+            for ref in refs:
+                print(f"⚠️ {ref.source}:{ref.line}: 参照先 `{ref.raw}` が存在しません")
+            print(f"\n📊 参照切れ: {len(refs)}件（参照 {len(graph.references())}件）")
+        return 1 if refs else 0
+
+    if args.query == "who":
+        refs = graph.referrers(args.path)
+        if args.json:
+            print(json.dumps([ref.__dict__ for ref in refs], ensure_ascii=False, indent=2))
+        else:
+            for ref in refs:
+                print(f"{ref.source}:{ref.line}: {ref.raw}")
+            print(f"\n📊 {graph.normalize(args.path)} の参照元: {len(refs)}件")
+        return 0
+
+    if args.query == "impact":
+        paths = graph.impact(args.path)
+        if args.json:
+            print(json.dumps(paths, ensure_ascii=False, indent=2))
+        else:
+            for path in paths:
+                print(path)
+            print(f"\n📊 {graph.normalize(args.path)} の変更で再生成・再同期が必要: {len(paths)}件")
+        return 0
+
+    kinds: Dict[str, int] = {}
+    for node in graph.nodes:
+        kinds[node_kind(node)] = kinds.get(node_kind(node), 0) + 1
+    stats = {"nodes": kinds, "references": len(graph.references()), "rescanned": graph.rescanned}
+    if args.json:
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+    else:
+        print(f"📊 ノード: {', '.join(f'{k}={v}' for k, v in sorted(kinds.items()))}")
+        print(f"   参照: {stats['references']}件（今回再抽出: {graph.rescanned}ファイル）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,11 +3,16 @@
 
 from __future__ import annotations
 
+import argparse
 import re
 import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+from doc_cache import load_document, parse_cached
+from lint_cache import LintCache, file_digest, git_changed_files, select_changed
+from lint_report import DiagnosticEmitter, add_format_argument, messages_to_diagnostics, rule_id_for
+
 ROOT = Path.cwd()
 RULE_DIR = ROOT / ".cursor" / "rules"
 
@@ -65,7 +70,7 @@ def expected_always_true(path: Path) -> bool:
 def check_front_matter(path: Path, content: str) -> List[str]:
     errors: List[str] = []
     try:
-        fm, _ = parse_front_matter(content)
+        fm, _ = parse_cached(parse_front_matter, content)
     except ValueError as exc:
         errors.append(f"{path}: front matter error → {exc}")
         return errors
@@ -362,19 +367,57 @@ def iter_rule_files() -> List[Path]:
     return sorted(RULE_DIR.glob("*.mdc"))
 
 
-def validate() -> int:
+RULE_CHECKS = (check_front_matter, check_path_comments, check_master_triggers)
+
+
+def lint_rule_file(file_path: Path, rel: Path) -> List[Tuple[str, str]]:
+    """1ファイルを検証し (ルールID, エラー) の一覧を返す"""
+    text = load_document(file_path).text
+    return [(rule_id_for(check.__name__), error) for check in RULE_CHECKS for error in check(rel, text)]
+
+
+def iter_rule_results(files: List[Path], use_cache: bool):
+    """(相対パス, [(ルールID, エラー), ...]) をファイルごとに順に返す"""
+    # 内容が前回と同じファイルはキャッシュ済みの結果を再生
+    with LintCache(__file__, enabled=use_cache) as cache:
+        for file_path in files:
+            rel = file_path.relative_to(ROOT)
+            digest = file_digest(file_path)
+            file_errors = cache.get(rel, digest)
+            if file_errors is None:
+                file_errors = lint_rule_file(file_path, rel)
+                cache.put(rel, digest, file_errors)
+            yield rel, [tuple(item) for item in file_errors]
+
+
+def validate(changed_only: bool = False, use_cache: bool = True, fmt: str = "text") -> int:
     errors: List[str] = []
+    # 機械可読出力では stdout を診断専用にし、案内メッセージは stderr へ出す
+    notice = sys.stderr if fmt != "text" else sys.stdout
     files = iter_rule_files()
     if not files:
-        print("No .cursor/rules/*.mdc files found. Run this script inside an agent directory.")
+        print("No .cursor/rules/*.mdc files found. Run this script inside an agent directory.", file=notice)
         return 1
 
-    for file_path in files:
-        text = file_path.read_text(encoding="utf-8")
-        rel = file_path.relative_to(ROOT)
-        errors.extend(check_front_matter(rel, text))
-        errors.extend(check_path_comments(rel, text))
-        errors.extend(check_master_triggers(rel, text))
+    if changed_only:
+        changed = git_changed_files(ROOT)
+        if changed is None:
+            print("git changes unavailable; validating all rule files.", file=notice)
+        else:
+            files = select_changed(files, changed)
+
+    if fmt != "text":
+        # ファイルごとの検証が終わるたびに診断を出力
+        with DiagnosticEmitter("validate_rules", fmt, root=ROOT) as emitter:
+            for rel, file_errors in iter_rule_results(files, use_cache):
+                for rule, error in file_errors:
+                    emitter.emit(messages_to_diagnostics([error], str(rel), rule))
+            error_count = emitter.counts["error"]
+            emitter.summary(files=len(files))
+        return 1 if error_count else 0
+
+    for _, file_errors in iter_rule_results(files, use_cache):
+        errors.extend(error for _, error in file_errors)
 
     if errors:
         print("Validation failed:")
@@ -387,4 +430,11 @@ def validate() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(validate())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--changed-only", action="store_true",
+                        help="Validate only rule files changed in git (diff against HEAD and untracked)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Do not use the result cache (.agent-cache/lint.sqlite)")
+    add_format_argument(parser)
+    args = parser.parse_args()
+    sys.exit(validate(changed_only=args.changed_only, use_cache=not args.no_cache, fmt=args.format))
@@ -6,17 +6,45 @@ Skills版エージェントの構造・フロントマター・必須セクシ
 
 import os
 import sys
+import argparse
 import re
-import yaml
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+from doc_cache import load_document, derive
+from frontmatter_utils import FrontMatterError, safe_load_yaml
+from lint_cache import LintCache, file_digest, git_changed_files, select_changed, skill_dir_digest
+from lint_report import Diagnostic, DiagnosticEmitter, add_format_argument
+
 # ANSI colors
 GREEN = "\033[92m"
 RED = "\033[91m"
 YELLOW = "\033[93m"
 RESET = "\033[0m"
 
+# 機械可読出力（--format jsonl / sarif）用: メッセージの特徴 → ルールID
+ISSUE_RULES = [
+    ("SKILL.md が存在しない", "skill-md-missing"),
+    ("フロントマターがない", "frontmatter-missing"),
+    ("YAML構文エラー", "frontmatter-yaml"),
+    ("name フィールドがない", "name-missing"),
+    ("description フィールドがない", "description-missing"),
+    ("Instructions セクションがない", "instructions-section-missing"),
+    ("Resources セクションがない", "resources-section-missing"),
+    ("Next Action セクションがない", "next-action-section-missing"),
+    ("Preflight（事前確認）がない", "preflight-missing"),
+    ("QC（必須）がない", "qc-missing"),
+    ("subagent_policy ブロックがない", "subagent-policy-missing"),
+    ("recommended_subagents ブロックがない", "recommended-subagents-missing"),
+    ("assets/ フォルダがない", "assets-missing"),
+    ("assets/ が空", "assets-empty"),
+    ("evaluation/ フォルダがない", "evaluation-missing"),
+    ("内容が少なすぎる", "command-too-short"),
+]
+# 重要度 → severity（Medium は警告扱い。終了コードは従来どおり全件で判定）
+PRIORITY_SEVERITY = {"Critical": "error", "High": "error", "Medium": "warning"}
+ISSUE_RE = re.compile(r"^\[(Critical|High|Medium)\] (.*)$", re.DOTALL)
+
 
 def find_project_root() -> Path:
     """プロジェクトルートを特定"""
@@ -37,10 +65,10 @@ def parse_frontmatter(content: str) -> Tuple[Optional[Dict], str]:
         return None, content
 
     try:
-        frontmatter = yaml.safe_load(parts[1])
+        frontmatter = safe_load_yaml(parts[1])
         body = parts[2]
         return frontmatter, body
-    except yaml.YAMLError as e:
+    except (FrontMatterError, ImportError) as e:
         return {"_error": str(e)}, content
 
 
@@ -55,8 +83,7 @@ def validate_skill(skill_path: Path) -> List[str]:
         errors.append(f"[Critical] SKILL.md が存在しない: {skill_name}")
         return errors
 
-    content = skill_md.read_text(encoding="utf-8")
-    frontmatter, body = parse_frontmatter(content)
+    frontmatter, body = derive(skill_md, parse_frontmatter)
 
     # フロントマターチェック
     if frontmatter is None:
@@ -120,8 +147,7 @@ def validate_agent(agent_path: Path) -> List[str]:
     errors = []
     agent_name = agent_path.stem
 
-    content = agent_path.read_text(encoding="utf-8")
-    frontmatter, body = parse_frontmatter(content)
+    frontmatter, body = derive(agent_path, parse_frontmatter)
 
     # フロントマターチェック
     if frontmatter is None:
@@ -142,7 +168,7 @@ def validate_command(cmd_path: Path) -> List[str]:
     errors = []
     cmd_name = cmd_path.stem
 
-    content = cmd_path.read_text(encoding="utf-8")
+    content = load_document(cmd_path).text
 
     # 基本的な構造チェック（フロントマターは任意）
     if len(content.strip()) < 10:
@@ -151,12 +177,77 @@ def validate_command(cmd_path: Path) -> List[str]:
     return errors
 
 
+def run_cached(cache: LintCache, path: Path, digest: Optional[str], validator) -> List[str]:
+    """内容が前回と同じならキャッシュ済みの結果を返し、それ以外は検証して保存"""
+    errors = cache.get(path, digest)
+    if errors is None:
+        errors = validator(path)
+        cache.put(path, digest, errors)
+    return errors
+
+
+def issue_diagnostic(message: str, file: Path, root: Path) -> Diagnostic:
+    """検証メッセージ（`[重要度] 内容`）を診断に変換"""
+    match = ISSUE_RE.match(message)
+    priority, body = (match.group(1), match.group(2)) if match else ("High", message)
+    rule = next((rule for marker, rule in ISSUE_RULES if marker in body), "validation")
+    return Diagnostic(os.path.relpath(file, root), 0, rule, PRIORITY_SEVERITY[priority], body)
+
+
+def stream_diagnostics(root: Path, args) -> int:
+    """--format jsonl / sarif: Skill / Agent / Command ごとの検証が終わるたびに診断を出力し、終了コードを返す"""
+    changed = git_changed_files(root) if args.changed_only else None
+    if args.changed_only and changed is None:
+        print("⚠ git の変更ファイルを取得できないため、全件検証します", file=sys.stderr)
+
+    def targets(paths: List[Path]) -> List[Path]:
+        return paths if changed is None else select_changed(paths, changed)
+
+    skills_dir = root / ".claude" / "skills"
+    agents_dir = root / ".claude" / "agents"
+    commands_dir = root / ".claude" / "commands"
+    skill_paths = sorted(p for p in skills_dir.iterdir() if p.is_dir() and not p.name.startswith(".")) \
+        if skills_dir.exists() else []
+    jobs = [(p, skill_dir_digest(p), validate_skill, p / "SKILL.md") for p in targets(skill_paths)]
+    for directory, validator in ((agents_dir, validate_agent), (commands_dir, validate_command)):
+        if directory.exists():
+            jobs.extend((p, None, validator, p) for p in targets(sorted(directory.glob("*.md"))))
+
+    total = 0
+    with DiagnosticEmitter("validate_skills", args.format, root=root) as emitter, \
+            LintCache(__file__, enabled=not args.no_cache) as cache:
+        for path, digest, validator, file in jobs:
+            errors = run_cached(cache, path, digest if digest is not None else file_digest(path), validator)
+            total += len(errors)
+            emitter.emit(issue_diagnostic(e, file, root) for e in errors)
+        emitter.summary(total=total, checked=len(jobs))
+    return 1 if total else 0
+
+
 def main():
     """メイン処理"""
+    parser = argparse.ArgumentParser(description="Skills Validation Script")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="git で変更されたファイルを含む Skill / Agent / Command のみ検証")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="検証結果キャッシュ（.agent-cache/lint.sqlite）を使わない")
+    add_format_argument(parser)
+    args = parser.parse_args()
+
     root = find_project_root()
+    if args.format != "text":
+        sys.exit(stream_diagnostics(root, args))
     print(f"📂 プロジェクトルート: {root}")
     print()
 
+    changed = git_changed_files(root) if args.changed_only else None
+    if args.changed_only and changed is None:
+        print(f"{YELLOW}⚠ git の変更ファイルを取得できないため、全件検証します{RESET}")
+
+    def targets(paths: List[Path]) -> List[Path]:
+        return paths if changed is None else select_changed(paths, changed)
+
+    cache = LintCache(__file__, enabled=not args.no_cache)
     all_errors = []
     stats = {"skills": 0, "agents": 0, "commands": 0}
 
@@ -164,15 +255,15 @@ def main():
     skills_dir = root / ".claude" / "skills"
     if skills_dir.exists():
         print("🔍 Skills検証中...")
-        for skill_path in sorted(skills_dir.iterdir()):
-            if skill_path.is_dir() and not skill_path.name.startswith("."):
-                stats["skills"] += 1
-                errors = validate_skill(skill_path)
-                if errors:
-                    all_errors.extend(errors)
-                    print(f"  {RED}✗{RESET} {skill_path.name}: {len(errors)} エラー")
-                else:
-                    print(f"  {GREEN}✓{RESET} {skill_path.name}")
+        skill_paths = [p for p in sorted(skills_dir.iterdir()) if p.is_dir() and not p.name.startswith(".")]
+        for skill_path in targets(skill_paths):
+            stats["skills"] += 1
+            errors = run_cached(cache, skill_path, skill_dir_digest(skill_path), validate_skill)
+            if errors:
+                all_errors.extend(errors)
+                print(f"  {RED}✗{RESET} {skill_path.name}: {len(errors)} エラー")
+            else:
+                print(f"  {GREEN}✓{RESET} {skill_path.name}")
     else:
         print(f"{YELLOW}⚠ .claude/skills/ が存在しません{RESET}")
 
@@ -182,9 +273,9 @@ def main():
     agents_dir = root / ".claude" / "agents"
     if agents_dir.exists():
         print("🔍 Agents検証中...")
-        for agent_path in sorted(agents_dir.glob("*.md")):
+        for agent_path in targets(sorted(agents_dir.glob("*.md"))):
             stats["agents"] += 1
-            errors = validate_agent(agent_path)
+            errors = run_cached(cache, agent_path, file_digest(agent_path), validate_agent)
             if errors:
                 all_errors.extend(errors)
                 print(f"  {RED}✗{RESET} {agent_path.name}: {len(errors)} エラー")
@@ -199,9 +290,9 @@ def main():
     commands_dir = root / ".claude" / "commands"
     if commands_dir.exists():
         print("🔍 Commands検証中...")
-        for cmd_path in sorted(commands_dir.glob("*.md")):
+        for cmd_path in targets(sorted(commands_dir.glob("*.md"))):
             stats["commands"] += 1
-            errors = validate_command(cmd_path)
+            errors = run_cached(cache, cmd_path, file_digest(cmd_path), validate_command)
             if errors:
                 all_errors.extend(errors)
                 print(f"  {RED}✗{RESET} {cmd_path.name}: {len(errors)} エラー")
@@ -209,6 +300,7 @@ def main():
                 print(f"  {GREEN}✓{RESET} {cmd_path.name}")
     else:
         print(f"{YELLOW}⚠ .claude/commands/ が存在しません{RESET}")
+    cache.close()
 
     print()
     print("=" * 50)
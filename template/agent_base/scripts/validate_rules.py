@@ -3,10 +3,16 @@
 
 from __future__ import annotations
 
+import argparse
+import bisect
 import re
 import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from doc_cache import load_document, parse_cached
+from lint_cache import LintCache, file_digest, git_changed_files, select_changed
+from lint_report import DiagnosticEmitter, add_format_argument, messages_to_diagnostics, rule_id_for
 
 ROOT = Path.cwd()
 RULE_DIR = ROOT / ".cursor" / "rules"
@@ -315,7 +321,7 @@ def expected_always_true(path: Path) -> bool:
 def check_front_matter(path: Path, content: str) -> List[str]:
     errors: List[str] = []
     try:
-        fm, _ = parse_front_matter(content)
+        fm, _ = parse_cached(parse_front_matter, content)
     except ValueError as exc:
         errors.append(
             f"{path}: フロントマター構文エラーが検出されました。\n"
@@ -572,6 +578,220 @@ def check_phase_descriptions(path: Path, content: str) -> List[str]:
     return errors
 
 
+# ----- 品質メトリクス用のブロック索引 -----
+# 旧実装の正規表現（`((?:.*\n)*?)(?=\n\S|\Z)` や `^\s*-\s+key:\s*` など）は、空行や空白が続く
+# 長いブロックで行頭ごとに再走査が起き、最悪で入力長の2乗になる。ここでは1ファイルにつき
+# 行頭・終端位置を1回だけ索引化し、抽出結果は旧パターンと同一になるよう線形時間で求める。
+
+_WS_RUN_RE = re.compile(r"\s*")
+_WORD_RUN_RE = re.compile(r"\w+")
+_ASCII_KEY_RUN_RE = re.compile(r"[A-Za-z0-9_]+")
+TEMPLATE_KEY_SUFFIX = "_template"
+
+
+def _ws_end(text: str, pos: int) -> int:
+    """pos から続く空白（改行を含む）の直後の位置"""
+    return _WS_RUN_RE.match(text, pos).end()
+
+
+def _next_line_start(text: str, pos: int) -> int:
+    """pos 以降で最初の行頭（なければ -1）"""
+    if pos == 0 or text[pos - 1] == "\n":
+        return pos
+    newline = text.find("\n", pos)
+    return -1 if newline == -1 else newline + 1
+
+
+def count_list_items(text: str, bullets: str = "-", label: str = "") -> int:
+    """行頭の箇条書き（`^\\s*[bullets]\\s+label\\s*`、MULTILINE の findall 相当）を数える"""
+    count = 0
+    length = len(text)
+    pos = 0
+    while 0 <= pos < length:
+        mark = _ws_end(text, pos)
+        end = -1
+        if mark < length and text[mark] in bullets:
+            after = _ws_end(text, mark + 1)
+            if after > mark + 1:
+                if not label:
+                    end = after
+                elif text.startswith(label, after):
+                    end = _ws_end(text, after + len(label))
+        if end >= 0:
+            count += 1
+            pos = _next_line_start(text, end)
+        else:
+            # 同じ空白の連なりに含まれる行頭はすべて同じ結果になるので、まとめて飛ばす
+            pos = _next_line_start(text, mark + 1) if mark < length else -1
+    return count
+
+
+def indented_keys(text: str) -> List[str]:
+    """インデント付きのキー（`^\\s+\\w+:`、MULTILINE の findall 相当）を出現順に返す"""
+    keys: List[str] = []
+    length = len(text)
+    pos = 0
+    while 0 <= pos < length:
+        key_start = _ws_end(text, pos)
+        end = -1
+        if key_start > pos:
+            word = _WORD_RUN_RE.match(text, key_start)
+            if word and word.end() < length and text[word.end()] == ":":
+                end = word.end() + 1
+        if end >= 0:
+            keys.append(text[pos:end])
+            pos = _next_line_start(text, end)
+        else:
+            pos = _next_line_start(text, key_start + 1) if key_start < length else -1
+    return keys
+
+
+def quoted_descriptions(text: str, keys: List[str]) -> Dict[str, str]:
+    """
+    各キー（`name:`）の最初の出現から同じ行で始まる、空でない "..." の中身を返す。
+
+    `re.search(rf'{key}.*?"([^"]+)"', text)` をキーごとに実行するのと同じ結果を、
+    コロン位置とダブルクォート位置の索引から1回の走査で求める（該当なしのキーは含めない）。
+    """
+    pending = {key[:-1] for key in keys if key.endswith(":") and len(key) > 1}
+    found: Dict[str, str] = {}
+    if not pending:
+        return found
+    lengths = sorted({len(name) for name in pending})
+    quotes = [i for i, ch in enumerate(text) if ch == '"']
+    newlines = [i for i, ch in enumerate(text) if ch == "\n"]
+
+    def first_quoted(start: int) -> Optional[str]:
+        line_index = bisect.bisect_left(newlines, start)
+        line_end = newlines[line_index] if line_index < len(newlines) else len(text)
+        k = bisect.bisect_left(quotes, start)
+        while k < len(quotes) and quotes[k] < line_end:
+            if k + 1 >= len(quotes):
+                return None
+            if quotes[k + 1] > quotes[k] + 1:
+                return text[quotes[k] + 1:quotes[k + 1]]
+            k += 1
+        return None
+
+    colon = text.find(":")
+    while colon != -1 and pending:
+        for size in lengths:
+            if size > colon:
+                break
+            name = text[colon - size:colon]
+            if name in pending:
+                description = first_quoted(colon + 1)
+                if description is not None:
+                    found[name + ":"] = description
+                    pending.discard(name)
+        colon = text.find(":", colon + 1)
+    return found
+
+
+class LiteralBlockIndex:
+    """
+    ルール本文の `key: |` リテラルブロックを取り出すための索引（1ファイルにつき1回 O(n) で構築）
+
+    - block(key): `key:\\s*\\|\\s*\\n((?:.*\\n)*?)(?=\\n\\S|\\Z)` の最初の一致と同じ本文
+    - template_blocks(): 行頭 `*_template: |` ブロック（次のトップレベルキー行まで）の一覧
+    - section(key): `key:(.*?)(?=\\n#|$)`（DOTALL）と同じ範囲
+    """
+
+    def __init__(self, content: str):
+        self.text = content
+        length = len(content)
+        line_starts = [0]
+        newline = content.find("\n")
+        while newline != -1:
+            line_starts.append(newline + 1)
+            newline = content.find("\n", newline + 1)
+        self.line_starts = line_starts
+
+        # 空行の直後にインデントなしの行が来る位置（`(?=\n\S)`）と、改行で終わる場合の末尾
+        self.blank_stops: List[int] = []
+        # トップレベルキー行の行頭（`(?=^[A-Za-z0-9_]+:\s)`）
+        self.key_stops: List[int] = []
+        for start in line_starts:
+            if start >= length:
+                continue
+            if (content[start] == "\n" and start + 1 < length
+                    and not content[start + 1].isspace()):
+                self.blank_stops.append(start)
+            key = _ASCII_KEY_RUN_RE.match(content, start)
+            if (key and key.end() + 1 < length and content[key.end()] == ":"
+                    and content[key.end() + 1].isspace()):
+                self.key_stops.append(start)
+        if content.endswith("\n"):
+            self.blank_stops.append(length)
+
+    def _block_starts(self, after_colon: int) -> List[int]:
+        """`\\s*\\|\\s*\\n` の後の本文開始候補（正規表現のバックトラック順 = 後ろから）"""
+        text = self.text
+        bar = _ws_end(text, after_colon)
+        if bar >= len(text) or text[bar] != "|":
+            return []
+        run_end = _ws_end(text, bar + 1)
+        starts: List[int] = []
+        newline = text.rfind("\n", bar + 1, run_end)
+        while newline != -1:
+            starts.append(newline + 1)
+            newline = text.rfind("\n", bar + 1, newline)
+        return starts
+
+    @staticmethod
+    def _first_at_or_after(stops: List[int], pos: int) -> Optional[int]:
+        index = bisect.bisect_left(stops, pos)
+        return stops[index] if index < len(stops) else None
+
+    def block(self, key: str) -> Optional[str]:
+        marker = f"{key}:"
+        pos = self.text.find(marker)
+        while pos != -1:
+            for start in self._block_starts(pos + len(marker)):
+                stop = self._first_at_or_after(self.blank_stops, start)
+                if stop is not None:
+                    return self.text[start:stop]
+            pos = self.text.find(marker, pos + 1)
+        return None
+
+    def template_blocks(self) -> List[str]:
+        text = self.text
+        blocks: List[str] = []
+        resume = 0
+        for start in self.line_starts:
+            if start < resume or start >= len(text):
+                continue
+            key = _ASCII_KEY_RUN_RE.match(text, start)
+            if not key or key.end() >= len(text) or text[key.end()] != ":":
+                continue
+            name = key.group(0)
+            if len(name) <= len(TEMPLATE_KEY_SUFFIX) or not name.endswith(TEMPLATE_KEY_SUFFIX):
+                continue
+            starts = self._block_starts(key.end() + 1)
+            if not starts:
+                continue
+            stop = self._first_at_or_after(self.key_stops, starts[0])
+            if stop is None:
+                stop = len(text)
+            blocks.append(text[starts[0]:stop])
+            resume = stop
+        return blocks
+
+    def section(self, key: str) -> Optional[str]:
+        marker = f"{key}:"
+        pos = self.text.find(marker)
+        if pos == -1:
+            return None
+        start = pos + len(marker)
+        end = len(self.text)
+        heading = self.text.find("\n#", start)
+        if heading != -1:
+            end = heading
+        if self.text.endswith("\n") and start <= end - 1 and end == len(self.text):
+            end -= 1
+        return self.text[start:end]
+
+
 def check_quality_metrics(path: Path, content: str) -> List[str]:
     """品質メトリクスをチェック (01-89番台のみ)"""
     warnings: List[str] = []
@@ -586,10 +806,12 @@ def check_quality_metrics(path: Path, content: str) -> List[str]:
     if not re.match(r"^\d{2}_.*\.mdc$", path.name):
         return []
 
+    blocks = LiteralBlockIndex(content)
+
     # 1. prompt_purpose の文字数チェック（80-400文字推奨、50文字未満はエラー級）
-    purpose_match = re.search(r'prompt_purpose:\s*\|\s*\n((?:.*\n)*?)(?=\n\S|\Z)', content, re.MULTILINE)
-    if purpose_match:
-        purpose_text = purpose_match.group(1).strip()
+    purpose_block = blocks.block("prompt_purpose")
+    if purpose_block is not None:
+        purpose_text = purpose_block.strip()
         char_count = len(purpose_text)
         if char_count < 50:
             warnings.append(
@@ -611,9 +833,9 @@ def check_quality_metrics(path: Path, content: str) -> List[str]:
             )
 
     # 2. prompt_why_questions の文字数チェック（60-400文字推奨）
-    why_questions_match = re.search(r'prompt_why_questions:\s*\|\s*\n((?:.*\n)*?)(?=\n\S|\Z)', content, re.MULTILINE)
-    if why_questions_match:
-        why_questions_text = why_questions_match.group(1).strip()
+    why_questions_block = blocks.block("prompt_why_questions")
+    if why_questions_block is not None:
+        why_questions_text = why_questions_block.strip()
         wq_char_count = len(why_questions_text)
         if wq_char_count < 40:
             warnings.append(
@@ -629,9 +851,9 @@ def check_quality_metrics(path: Path, content: str) -> List[str]:
             )
 
     # 3. prompt_why_templates の文字数チェック（40-300文字推奨）
-    why_templates_match = re.search(r'prompt_why_templates:\s*\|\s*\n((?:.*\n)*?)(?=\n\S|\Z)', content, re.MULTILINE)
-    if why_templates_match:
-        why_templates_text = why_templates_match.group(1).strip()
+    why_templates_block = blocks.block("prompt_why_templates")
+    if why_templates_block is not None:
+        why_templates_text = why_templates_block.strip()
         wt_char_count = len(why_templates_text)
         if wt_char_count < 30:
             warnings.append(
@@ -647,12 +869,12 @@ def check_quality_metrics(path: Path, content: str) -> List[str]:
             )
 
     # 4. prompt_principles の文字数チェック（60-500文字推奨）
-    principles_match = re.search(r'prompt_principles:\s*\|\s*\n((?:.*\n)*?)(?=\n\S|\Z)', content, re.MULTILINE)
-    if principles_match:
-        principles_text = principles_match.group(1).strip()
+    principles_block = blocks.block("prompt_principles")
+    if principles_block is not None:
+        principles_text = principles_block.strip()
         pp_char_count = len(principles_text)
         # 箇条書き数をカウント
-        bullet_count = len(re.findall(r'^\s*[-•]\s+', principles_text, re.MULTILINE))
+        bullet_count = count_list_items(principles_text, bullets="-•")
 
         if pp_char_count < 40:
             warnings.append(
@@ -675,9 +897,9 @@ def check_quality_metrics(path: Path, content: str) -> List[str]:
             )
 
     # 5. system_capabilities の項目数チェック（6項目推奨）
-    capabilities_section = re.search(r'system_capabilities:(.*?)(?=\n#|$)', content, re.DOTALL)
-    if capabilities_section:
-        capability_items = re.findall(r'^\s+\w+:', capabilities_section.group(1), re.MULTILINE)
+    capabilities_section = blocks.section("system_capabilities")
+    if capabilities_section is not None:
+        capability_items = indented_keys(capabilities_section)
         cap_count = len(capability_items)
         if cap_count < 6:
             warnings.append(
@@ -686,10 +908,10 @@ def check_quality_metrics(path: Path, content: str) -> List[str]:
                 f"  【例】core_function, data_processing, workflow_management, quality_assurance, integration_support, user_experience"
             )
         # 各capability の文字数チェック（30文字以上推奨）
+        descriptions = quoted_descriptions(capabilities_section, [item.strip() for item in capability_items])
         for item in capability_items:
-            item_match = re.search(rf'{item.strip()}.*?"([^"]+)"', capabilities_section.group(1))
-            if item_match:
-                item_text = item_match.group(1)
+            item_text = descriptions.get(item.strip())
+            if item_text is not None:
                 if len(item_text) < 30:
                     warnings.append(
                         f"{path}: ⚠️  {item.strip()} の説明が短すぎます（{len(item_text)}文字）\n"
@@ -700,8 +922,7 @@ def check_quality_metrics(path: Path, content: str) -> List[str]:
     # NOTE:
     # - `prompt_why_questions:` のようなセクション名に部分一致して誤検知しないよう、
     #   ファイル全体の `- key:` 行をカウントする（質問セクションは `- key:` を前提とする）。
-    question_items = re.findall(r'^\s*-\s+key:\s*', content, re.MULTILINE)
-    q_count = len(question_items)
+    q_count = count_list_items(content, bullets="-", label="key:")
     if q_count < 5:
         warnings.append(
             f"{path}: ⚠️  質問数が不足（{q_count}個）\n"
@@ -718,13 +939,7 @@ def check_quality_metrics(path: Path, content: str) -> List[str]:
     # NOTE:
     # - Markdownテンプレートは先頭行が `# ...` になりやすく、`\n#` で切ると0文字扱いになる。
     # - `*_template: |` ブロックを複数抽出し、最長ブロックで判定する。
-    template_blocks: List[str] = []
-    for m in re.finditer(
-        r'^[A-Za-z0-9_]+_template:\s*\|\s*\n(.*?)(?=^[A-Za-z0-9_]+:\s|\Z)',
-        content,
-        re.MULTILINE | re.DOTALL,
-    ):
-        template_blocks.append(m.group(1).strip())
+    template_blocks = [block.strip() for block in blocks.template_blocks()]
 
     if template_blocks:
         longest_template = max(template_blocks, key=len)
@@ -738,9 +953,9 @@ def check_quality_metrics(path: Path, content: str) -> List[str]:
 
     # 8. Phase description の文字数チェック（各100文字以上推奨）
     for phase_num in [1, 2]:
-        phase_match = re.search(rf'phase_{phase_num}_description:\s*\|\s*\n((?:.*\n)*?)(?=\n\S|\Z)', content, re.MULTILINE)
-        if phase_match:
-            phase_text = phase_match.group(1).strip()
+        phase_block = blocks.block(f"phase_{phase_num}_description")
+        if phase_block is not None:
+            phase_text = phase_block.strip()
             phase_char_count = len(phase_text)
             if phase_char_count < 100:
                 warnings.append(
@@ -758,39 +973,94 @@ def iter_rule_files() -> List[Path]:
     return sorted(RULE_DIR.glob("*.mdc"))
 
 
-def validate() -> int:
+# エラーチェック（必須項目）: 出力順 = 登録順、ルールID = 関数名から check_ を除いたもの
+ERROR_CHECKS = (
+    check_front_matter,
+    check_path_comments,
+    check_path_reference,
+    check_master_triggers_format,
+    check_master_triggers_structure,
+    check_separators,
+    check_prompt_sections,
+    check_system_capabilities,
+    check_phase_descriptions,
+)
+
+# 品質チェック（推奨項目）
+WARNING_CHECKS = (check_quality_metrics,)
+
+Finding = Tuple[str, str]  # (ルールID, メッセージ)
+
+
+def lint_rule_file(file_path: Path, rel: Path) -> Tuple[List[Finding], List[Finding]]:
+    """1ファイルを検証し (エラー, 品質警告) を (ルールID, メッセージ) の一覧で返す"""
+    text = load_document(file_path).text
+    file_errors = [(rule_id_for(check.__name__), e) for check in ERROR_CHECKS for e in check(rel, text)]
+    file_warnings = [(rule_id_for(check.__name__), w) for check in WARNING_CHECKS for w in check(rel, text)]
+    return file_errors, file_warnings
+
+
+def cached_lint_rule_file(cache: LintCache, file_path: Path, rel: Path) -> Tuple[List[Finding], List[Finding]]:
+    """内容が前回と同じファイルはキャッシュ済みの結果を再生"""
+    digest = file_digest(file_path)
+    cached = cache.get(rel, digest)
+    if cached is not None:
+        file_errors, file_warnings = cached
+        return [tuple(e) for e in file_errors], [tuple(w) for w in file_warnings]
+    file_errors, file_warnings = lint_rule_file(file_path, rel)
+    cache.put(rel, digest, [file_errors, file_warnings])
+    return file_errors, file_warnings
+
+
+def stream_diagnostics(files: List[Path], use_cache: bool, fmt: str) -> int:
+    """--format jsonl / sarif: ファイルごとの検証が終わるたびに診断を出力し、終了コードを返す"""
+    with DiagnosticEmitter("validate_rules", fmt, root=ROOT) as emitter, \
+            LintCache(__file__, enabled=use_cache) as cache:
+        for file_path in files:
+            rel = file_path.relative_to(ROOT)
+            file_errors, file_warnings = cached_lint_rule_file(cache, file_path, rel)
+            emitter.emit(
+                [d for rule, e in file_errors for d in messages_to_diagnostics([e], str(rel), rule)]
+                + [d for rule, w in file_warnings for d in messages_to_diagnostics([w], str(rel), rule, "warning")]
+            )
+        error_count = emitter.counts["error"]
+        emitter.summary(files=len(files))
+    return 1 if error_count else 0
+
+
+def validate(changed_only: bool = False, use_cache: bool = True, fmt: str = "text") -> int:
     errors: List[str] = []
     warnings: List[str] = []
+    # 機械可読出力では stdout を診断専用にし、案内メッセージは stderr へ出す
+    notice = sys.stderr if fmt != "text" else sys.stdout
     files = iter_rule_files()
     if not files:
-        print("No .cursor/rules/*.mdc files found. Run this script inside an agent directory.")
+        print("No .cursor/rules/*.mdc files found. Run this script inside an agent directory.", file=notice)
         return 1
 
+    if changed_only:
+        changed = git_changed_files(ROOT)
+        if changed is None:
+            print("⚠️ git の変更ファイルを取得できないため、全ルールファイルを検証します", file=notice)
+        else:
+            files = select_changed(files, changed)
+    if fmt != "text":
+        return stream_diagnostics(files, use_cache, fmt)
+    cache = LintCache(__file__, enabled=use_cache)
+
     print("=" * 80)
     print("エージェントルールファイル検証")
     print("=" * 80)
     print()
 
     for file_path in files:
-        text = file_path.read_text(encoding="utf-8")
         rel = file_path.relative_to(ROOT)
 
         print(f"検証中: {rel}")
 
-        # エラーチェック（必須項目）
-        file_errors = []
-        file_errors.extend(check_front_matter(rel, text))
-        file_errors.extend(check_path_comments(rel, text))
-        file_errors.extend(check_path_reference(rel, text))
-        file_errors.extend(check_master_triggers_format(rel, text))
-        file_errors.extend(check_master_triggers_structure(rel, text))
-        file_errors.extend(check_separators(rel, text))
-        file_errors.extend(check_prompt_sections(rel, text))
-        file_errors.extend(check_system_capabilities(rel, text))
-        file_errors.extend(check_phase_descriptions(rel, text))
-
-        # 品質チェック（推奨項目）
-        file_warnings = check_quality_metrics(rel, text)
+        findings = cached_lint_rule_file(cache, file_path, rel)
+        file_errors = [message for _, message in findings[0]]
+        file_warnings = [message for _, message in findings[1]]
 
         if file_errors:
             print(f"  ✗ エラー検出 ({len(file_errors)}件)")
@@ -806,6 +1076,7 @@ def validate() -> int:
             print(f"  ✓ OK")
 
         print()
+    cache.close()
 
     print("=" * 80)
     if errors:
@@ -827,4 +1098,11 @@ def validate() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(validate())
+    parser = argparse.ArgumentParser(description="エージェントルールファイル検証")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="git で変更されたルールファイル（HEADとの差分・未追跡）のみ検証")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="検証結果キャッシュ（.agent-cache/lint.sqlite）を使わない")
+    add_format_argument(parser)
+    args = parser.parse_args()
+    sys.exit(validate(changed_only=args.changed_only, use_cache=not args.no_cache, fmt=args.format))